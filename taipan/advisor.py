@@ -0,0 +1,196 @@
+"""
+Battle order advisor.
+
+At the orders prompt the advisor plays the rest of the battle out many
+times from the current state under each standing order: fight, run, or
+throw cargo overboard and then run. Rollouts use a scalar copy of the
+SeaBattle.resolve rules that draws nothing on screen and uses its own
+random stream, so asking for advice never changes the game.
+
+Orders stand until the player changes them, so the search is a single
+level: a UCB1 bandit over the orders at the root, sampling the most
+promising ones most. It stops at a fixed time budget so the prompt never
+stalls.
+"""
+
+import math
+import random
+import time
+from typing import NamedTuple, Optional
+
+from constants import *
+
+BUDGET = 0.05  # Seconds of search per decision
+EXPLORATION = 1.4  # UCB1 exploration constant
+
+
+class BattleState(NamedTuple):
+    """Everything the rest of a battle depends on"""
+
+    num_ships: int
+    s0: int  # Ships at the start of the battle
+    health: tuple  # Hit points of the ship in each screen slot, 0 if empty
+    guns: int
+    damage: int
+    capacity: int
+    ec: float
+    ed: float
+    ok: int
+    ik: int
+    battle_type: int
+    hold: tuple  # Units of each good in the hold that could be thrown overboard
+
+
+class Advice(NamedTuple):
+    """Estimated outcome of one standing order"""
+
+    orders: int
+    item: int  # Good thrown overboard first, for ORDERS_THROW; 4 for all of them
+    throw: int  # Units thrown overboard first, for ORDERS_THROW
+    won: float
+    fled: float  # Includes battles broken off by Li Yuen's pirates
+    lost: float
+    rollouts: int
+
+
+def play_out(rng, state: BattleState, orders: int, throw: int = 0) -> int:
+    """Play the battle to its end under standing orders; returns BATTLE_*"""
+    rand = rng.random
+    num_ships = state.num_ships
+    s0 = state.s0
+    health = list(state.health)
+    on_screen = sum(1 for h in health if h > 0)
+    guns = state.guns
+    damage = state.damage
+    capacity = state.capacity
+    ec = state.ec
+    ed = state.ed
+    ok = state.ok
+    ik = state.ik
+    bt = state.battle_type
+
+    def trim() -> None:
+        nonlocal on_screen
+        if num_ships <= 10:
+            for slot in range(9, -1, -1):
+                if on_screen > num_ships and health[slot] > 0:
+                    health[slot] = 0
+                    on_screen -= 1
+
+    while num_ships > 0:
+        if damage >= capacity:
+            return BATTLE_LOST
+        for slot in range(10):
+            if num_ships > on_screen and health[slot] == 0:
+                health[slot] = int(ec * rand() + 20)
+                on_screen += 1
+
+        if orders == ORDERS_FIGHT and guns > 0:
+            ok = 3
+            ik = 1
+            for _ in range(guns):
+                if on_screen == 0:
+                    for slot in range(10):
+                        if num_ships > on_screen and health[slot] == 0:
+                            health[slot] = int(ec * rand() + 20)
+                            on_screen += 1
+                alive = [slot for slot in range(10) if health[slot] > 0]
+                target = alive[int(rand() * len(alive))]
+                health[target] -= 10 + int(rand() * 31)
+                if health[target] <= 0:
+                    health[target] = 0
+                    on_screen -= 1
+                    num_ships -= 1
+                    if num_ships == 0:
+                        break
+
+            if int(rand() * s0) > int(num_ships * 0.6 / bt) and num_ships > 2:
+                divisor = max(num_ships // 3 // bt, 1)
+                num_ships -= max(int(rand() * divisor), 1)
+                if bt == GENERIC and rand() < 0.05:
+                    return BATTLE_INTERRUPTED
+                trim()
+        elif orders != ORDERS_FIGHT:
+            if orders == ORDERS_THROW:
+                ok += throw // 10
+                throw = 0
+            ok += ik
+            ik += 1
+            if int(rand() * ok) > int(rand() * num_ships):
+                num_ships = 0
+            elif num_ships > 2 and rand() < 0.2:
+                num_ships -= int(rand() * num_ships) // 2 + 1
+                trim()
+
+        if num_ships > 0:
+            hits = min(num_ships, 15)
+            percent = int(damage / capacity * 100)
+            if guns > 0 and (int(rand() * 100) < percent or percent > 80):
+                hits = 1
+                guns -= 1
+            damage += int(ed * hits * bt * rand() + hits / 2)
+            if bt == GENERIC and rand() < 0.05:
+                return BATTLE_INTERRUPTED
+
+    return BATTLE_WON if orders == ORDERS_FIGHT else BATTLE_FLED
+
+
+class BattleAdvisor:
+    """Time-boxed Monte Carlo search over the battle orders."""
+
+    def __init__(self, budget: float = BUDGET, seed: Optional[int] = None):
+        self.budget = budget
+        self.rng = random.Random(seed)
+
+    def choices(self, state: BattleState) -> list[tuple[int, int, int]]:
+        """
+        Orders worth searching, as (orders, item, amount): fight, run, and
+        the throws the game allows that lighten the ship most, all of the
+        largest good or all cargo at once.
+        """
+        choices = [(ORDERS_FIGHT, 0, 0), (ORDERS_RUN, 0, 0)]
+        largest = max(state.hold)
+        total = sum(state.hold)
+        if largest > 0:
+            choices.append((ORDERS_THROW, state.hold.index(largest), largest))
+        if total > largest:
+            choices.append((ORDERS_THROW, len(state.hold), total))
+        return choices
+
+    def advise(self, state: BattleState) -> list[Advice]:
+        """Outcome odds for each order, best first by chance of survival"""
+        choices = self.choices(state)
+        counts = [[0, 0, 0] for _ in choices]  # won, fled, lost
+        plays = [0] * len(choices)
+        deadline = time.perf_counter() + self.budget
+        total = 0
+        while total < len(choices) or time.perf_counter() < deadline:
+            if total < len(choices):
+                arm = total
+            else:
+                log_total = math.log(total)
+                arm = max(
+                    range(len(choices)),
+                    key=lambda a: 1
+                    - counts[a][2] / plays[a]
+                    + EXPLORATION * math.sqrt(log_total / plays[a]),
+                )
+            orders, _, throw = choices[arm]
+            result = play_out(self.rng, state, orders, throw)
+            if result == BATTLE_WON:
+                counts[arm][0] += 1
+            elif result == BATTLE_LOST:
+                counts[arm][2] += 1
+            else:
+                counts[arm][1] += 1
+            plays[arm] += 1
+            total += 1
+
+        advice = [
+            Advice(orders, item, throw, won / n, fled / n, lost / n, n)
+            for (orders, item, throw), (won, fled, lost), n in zip(
+                choices, counts, plays
+            )
+        ]
+        advice.sort(key=lambda a: (a.lost, -a.won))
+        return advice
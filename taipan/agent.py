@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Gym-style agent interface to Taipan.
+
+TaipanEnv wraps the TaipanGame rules on a headless screen. Each step takes
+one port menu command, answers every prompt the command raises from the
+fields of the action, and returns a reused observation vector:
+
+    env = TaipanEnv()
+    obs, info = env.reset(seed=1)
+    action = env.action  # preallocated; fill it in and pass it to step()
+    action[A_COMMAND] = Command.QUIT
+    action[A_DESTINATION] = SHANGHAI
+    obs, reward, terminated, truncated, info = env.step(action)
+
+Sailing (QUIT) runs the voyage, its battles under the action's standing
+orders, and the arrival events of the next port, whose offers are taken
+or declined by A_ACCEPT. The reward is the change in net worth. Requires
+the optional numpy dependency.
+"""
+
+import sys
+import time
+from enum import IntEnum
+from typing import Optional
+
+import numpy as np
+
+from constants import *
+from headless import RecordingScreen
+from rng import GameRandom
+from taipan import GameOver, TaipanGame
+
+
+class Command(IntEnum):
+    """Port menu commands, in the order of the menu keys"""
+
+    BUY = 0
+    SELL = 1
+    BANK = 2
+    TRANSFER = 3
+    WU = 4
+    RETIRE = 5
+    QUIT = 6
+
+
+COMMAND_KEYS = "BSVTWRQ"
+HONG_KONG_COMMANDS = frozenset(Command) - {Command.RETIRE}
+PORT_COMMANDS = frozenset({Command.BUY, Command.SELL, Command.QUIT})
+
+# Action vector layout. Amounts of -1 mean "all", as at the prompts.
+A_COMMAND = 0  # Command
+A_ITEM = 1  # Item to buy, sell or transfer
+A_AMOUNT = 2  # Buy, sell, deposit, to warehouse, repay Wu
+A_AMOUNT2 = 3  # Withdraw, to hold, borrow from Wu
+A_DESTINATION = 4  # Port to sail to
+A_ORDERS = 5  # ORDERS_FIGHT, ORDERS_RUN or ORDERS_THROW in battle
+A_THROW_ITEM = 6  # Item to throw overboard, 4 for all cargo
+A_THROW_AMOUNT = 7
+A_ACCEPT = 8  # Accept the offers made on arrival: donation, repairs, ships, guns
+ACTION_SIZE = 9
+
+# Observation vector layout: game fields, then cargo, warehouse and prices
+OBS_FIELDS = (
+    "cash",
+    "bank",
+    "debt",
+    "hold",
+    "capacity",
+    "guns",
+    "damage",
+    "month",
+    "year",
+    "port",
+    "li",
+    "wu_warn",
+    "ec",
+    "ed",
+)
+O_HOLD_ = len(OBS_FIELDS)
+O_HKW_ = O_HOLD_ + 4
+O_PRICE = O_HKW_ + 4
+OBS_SIZE = O_PRICE + 4
+
+ORDER_KEYS = {ORDERS_FIGHT: ord("f"), ORDERS_RUN: ord("r"), ORDERS_THROW: ord("t")}
+ITEM_KEYS = tuple(map(ord, "osag*"))
+
+
+class AgentScreen(RecordingScreen):
+    """Recording screen that also remembers which item a prompt is about."""
+
+    item = 0
+
+    def message_sell_amount(self, item: str) -> None:
+        self.last = "message_sell_amount"
+        self.item = ITEMS.index(item)
+
+    def message_to_warehouse(self, item: str) -> None:
+        self.last = "message_to_warehouse"
+        self.item = ITEMS.index(item)
+
+    def message_to_hold(self, item: str) -> None:
+        self.last = "message_to_hold"
+        self.item = ITEMS.index(item)
+
+
+class ActionKeyboard:
+    """
+    Keyboard that answers the game's prompts from the current action.
+
+    A number the game rejects is asked for again; the second answer is -1
+    ("all") and any later one 0, so every prompt ends. The battle prompts
+    come back every round without any answer being rejected, so they
+    start the count over.
+    """
+
+    def __init__(self, env: "TaipanEnv"):
+        self.env = env
+        self.prompt = ""
+        self.tries = 0
+
+    def reset(self) -> None:
+        self.prompt = ""
+        self.tries = 0
+
+    def get_one(self) -> int:
+        env = self.env
+        action = env.current
+        prompt = env.screen.last
+        if prompt in ("message_buy_prompt", "message_sell_prompt"):
+            return ITEM_KEYS[action[A_ITEM]]
+        elif prompt == "message_battle_orders":
+            self.prompt = ""  # A new round: its prompts are not retries
+            return ORDER_KEYS.get(action[A_ORDERS], ord("f"))
+        elif prompt == "message_battle_throw_cargo_interface":
+            self.prompt = ""  # Asked again every round of throwing
+            return ITEM_KEYS[action[A_THROW_ITEM]]
+        elif prompt == "message_cash_or_guns":
+            return ord("1")
+        elif prompt == "message_wu_pity":
+            return ord("y")
+        elif prompt in ("message_mchenry_repairs", "message_mchenry_cost"):
+            return ord("y") if action[A_ACCEPT] else ord("n")
+        elif prompt in ("message_new_ship", "message_new_gun"):
+            return ord("y") if action[A_ACCEPT] else ord("n")
+        return ord("n")
+
+    def get_num(self, maxlen: int) -> int:
+        env = self.env
+        action = env.current
+        prompt = env.screen.last
+        if prompt in ("message_to_warehouse", "message_to_hold"):
+            key = (prompt, env.screen.item)
+        else:
+            key = prompt
+        if key == self.prompt:
+            self.tries += 1
+            if maxlen == 1:  # Destination prompt
+                return env.game.port % 7 + 1
+            return -1 if self.tries == 1 else 0
+        self.prompt = key
+        self.tries = 0
+
+        if maxlen == 1:
+            return action[A_DESTINATION]
+        elif prompt in ("message_afford_amount", "message_sell_amount"):
+            return action[A_AMOUNT]
+        elif prompt in ("message_bank_deposit", "message_wu_repay"):
+            return action[A_AMOUNT]
+        elif prompt in ("message_bank_withdraw", "message_wu_borrow"):
+            return action[A_AMOUNT2]
+        elif prompt == "message_to_warehouse":
+            return action[A_AMOUNT] if env.screen.item == action[A_ITEM] else 0
+        elif prompt == "message_to_hold":
+            return action[A_AMOUNT2] if env.screen.item == action[A_ITEM] else 0
+        elif prompt == "message_battle_throw_cargo_amount":
+            return action[A_THROW_AMOUNT]
+        return 0
+
+    def choice_yes_no(self) -> bool:
+        env = self.env
+        prompt = env.screen.last
+        if prompt == "message_wu_business":
+            return env.current[A_COMMAND] == Command.WU
+        elif prompt in ("message_li_donation", "message_not_enough"):
+            return bool(env.current[A_ACCEPT])
+        return False  # Not another game
+
+
+class TaipanEnv:
+    """
+    Taipan as a reinforcement learning environment.
+
+    reset() and step() follow the Gymnasium signatures. The observation,
+    the action mask (which commands the port menu accepts right now) and
+    the info dict are allocated once and updated in place, so keep copies
+    of anything that must outlive the next step.
+    """
+
+    def __init__(self, max_steps: int = 0):
+        self.max_steps = max_steps  # Truncate episodes after this many; 0 never
+        self.screen = AgentScreen()
+        self.keyboard = ActionKeyboard(self)
+        self.screen.keyboard = self.keyboard
+        self.game = None
+        self.action = np.zeros(ACTION_SIZE, dtype=np.int64)
+        self.current = [0] * ACTION_SIZE
+        self.observation = np.zeros(OBS_SIZE, dtype=np.float64)
+        self.action_mask = np.zeros(len(Command), dtype=bool)
+        self.info = {"steps": 0, "voyages": 0, "invalid": False}
+        self.net_worth = 0
+        self.done = True
+
+    def reset(self, seed: Optional[int] = None) -> tuple:
+        self.game = TaipanGame(self.screen, GameRandom(seed, buffered=True))
+        self.keyboard.reset()
+        self.game.start()
+        self.info["steps"] = 0
+        self.info["voyages"] = 0
+        self.info["invalid"] = False
+        self.done = False
+        self.game.arrive()
+        self.net_worth = self.worth()
+        self.observe()
+        return self.observation, self.info
+
+    def step(self, action) -> tuple:
+        if self.done:
+            raise RuntimeError("step() called on a finished episode; call reset()")
+        game = self.game
+        current = self.current
+        for i in range(ACTION_SIZE):
+            current[i] = int(action[i])
+        command = current[A_COMMAND]
+        info = self.info
+        info["steps"] += 1
+        info["invalid"] = (
+            not (0 <= command < len(Command)) or not self.action_mask[command]
+        )
+        self.keyboard.reset()
+
+        terminated = False
+        if not info["invalid"]:
+            try:
+                if command == Command.BUY:
+                    game.buy()
+                elif command == Command.SELL:
+                    game.sell()
+                elif command == Command.BANK:
+                    game.visit_bank()
+                elif command == Command.TRANSFER:
+                    game.transfer()
+                elif command == Command.WU:
+                    game.elder_brother_wu()
+                elif command == Command.RETIRE:
+                    game.retire()
+                else:
+                    game.quit()
+                    info["voyages"] += 1
+                    game.arrive()
+            except GameOver:
+                terminated = True
+
+        self.done = terminated or (
+            self.max_steps > 0 and info["steps"] >= self.max_steps
+        )
+        worth = self.worth()
+        reward = worth - self.net_worth
+        self.net_worth = worth
+        self.observe()
+        return self.observation, reward, terminated, self.done and not terminated, info
+
+    def worth(self) -> float:
+        game = self.game
+        return game.cash + game.bank - game.debt
+
+    def observe(self) -> None:
+        """Refresh the observation and the action mask in place"""
+        state = self.game.state
+        obs = self.observation
+        for i, name in enumerate(OBS_FIELDS):
+            obs[i] = getattr(state, name)
+        for i in range(4):
+            obs[O_HOLD_ + i] = state.hold_[i]
+            obs[O_HKW_ + i] = state.hkw_[i]
+            obs[O_PRICE + i] = state.price[i]
+
+        mask = self.action_mask
+        home = state.port == HONG_KONG
+        for command in Command:
+            mask[command] = (
+                command in HONG_KONG_COMMANDS if home else command in PORT_COMMANDS
+            )
+        mask[Command.RETIRE] = home and state.cash + state.bank >= 1000000
+        # An overloaded ship may not sail, and the transfer prompts would
+        # never accept an amount for moving warehouse cargo into its hold;
+        # selling is the way out
+        if state.hold < 0:
+            mask[Command.QUIT] = mask[Command.TRANSFER] = False
+
+
+def check_throws(seed: int = 0) -> None:
+    """
+    Regression check: throwing 10 units a round over two battles on one
+    voyage must throw 10 every round, not "all" and then nothing.
+    """
+    env = TaipanEnv()
+    env.reset(seed=seed)
+    game = env.game
+    game.capacity = 1000
+    game.hold_ = [500, 0, 0, 0]
+    game.hold = 500
+    game.guns = 0
+    game.damage = 0
+    env.current[A_ORDERS] = ORDERS_THROW
+    env.current[A_THROW_ITEM] = 0
+    env.current[A_THROW_AMOUNT] = 10
+    answers = []
+    get_num = env.keyboard.get_num
+
+    def recording_get_num(maxlen: int) -> int:
+        answer = get_num(maxlen)
+        answers.append(answer)
+        return answer
+
+    env.keyboard.get_num = recording_get_num
+    for battle_type in (GENERIC, LI_YUEN):
+        game.sea_battle(battle_type, 30)
+    assert len(answers) > 2, answers
+    assert answers == [10] * len(answers), answers
+    assert game.hold_[0] == 500 - 10 * len(answers), game.hold_
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["check"]:
+    check_throws()
+    print("ok")
+elif __name__ == "__main__":
+    # Random agent benchmark
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    env = TaipanEnv(max_steps=200)
+    rng = np.random.default_rng(0)
+    action = env.action
+    env.reset(seed=0)
+    start = time.perf_counter()
+    episodes = 1
+    for step in range(steps):
+        valid = np.flatnonzero(env.action_mask)
+        action[A_COMMAND] = valid[rng.integers(len(valid))]
+        action[A_ITEM] = rng.integers(4)
+        action[A_AMOUNT] = rng.integers(-1, 100)
+        action[A_AMOUNT2] = rng.integers(-1, 100)
+        action[A_DESTINATION] = rng.integers(1, 8)
+        action[A_ORDERS] = rng.integers(1, 4)
+        action[A_THROW_ITEM] = rng.integers(5)
+        action[A_THROW_AMOUNT] = rng.integers(-1, 100)
+        action[A_ACCEPT] = rng.integers(2)
+        obs, reward, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            env.reset(seed=episodes)
+            episodes += 1
+    elapsed = time.perf_counter() - start
+    print(f"{steps} steps in {episodes} episodes: {steps / elapsed:.0f} steps/sec")
@@ -0,0 +1,329 @@
+"""
+Rendering backends for the Taipan screen.
+
+A backend owns the terminal. It provides ``window``, the full-screen window
+that Messages draws on, plus new_window(), doupdate(), flushinp(),
+curs_set() and close(). Windows support the subset of the curses window
+API that the game uses.
+
+- CursesBackend: the terminal driven by curses, as before.
+- VirtualBackend: renders into an in-memory VirtualScreen, so frames can
+  be inspected, hashed and diffed without a terminal.
+- AnsiBackend: a VirtualBackend that sends the cells changed in each frame
+  as plain ANSI escape codes in a single write(), so it suits dumb
+  terminals and SSH.
+- NullBackend: draws nothing, for running Messages without a terminal.
+"""
+
+import curses
+import os
+import select
+import sys
+
+from vscreen import BLANK, VirtualScreen
+
+ANSI_ATTRIBUTES = (
+    (curses.A_BOLD, "1"),
+    (curses.A_UNDERLINE, "4"),
+    (curses.A_REVERSE, "7"),
+)
+
+
+class CursesBackend:
+    """Backend that drives the terminal through curses."""
+
+    def __init__(self):
+        self.window = curses.initscr()
+        curses.noecho()
+        curses.cbreak()
+        self.window.keypad(True)
+        curses.start_color()
+        curses.init_pair(1, curses.COLOR_RED, curses.COLOR_BLACK)
+        curses.init_pair(2, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)
+        curses.init_pair(4, curses.COLOR_BLUE, curses.COLOR_BLACK)
+        curses.curs_set(0)  # Hide cursor
+        self.closed = False
+
+    def new_window(self, rows: int, cols: int, y: int = 0, x: int = 0):
+        return curses.newwin(rows, cols, y, x)
+
+    def doupdate(self) -> None:
+        curses.doupdate()
+
+    def flushinp(self) -> None:
+        curses.flushinp()
+
+    def curs_set(self, visibility: int) -> None:
+        curses.curs_set(visibility)
+
+    def close(self) -> None:
+        """Restore the terminal; safe to call more than once"""
+        if not self.closed:
+            self.closed = True
+            curses.nocbreak()
+            self.window.keypad(False)
+            curses.echo()
+            curses.endwin()
+
+
+class VirtualBackend:
+    """
+    Backend that renders into memory.
+
+    Windows are VirtualScreens. noutrefresh() stages their touched rows in
+    ``frame``; doupdate() applies the cells that differ to ``screen``, which
+    holds what a terminal would show, and counts the frames and cells
+    written. Keys come from a sequence as with NullBackend.
+    """
+
+    merge_gap = 0  # Unchanged cells worth rewriting to join two runs
+
+    def __init__(self, rows: int = 24, cols: int = 80, keys=()):
+        self.rows = rows
+        self.cols = cols
+        self.keys = iter(keys)
+        self.frame = VirtualScreen(rows, cols)  # Staged by noutrefresh
+        self.screen = VirtualScreen(rows, cols)  # Shown after doupdate
+        self.dirty = set()
+        self.cleared = False
+        self.cursor = (0, 0)
+        self.frames = 0
+        self.cells_written = 0
+        self.window = self.new_window(rows, cols)
+
+    def new_window(self, rows: int, cols: int, y: int = 0, x: int = 0) -> VirtualScreen:
+        window = VirtualScreen(rows, cols, y, x)
+        window.backend = self
+        return window
+
+    def stage(self, window: VirtualScreen) -> None:
+        """Copy a window's touched rows into the staged frame"""
+        if window.cleared:
+            self.cleared = True
+        width = min(window.cols, self.cols - window.begin_x)
+        for row in window.touched:
+            y = window.begin_y + row
+            if y >= self.rows:
+                continue
+            src = row * window.cols
+            dst = y * self.cols + window.begin_x
+            self.frame.chars[dst : dst + width] = window.chars[src : src + width]
+            self.frame.attrs[dst : dst + width] = window.attrs[src : src + width]
+            self.dirty.add(y)
+        self.cursor = (window.begin_y + window.y, window.begin_x + window.x)
+
+    def doupdate(self) -> None:
+        """Apply the staged frame to the screen"""
+        if self.cleared:
+            self.screen = VirtualScreen(self.rows, self.cols)
+            self.dirty = set(range(self.rows))
+        runs = self.frame.diff(self.screen, self.dirty, self.merge_gap)
+        self.write(runs)
+        for y, start, end in runs:
+            lo = y * self.cols
+            self.screen.chars[lo + start : lo + end] = self.frame.chars[
+                lo + start : lo + end
+            ]
+            self.screen.attrs[lo + start : lo + end] = self.frame.attrs[
+                lo + start : lo + end
+            ]
+            self.cells_written += end - start
+        self.screen.y, self.screen.x = self.cursor
+        self.dirty = set()
+        self.cleared = False
+        self.frames += 1
+
+    def write(self, runs: list) -> None:
+        """Send changed runs to the output; memory needs nothing more"""
+
+    def read_key(self, delay: int) -> int:
+        if delay >= 0:
+            return -1
+        key = next(self.keys, None)
+        if key is None:
+            raise EOFError("no more keys")
+        return key if isinstance(key, int) else ord(key)
+
+    def flushinp(self) -> None:
+        pass
+
+    def curs_set(self, visibility: int) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class AnsiBackend(VirtualBackend):
+    """
+    Backend that writes ANSI escape codes directly.
+
+    Frames are diffed cell by cell against what the terminal shows and
+    every changed run is sent in a single write(). Input is read raw from
+    the terminal with termios.
+    """
+
+    merge_gap = 4  # Cheaper to rewrite a few cells than to move the cursor
+
+    def __init__(self, infd: int = None, outfd: int = None):
+        import termios
+        import tty
+
+        self.infd = sys.stdin.fileno() if infd is None else infd
+        self.outfd = sys.stdout.fileno() if outfd is None else outfd
+        try:
+            cols, rows = os.get_terminal_size(self.outfd)
+        except OSError:
+            cols, rows = 0, 0
+        if not rows or not cols:  # Size unknown; assume a classic terminal
+            cols, rows = 80, 24
+        super().__init__(rows, cols)
+        self.saved_mode = termios.tcgetattr(self.infd)
+        tty.setcbreak(self.infd)
+        self.pending = ["\x1b[?1049h\x1b[H\x1b[2J"]  # Alternate screen
+        self.closed = False
+        self.curs_set(0)
+
+    def render_run(self, y: int, start: int, end: int) -> str:
+        """Escape codes that redraw cells start to end of row y"""
+        frame = self.frame
+        lo = y * self.cols
+        # Trailing blanks that reach the end of the row become a clear-to-EOL
+        clear = False
+        if end == self.cols:
+            while end > start and frame.chars[lo + end - 1] == BLANK:
+                if frame.attrs[lo + end - 1]:
+                    break
+                end -= 1
+                clear = True
+        parts = [f"\x1b[{y + 1};{start + 1}H"]
+        attr = 0
+        for pos in range(lo + start, lo + end):
+            cell_attr = frame.attrs[pos]
+            if cell_attr != attr:
+                codes = [code for flag, code in ANSI_ATTRIBUTES if cell_attr & flag]
+                parts.append("\x1b[" + ";".join(["0"] + codes) + "m")
+                attr = cell_attr
+            parts.append(chr(frame.chars[pos]))
+        if attr:
+            parts.append("\x1b[0m")
+        if clear:
+            parts.append("\x1b[K")
+        return "".join(parts)
+
+    def write(self, runs: list) -> None:
+        """Send the changed runs to the terminal in one write"""
+        out = self.pending
+        if self.cleared:
+            out.append("\x1b[H\x1b[2J")
+        for y, start, end in runs:
+            out.append(self.render_run(y, start, end))
+        if out:
+            y, x = self.cursor
+            out.append(f"\x1b[{y + 1};{x + 1}H")
+            os.write(self.outfd, "".join(out).encode())
+            self.pending = []
+
+    def read_key(self, delay: int) -> int:
+        """Read one byte; -1 if none arrives within delay milliseconds"""
+        timeout = None if delay < 0 else delay / 1000
+        ready, _, _ = select.select([self.infd], [], [], timeout)
+        if not ready:
+            return -1
+        data = os.read(self.infd, 1)
+        if not data:
+            raise EOFError("terminal closed")
+        return data[0]
+
+    def flushinp(self) -> None:
+        import termios
+
+        termios.tcflush(self.infd, termios.TCIFLUSH)
+
+    def curs_set(self, visibility: int) -> None:
+        self.pending.append("\x1b[?25h" if visibility else "\x1b[?25l")
+
+    def close(self) -> None:
+        """Restore the terminal; safe to call more than once"""
+        import termios
+
+        if not self.closed:
+            self.closed = True
+            self.curs_set(1)
+            self.pending.append("\x1b[0m\x1b[?1049l")
+            self.doupdate()
+            termios.tcsetattr(self.infd, termios.TCSADRAIN, self.saved_mode)
+
+
+class NullWindow:
+    """Window that accepts every drawing call and shows nothing."""
+
+    def __init__(self, backend, rows: int = 24, cols: int = 80):
+        self.backend = backend
+        self.rows = rows
+        self.cols = cols
+        self.delay = -1
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def ignore(*args):
+            pass
+
+        setattr(self, name, ignore)
+        return ignore
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.rows, self.cols
+
+    def timeout(self, delay: int) -> None:
+        self.delay = delay
+
+    def getch(self) -> int:
+        return self.backend.read_key(self.delay)
+
+
+class NullBackend:
+    """
+    Backend that draws nothing.
+
+    Timed pauses return at once. Blocking reads take the next key from
+    keys; when they run out EOFError is raised.
+    """
+
+    def __init__(self, keys=()):
+        self.keys = iter(keys)
+        self.window = NullWindow(self)
+
+    def new_window(self, rows: int, cols: int, y: int = 0, x: int = 0) -> NullWindow:
+        return NullWindow(self, rows, cols)
+
+    def read_key(self, delay: int) -> int:
+        if delay >= 0:
+            return -1
+        key = next(self.keys, None)
+        if key is None:
+            raise EOFError("no more keys")
+        return key if isinstance(key, int) else ord(key)
+
+    def doupdate(self) -> None:
+        pass
+
+    def flushinp(self) -> None:
+        pass
+
+    def curs_set(self, visibility: int) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+BACKENDS = {
+    "curses": CursesBackend,
+    "ansi": AnsiBackend,
+    "virtual": VirtualBackend,
+    "null": NullBackend,
+}
@@ -0,0 +1,120 @@
+"""
+Batch runner that plays many headless games across a process pool.
+
+Each game gets its own seed derived from the batch seed and the game's
+index, so any single game can be replayed on its own and results do not
+depend on how games are spread over workers.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import os
+import sys
+from typing import Iterator, NamedTuple
+
+from headless import new_game, run_voyages
+
+MAX_VOYAGES = 1000  # Games still afloat after this many voyages are cut off
+
+
+class GameResult(NamedTuple):
+    """Summary of one simulated game"""
+
+    index: int
+    seed: int
+    voyages: int
+    finished: bool  # False if the game hit the voyage limit
+    net_worth: int
+    cash: int
+    bank: int
+    debt: int
+    capacity: int
+    guns: int
+
+
+def game_seed(batch_seed: int, index: int) -> int:
+    """Derive the seed for game index of a batch"""
+    digest = hashlib.sha256(f"{batch_seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def play_game(index: int, seed: int, max_voyages: int = MAX_VOYAGES) -> GameResult:
+    """Play one headless game to the end or to the voyage limit"""
+    game = new_game(seed=seed)
+    voyages = run_voyages(game, max_voyages)
+    return GameResult(
+        index,
+        seed,
+        voyages,
+        game.game_over,
+        int(game.cash + game.bank - game.debt),
+        int(game.cash),
+        game.bank,
+        game.debt,
+        game.capacity,
+        game.guns,
+    )
+
+
+def _play_chunk(
+    batch_seed: int, start: int, end: int, max_voyages: int
+) -> list[GameResult]:
+    return [
+        play_game(index, game_seed(batch_seed, index), max_voyages)
+        for index in range(start, end)
+    ]
+
+
+def run_batch(
+    games: int,
+    seed: int = 0,
+    workers=None,
+    chunk_size: int = 256,
+    max_voyages: int = MAX_VOYAGES,
+) -> Iterator[list[GameResult]]:
+    """
+    Play games across a process pool, yielding results one chunk at a time.
+
+    Chunks are yielded as they complete. Only a couple of chunks per worker
+    are in flight at once, so memory stays flat however large the batch.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = (
+        (start, min(start + chunk_size, games)) for start in range(0, games, chunk_size)
+    )
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for start, end in chunks:
+            pending.add(pool.submit(_play_chunk, seed, start, end, max_voyages))
+            if len(pending) >= workers * 2:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="taipan batch", description="Simulate many headless games."
+    )
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--max-voyages", type=int, default=MAX_VOYAGES)
+    args = parser.parse_args(argv)
+
+    print(",".join(GameResult._fields))
+    for chunk in run_batch(
+        args.games, args.seed, args.workers, args.chunk_size, args.max_voyages
+    ):
+        sys.stdout.write("".join(",".join(map(str, r)) + "\n" for r in chunk))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,730 @@
+"""
+Exact outcome solvers for sea battles.
+
+Under standing orders the battle in SeaBattle.battle is a Markov chain, and
+the solvers here propagate it round by round to get the outcome
+probabilities. Running (or throwing cargo and then running) moves over
+ships remaining, damage and guns, with ok and ik advancing
+deterministically each round.
+
+Fighting also depends on the hit points of the ships on screen. Each ship
+is spawned with independent health and every shot hits a uniformly chosen
+ship for an independent amount, so how many hits a ship has survived says
+all there is to know about its remaining health. solve_fight therefore
+tracks how many ships on screen have survived 0, 1, 2... hits in place of
+their health. The one approximation is that ships leaving the screen when
+part of the fleet runs off are taken at random, where the game takes them
+from the last slots.
+
+Results are memoized in memory and in a persistent shelve file keyed by the
+battle parameters. Only stored results come back in microseconds, so
+running this module solves a grid of opening positions ahead of time:
+
+    python battle_odds.py --ships 20 --guns 0 5 10 20 --years 3
+
+EscapeTable tabulates the chance of a single escape
+attempt, and the cargo to throw to reach a target chance, for constant-time
+lookup during play.
+"""
+
+import argparse
+import concurrent.futures
+import dbm
+import math
+import os
+import shelve
+from array import array
+from typing import NamedTuple, Optional
+
+from constants import *
+
+MAX_ROUNDS = 200  # Probability still at sea after this many rounds is unresolved
+TOLERANCE = 1e-10  # States less likely than this are dropped as unresolved
+FIGHT_TOLERANCE = 1e-7  # The same for solve_fight, whose states are far more numerous
+DEFAULT_TABLE = os.path.join(os.path.expanduser("~"), ".cache", "taipan", "odds")
+ESCAPE_TARGETS = (0.5, 0.75, 0.9)  # Escape chances EscapeTable solves for
+TABLE_OK = 256  # Escape chances are tabulated for ok and ships below these
+TABLE_SHIPS = 256
+
+
+class BattleOdds(NamedTuple):
+    """Outcome probabilities of a battle and the damage expected along the way"""
+
+    won: float
+    fled: float
+    lost: float
+    interrupted: float
+    unresolved: float
+    expected_damage: float  # Expected damage taken before the battle ends
+
+
+def escape_probability(ok: int, num_ships: int) -> float:
+    """Chance that randint(0, ok - 1) > randint(0, num_ships - 1)"""
+    if ok <= num_ships:
+        wins = ok * (ok - 1) // 2
+    else:
+        wins = num_ships * (num_ships - 1) // 2 + (ok - num_ships) * num_ships
+    return wins / (ok * num_ships)
+
+
+def minimum_ok(target: float, num_ships: int) -> int:
+    """Least ok whose escape_probability against num_ships reaches target"""
+    if not 0 <= target < 1:
+        raise ValueError("target escape chance must be in [0, 1)")
+    # Closed forms of escape_probability: (ok - 1) / 2n up to ok = n, then
+    # 1 - (n + 1) / 2ok; solve, then settle the rounding exactly
+    if target <= (num_ships - 1) / (2 * num_ships):
+        ok = math.ceil(2 * num_ships * target + 1)
+    else:
+        ok = math.ceil((num_ships + 1) / (2 * (1 - target)))
+    ok = max(ok, 1)
+    while ok > 1 and escape_probability(ok - 1, num_ships) >= target:
+        ok -= 1
+    while escape_probability(ok, num_ships) < target:
+        ok += 1
+    return ok
+
+
+def damage_distribution(scale: float, offset: float) -> list[tuple[int, float]]:
+    """Distribution of int(scale * random() + offset) as (value, probability)"""
+    if scale <= 0:
+        return [(int(offset), 1.0)]
+    low = int(offset)
+    high = int(scale + offset)
+    if high == scale + offset:
+        high -= 1  # random() never returns 1.0
+    outcomes = []
+    for value in range(low, high + 1):
+        start = max((value - offset) / scale, 0.0)
+        end = min((value + 1 - offset) / scale, 1.0)
+        if end > start:
+            outcomes.append((value, end - start))
+    return outcomes
+
+
+def solve_run(
+    num_ships: int,
+    guns: int,
+    damage: int,
+    capacity: int,
+    ed: float = BASE_ENEMY_DAMAGE,
+    battle_type: int = GENERIC,
+    ok: int = 0,
+    ik: int = 1,
+    thrown: int = 0,
+) -> BattleOdds:
+    """
+    Solve a battle in which the player runs every round.
+
+    ok and ik are the current escape chance and increment; thrown is the
+    cargo jettisoned on the first round, which adds thrown // 10 to ok.
+    """
+    ok += thrown // 10
+    fled = lost = interrupted = dropped = 0.0
+    final_damage = 0.0  # Probability-weighted damage when the battle ends
+    interrupt = 1 / 20 if battle_type == GENERIC else 0.0
+    fire_cache = {}
+
+    # Probability of each (ships, damage, guns) still in the battle
+    states = {(num_ships, damage, guns): 1.0}
+    for _ in range(MAX_ROUNDS):
+        if not states:
+            break
+        ok += ik
+        ik += 1
+        chased = {}
+        for (ships, dmg, gun), p in states.items():
+            if dmg >= capacity:
+                lost += p
+                final_damage += p * dmg
+                continue
+
+            p_escape = escape_probability(ok, ships)
+            fled += p * p_escape
+            final_damage += p * p_escape * dmg
+            p *= 1 - p_escape
+
+            # Some pursuers may fall behind: (randint(0, ships - 1) // 2) + 1
+            if ships > 2:
+                for behind in range(1, (ships + 1) // 2 + 1):
+                    ways = min(2, ships - 2 * (behind - 1))
+                    key = (ships - behind, dmg, gun)
+                    chased[key] = chased.get(key, 0.0) + p * ways / 5 / ships
+                p *= 4 / 5
+            key = (ships, dmg, gun)
+            chased[key] = chased.get(key, 0.0) + p
+
+        states = {}
+        for (ships, dmg, gun), p in chased.items():
+            if p < TOLERANCE:
+                dropped += p
+                final_damage += p * dmg
+                continue
+            for taken, guns_left, q in _enemy_fire(
+                ships, dmg, gun, capacity, ed, battle_type, fire_cache
+            ):
+                q *= p
+                interrupted += q * interrupt
+                final_damage += q * interrupt * (dmg + taken)
+                key = (ships, dmg + taken, guns_left)
+                states[key] = states.get(key, 0.0) + q * (1 - interrupt)
+
+    unresolved = dropped + sum(states.values(), 0.0)
+    final_damage += sum(p * dmg for (_, dmg, _), p in states.items())
+    return BattleOdds(0.0, fled, lost, interrupted, unresolved, final_damage - damage)
+
+
+def _enemy_fire(
+    ships: int,
+    damage: int,
+    guns: int,
+    capacity: int,
+    ed: float,
+    battle_type: int,
+    fire_cache: dict,
+) -> list[tuple[int, int, float]]:
+    """Outcomes of one round of enemy fire as (damage taken, guns left, p)"""
+    hits = min(ships, 15)
+    percent = int((damage / capacity) * 100)
+    p_gun_hit = 0.0
+    if guns > 0:
+        p_gun_hit = 1.0 if percent > 80 else max(percent, 0) / 100
+    outcomes = []
+    for hit_count, p_branch, guns_left in (
+        (hits, 1 - p_gun_hit, guns),
+        (1, p_gun_hit, guns - 1),
+    ):
+        if p_branch == 0:
+            continue
+        fire = fire_cache.get(hit_count)
+        if fire is None:
+            fire = damage_distribution(ed * hit_count * battle_type, hit_count / 2)
+            fire_cache[hit_count] = fire
+        for taken, p_taken in fire:
+            outcomes.append((taken, guns_left, p_branch * p_taken))
+    return outcomes
+
+
+def sinking_hazards(ec: float = BASE_ENEMY_HEALTH) -> tuple[float, ...]:
+    """
+    Chance that a ship which has survived k hits sinks on the next one.
+
+    Ships spawn with int(ec * random() + 20) hit points and every hit takes
+    randint(10, 40); the last entry is 1, as no ship survives more hits.
+    """
+    health = damage_distribution(ec, 20)
+    # Distribution of the total of k hits, starting from k = 0
+    totals = {0: 1.0}
+    survival = [1.0]
+    while survival[-1] > 0:
+        sums = {}
+        for total, p in totals.items():
+            for hit in range(10, 41):
+                sums[total + hit] = sums.get(total + hit, 0.0) + p / 31
+        totals = sums
+        survival.append(
+            sum(
+                p_h * p for h, p_h in health for total, p in totals.items() if total < h
+            )
+        )
+    return tuple(
+        1 - survival[k + 1] / survival[k] if survival[k + 1] > 0 else 1.0
+        for k in range(len(survival) - 1)
+    )
+
+
+def _volley(
+    ships: int, screen: tuple, guns: int, hazards: tuple, shots: dict
+) -> dict[tuple[int, tuple], float]:
+    """
+    Ships left and hit counts on screen after every gun has fired once.
+
+    screen[k] is the number of ships on screen that have survived k hits.
+    shots caches the outcomes of a single shot by (ships, screen).
+    """
+    states = {(ships, screen): 1.0}
+    for _ in range(guns):
+        fired = {}
+        for state, p in states.items():
+            outcomes = shots.get(state)
+            if outcomes is None:
+                outcomes = _shot(*state, hazards)
+                shots[state] = outcomes
+            for key, q in outcomes:
+                fired[key] = fired.get(key, 0.0) + p * q
+        states = fired
+        if all(left == 0 for left, _ in states):
+            break
+    return states
+
+
+def _shot(ships: int, screen: tuple, hazards: tuple) -> tuple:
+    """Outcomes of one shot as ((ships, screen), p)"""
+    if ships == 0:
+        return (((ships, screen), 1.0),)
+    on_screen = sum(screen)
+    if on_screen == 0:
+        screen = (min(ships, 10),) + screen[1:]
+        on_screen = screen[0]
+    outcomes = []
+    for k, n in enumerate(screen):
+        if n == 0:
+            continue
+        q = n / on_screen
+        hazard = hazards[k]
+        hit = list(screen)
+        hit[k] -= 1
+        if hazard > 0:
+            outcomes.append(((ships - 1, tuple(hit)), q * hazard))
+        if hazard < 1:
+            hit[k + 1] += 1
+            outcomes.append(((ships, tuple(hit)), q * (1 - hazard)))
+    return tuple(outcomes)
+
+
+def _leave_screen(ships: int, screen: tuple) -> dict[tuple, float]:
+    """Hit counts on screen after ships beyond the fleet leave, at random"""
+    states = {screen: 1.0}
+    if ships > 10:
+        return states
+    for _ in range(sum(screen) - ships):
+        left = {}
+        for counts, p in states.items():
+            on_screen = sum(counts)
+            for k, n in enumerate(counts):
+                if n:
+                    gone = list(counts)
+                    gone[k] -= 1
+                    key = tuple(gone)
+                    left[key] = left.get(key, 0.0) + p * n / on_screen
+        states = left
+    return states
+
+
+def solve_fight(
+    num_ships: int,
+    guns: int,
+    damage: int,
+    capacity: int,
+    ec: float = BASE_ENEMY_HEALTH,
+    ed: float = BASE_ENEMY_DAMAGE,
+    battle_type: int = GENERIC,
+    s0: Optional[int] = None,
+) -> BattleOdds:
+    """
+    Solve a battle, from its first round, in which the player fights every round.
+
+    s0 is the size of the fleet at the start of the battle, which sets how
+    readily the enemy runs off; it defaults to num_ships. Requires the
+    optional numpy dependency.
+    """
+    import numpy as np
+
+    if s0 is None:
+        s0 = num_ships
+    hazards = sinking_hazards(ec)
+    empty = (0,) * len(hazards)
+    won = lost = interrupted = dropped = 0.0
+    final_damage = 0.0
+    interrupt = 1 / 20 if battle_type == GENERIC else 0.0
+    round_cache = {}
+    runaway_cache = {}
+    leave_cache = {}
+    shot_cache = {}
+    fire_cache = {}
+
+    def runaway(ships: int, screen: tuple) -> list[tuple[int, tuple, float, bool]]:
+        """Ships left, screen, p and whether the battle was interrupted"""
+        outcomes = runaway_cache.get((ships, screen))
+        if outcomes is not None:
+            return outcomes
+        outcomes = []
+        threshold = int(ships * 0.6 / battle_type)
+        p_run = max(s0 - 1 - threshold, 0) / s0 if ships > 2 else 0.0
+        if p_run < 1:
+            outcomes.append((ships, screen, 1 - p_run, False))
+        if p_run > 0:
+            divisor = max(ships // 3 // battle_type, 1)
+            for draw in range(divisor):
+                left = ships - max(draw, 1)
+                p = p_run / divisor
+                if interrupt:
+                    outcomes.append((left, screen, p * interrupt, True))
+                left_on = leave_cache.get((left, screen))
+                if left_on is None:
+                    left_on = _leave_screen(left, screen)
+                    leave_cache[(left, screen)] = left_on
+                for counts, q in left_on.items():
+                    outcomes.append((left, counts, p * (1 - interrupt) * q, False))
+        runaway_cache[(ships, screen)] = outcomes
+        return outcomes
+
+    def fight_round(ships: int, screen: tuple, guns: int) -> tuple:
+        """
+        Chances that a volley and the enemy's response win or interrupt the
+        battle, and of each (ships, screen) it carries on with otherwise.
+        Outcomes less likely than FIGHT_TOLERANCE are dropped, and their total
+        chance returned with the others.
+        """
+        key = (ships, screen, guns)
+        outcome = round_cache.get(key)
+        if outcome is not None:
+            return outcome
+        p_won = p_interrupted = p_dropped = 0.0
+        going_on = {}
+        for (left, counts), q in _volley(
+            ships, screen, guns, hazards, shot_cache
+        ).items():
+            if left == 0:
+                p_won += q
+                continue
+            for after, shown, r, stopped in runaway(left, counts):
+                if stopped:
+                    p_interrupted += q * r
+                else:
+                    going_on[(after, shown)] = going_on.get((after, shown), 0.0) + q * r
+        kept = []
+        for state, q in going_on.items():
+            if q < FIGHT_TOLERANCE:
+                p_dropped += q
+            else:
+                kept.append((state, q))
+        outcome = (p_won, p_interrupted, p_dropped, tuple(kept))
+        round_cache[key] = outcome
+        return outcome
+
+    def fire(hits: int) -> np.ndarray:
+        """Distribution of the damage taken from hits, indexed by damage"""
+        taken = fire_cache.get(hits)
+        if taken is None:
+            outcomes = damage_distribution(ed * hits * battle_type, hits / 2)
+            taken = np.zeros(outcomes[-1][0] + 1)
+            for value, p in outcomes:
+                taken[value] = p
+            fire_cache[hits] = taken
+        return taken
+
+    def add(states: dict, key: tuple, vector: np.ndarray) -> None:
+        if key in states:
+            states[key] += vector
+        else:
+            states[key] = vector.copy()
+
+    # Damage is the vector axis: states maps (ships, screen, guns) to the
+    # probability of each damage still short of capacity
+    levels = np.arange(capacity, dtype=np.float64)
+    percent = ((levels / capacity) * 100).astype(np.int64)
+    p_gun_hit = np.where(percent > 80, 1.0, np.maximum(percent, 0) / 100)
+    states = {}
+    if damage >= capacity:
+        lost, final_damage = 1.0, float(damage)
+    else:
+        start = np.zeros(capacity)
+        start[damage] = 1.0
+        states[(num_ships, empty, guns)] = start
+
+    for _ in range(MAX_ROUNDS):
+        if not states:
+            break
+        fought = {}
+        for (ships, screen, gun), damages in states.items():
+            mass = damages.sum()
+            if mass < FIGHT_TOLERANCE:
+                dropped += mass
+                final_damage += damages @ levels
+                continue
+            screen = (screen[0] + min(ships, 10) - sum(screen),) + screen[1:]
+            if gun == 0:
+                add(fought, (ships, screen, gun), damages)
+                continue
+
+            p_won, p_interrupted, p_dropped, going_on = fight_round(ships, screen, gun)
+            won += mass * p_won
+            interrupted += mass * p_interrupted
+            dropped += mass * p_dropped
+            final_damage += (p_won + p_interrupted + p_dropped) * (damages @ levels)
+            for (after, shown), q in going_on:
+                add(fought, (after, shown, gun), q * damages)
+
+        states = {}
+        for (ships, screen, gun), damages in fought.items():
+            if gun > 0:
+                hit = damages * p_gun_hit
+                branches = ((gun, damages - hit, min(ships, 15)), (gun - 1, hit, 1))
+            else:
+                branches = ((gun, damages, min(ships, 15)),)
+            for guns_left, part, hits in branches:
+                after = np.convolve(part, fire(hits))
+                spread = np.arange(len(after), dtype=np.float64)
+                interrupted += interrupt * after.sum()
+                final_damage += interrupt * (after @ spread)
+                after *= 1 - interrupt
+                sunk = after[capacity:]
+                lost += sunk.sum()
+                final_damage += sunk @ spread[capacity:]
+                add(states, (ships, screen, guns_left), after[:capacity])
+
+    unresolved = dropped
+    for damages in states.values():
+        unresolved += damages.sum()
+        final_damage += damages @ levels
+    return BattleOdds(
+        float(won),
+        0.0,
+        float(lost),
+        float(interrupted),
+        float(unresolved),
+        float(final_damage - damage),
+    )
+
+
+def run_key(
+    num_ships: int,
+    guns: int,
+    damage: int,
+    capacity: int,
+    ed: float = BASE_ENEMY_DAMAGE,
+    battle_type: int = GENERIC,
+    ok: int = 0,
+    ik: int = 1,
+    thrown: int = 0,
+) -> tuple:
+    """OddsTable key of a run_odds query"""
+    return (num_ships, guns, damage, capacity, ed, battle_type, ok, ik, thrown)
+
+
+def fight_key(
+    num_ships: int,
+    guns: int,
+    damage: int,
+    capacity: int,
+    ec: float = BASE_ENEMY_HEALTH,
+    ed: float = BASE_ENEMY_DAMAGE,
+    battle_type: int = GENERIC,
+    s0: Optional[int] = None,
+) -> tuple:
+    """OddsTable key of a fight_odds query"""
+    if s0 is None:
+        s0 = num_ships
+    return ("fight", num_ships, guns, damage, capacity, ec, ed, battle_type, s0)
+
+
+def solve_key(key: tuple) -> BattleOdds:
+    """Solve the battle an OddsTable key describes"""
+    if key[0] == "fight":
+        return solve_fight(*key[1:])
+    return solve_run(*key)
+
+
+class OddsTable:
+    """
+    Memoized solver results backed by a persistent shelve file.
+
+    The file is only opened to read or store a result, never while solving,
+    so games and batch runs can share it. When it cannot be opened, results
+    are kept in memory alone. Only lookups of stored results are fast: a
+    late-game fight can take a minute to solve, so warm() the table ahead
+    of time (python battle_odds.py) for the states that matter.
+    """
+
+    def __init__(self, path: str = DEFAULT_TABLE):
+        self.path = path
+        self.memory = {}
+
+    def run_odds(
+        self,
+        num_ships: int,
+        guns: int,
+        damage: int,
+        capacity: int,
+        ed: float = BASE_ENEMY_DAMAGE,
+        battle_type: int = GENERIC,
+        ok: int = 0,
+        ik: int = 1,
+        thrown: int = 0,
+    ) -> BattleOdds:
+        """Odds of running from the given state, solved at most once per key"""
+        return self.lookup(
+            run_key(num_ships, guns, damage, capacity, ed, battle_type, ok, ik, thrown)
+        )
+
+    def fight_odds(
+        self,
+        num_ships: int,
+        guns: int,
+        damage: int,
+        capacity: int,
+        ec: float = BASE_ENEMY_HEALTH,
+        ed: float = BASE_ENEMY_DAMAGE,
+        battle_type: int = GENERIC,
+        s0: Optional[int] = None,
+    ) -> BattleOdds:
+        """Odds of fighting from the given state, solved at most once per key"""
+        return self.lookup(
+            fight_key(num_ships, guns, damage, capacity, ec, ed, battle_type, s0)
+        )
+
+    def lookup(self, key: tuple) -> BattleOdds:
+        """Odds for key from memory, then the file, then the solver"""
+        odds = self.memory.get(key)
+        if odds is None:
+            odds = self.load([key]).get(key)
+            if odds is None:
+                odds = solve_key(key)
+                self.store({key: odds})
+            self.memory[key] = odds
+        return odds
+
+    def load(self, keys) -> dict[tuple, BattleOdds]:
+        """Stored odds for those of keys the file holds"""
+        found = {}
+        try:
+            with shelve.open(self.path, "r") as table:
+                for key in keys:
+                    stored = table.get(repr(key))
+                    if stored is not None:
+                        found[key] = BattleOdds(*stored)
+        except dbm.error:
+            pass  # No file yet, or another process has it locked
+        return found
+
+    def store(self, results: dict) -> None:
+        """Add results to the file, if it can be opened"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with shelve.open(self.path) as table:
+                for key, odds in results.items():
+                    table[repr(key)] = tuple(odds)
+        except dbm.error:
+            pass
+
+    def warm(self, keys, workers=None) -> int:
+        """
+        Solve and store every key the file does not hold yet, across a
+        process pool; returns how many were solved
+        """
+        keys = list(dict.fromkeys(keys))
+        stored = self.load(keys)
+        self.memory.update(stored)
+        missing = [key for key in keys if key not in stored]
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            for key, odds in zip(missing, pool.map(solve_key, missing)):
+                self.memory[key] = odds
+                self.store({key: odds})
+        return len(missing)
+
+
+class EscapeTable:
+    """
+    Escape chances and the cargo needed to improve them, as lookup tables.
+
+    chance holds escape_probability(ok, ships) for every ok below max_ok and
+    ships below max_ships in one flat float array; needed holds, for each
+    target chance, the least ok that reaches it against each number of
+    ships. Lookups outside the tables fall back to the closed forms. The
+    tables depend on nothing but their limits, so one is shared by all
+    games in a process.
+    """
+
+    _shared = None
+
+    def __init__(
+        self,
+        targets: tuple = ESCAPE_TARGETS,
+        max_ok: int = TABLE_OK,
+        max_ships: int = TABLE_SHIPS,
+    ):
+        self.targets = tuple(targets)
+        self.max_ok = max_ok
+        self.max_ships = max_ships
+        self.chance = array("f", bytes(4 * max_ok * max_ships))
+        for ok in range(1, max_ok):
+            row = ok * max_ships
+            for ships in range(1, max_ships):
+                self.chance[row + ships] = escape_probability(ok, ships)
+        self.needed = {
+            target: array(
+                "I", [0] + [minimum_ok(target, n) for n in range(1, max_ships)]
+            )
+            for target in self.targets
+        }
+
+    @classmethod
+    def shared(cls) -> "EscapeTable":
+        """The default table, built the first time it is asked for"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def escape(self, ok: int, num_ships: int) -> float:
+        """Chance that an escape attempt at ok succeeds against num_ships"""
+        if ok < self.max_ok and num_ships < self.max_ships:
+            return self.chance[ok * self.max_ships + num_ships]
+        return escape_probability(ok, num_ships)
+
+    def jettison(
+        self,
+        target: float,
+        ok: int,
+        ik: int,
+        num_ships: int,
+        available: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Least cargo to throw this round for the escape attempt to reach target.
+
+        ok and ik are the battle's values before the round; throwing raises
+        ok by a tenth of the cargo and running then adds ik before the roll.
+        Returns None when that is more than the available units.
+        """
+        if num_ships < self.max_ships and target in self.needed:
+            needed = self.needed[target][num_ships]
+        else:
+            needed = minimum_ok(target, num_ships)
+        amount = max(needed - ok - ik, 0) * 10
+        if available is not None and amount > available:
+            return None
+        return amount
+
+
+def warm_keys(max_ships: int, guns: list, capacities: list, years: int) -> list[tuple]:
+    """
+    Keys of the opening position of every battle against up to max_ships
+    ships, for each gun count and capacity with an undamaged ship, in each
+    of the first years of the game
+    """
+    keys = []
+    for year in range(years):
+        ec = BASE_ENEMY_HEALTH + 10 * year
+        ed = BASE_ENEMY_DAMAGE + 0.5 * year
+        for battle_type in (GENERIC, LI_YUEN):
+            for capacity in capacities:
+                for gun in guns:
+                    for ships in range(1, max_ships + 1):
+                        keys.append(run_key(ships, gun, 0, capacity, ed, battle_type))
+                        if gun > 0:
+                            keys.append(
+                                fight_key(ships, gun, 0, capacity, ec, ed, battle_type)
+                            )
+    return keys
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="battle_odds", description="Warm the battle odds table."
+    )
+    parser.add_argument("--ships", type=int, default=10)
+    parser.add_argument("--guns", type=int, nargs="+", default=[0, 5, 10])
+    parser.add_argument("--capacity", type=int, nargs="+", default=[60])
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--table", default=DEFAULT_TABLE)
+    args = parser.parse_args(argv)
+
+    keys = warm_keys(args.ships, args.guns, args.capacity, args.years)
+    solved = OddsTable(args.table).warm(keys, args.workers)
+    print(f"{len(keys)} states, {solved} solved, table {args.table}")
+
+
+if __name__ == "__main__":
+    main()
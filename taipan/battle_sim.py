@@ -0,0 +1,251 @@
+"""
+Vectorized Monte Carlo simulator for sea battles.
+
+Resolves many independent battles at once with the same rules as
+SeaBattle.battle, holding every battle's state in NumPy arrays. Requires
+the optional numpy dependency.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import *
+
+SLOTS = 10  # Ships that fit on the battle screen
+MAX_ROUNDS = 10000  # Safety net; battles still running are NOT_FINISHED
+
+
+class BattleBatch(NamedTuple):
+    """Per-battle outcomes of a simulated batch"""
+
+    result: np.ndarray  # BATTLE_* code
+    damage: np.ndarray  # Ship damage when the battle ended
+    guns: np.ndarray  # Guns left when the battle ended
+    rounds: np.ndarray  # Rounds the battle lasted
+
+
+def simulate_battles(
+    n: int,
+    num_ships,
+    guns,
+    damage,
+    capacity,
+    ec=BASE_ENEMY_HEALTH,
+    ed=BASE_ENEMY_DAMAGE,
+    battle_type=GENERIC,
+    orders=ORDERS_FIGHT,
+    cargo=0,
+    seed=None,
+    chunk_size: int = 1 << 18,
+) -> BattleBatch:
+    """
+    Simulate n independent battles.
+
+    Every parameter after n may be a scalar or an array of length n. orders
+    is the standing order for the whole battle (ORDERS_FIGHT, ORDERS_RUN or
+    ORDERS_THROW); battles under ORDERS_THROW jettison cargo units on the
+    first round and run on every round after. Battles are processed in
+    chunks of chunk_size to keep memory bounded.
+    """
+    rng = np.random.default_rng(seed)
+    params = [
+        np.broadcast_to(np.asarray(value), (n,))
+        for value in (
+            num_ships,
+            guns,
+            damage,
+            capacity,
+            ec,
+            ed,
+            battle_type,
+            orders,
+            cargo,
+        )
+    ]
+    out = BattleBatch(
+        np.zeros(n, dtype=np.int8),
+        np.zeros(n, dtype=np.int64),
+        np.zeros(n, dtype=np.int64),
+        np.zeros(n, dtype=np.int64),
+    )
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        _simulate_chunk(rng, out, start, [p[start:end] for p in params])
+    return out
+
+
+def outcome_distribution(result: np.ndarray) -> dict:
+    """Fraction of battles ending in each outcome"""
+    counts = np.bincount(result, minlength=BATTLE_LOST + 1) / max(len(result), 1)
+    return {
+        "won": float(counts[BATTLE_WON]),
+        "fled": float(counts[BATTLE_FLED]),
+        "lost": float(counts[BATTLE_LOST]),
+        "interrupted": float(counts[BATTLE_INTERRUPTED]),
+        "unfinished": float(counts[BATTLE_NOT_FINISHED]),
+    }
+
+
+def _randint(rng, high: np.ndarray) -> np.ndarray:
+    """Vectorized random.randint(0, high - 1)"""
+    return rng.integers(0, np.maximum(high, 1))
+
+
+def _simulate_chunk(rng, out: BattleBatch, offset: int, params: list) -> None:
+    num_ships, guns, damage, capacity, ec, ed, battle_type, orders, cargo = params
+    k = len(num_ships)
+
+    # Working state for the battles still in progress
+    idx = np.arange(offset, offset + k)
+    ships = num_ships.astype(np.int64)
+    s0 = ships.copy()
+    guns = guns.astype(np.int64)
+    damage = damage.astype(np.int64)
+    capacity = capacity.astype(np.int64)
+    ec = ec.astype(np.float64)
+    ed = ed.astype(np.float64)
+    bt = battle_type.astype(np.int64)
+    orders = orders.astype(np.int64)
+    cargo = cargo.astype(np.int64)
+    health = np.zeros((k, SLOTS), dtype=np.int32)
+    on_screen = np.zeros(k, dtype=np.int64)
+    ok = np.zeros(k, dtype=np.int64)
+    ik = np.ones(k, dtype=np.int64)
+    result = np.zeros(k, dtype=np.int8)
+
+    def spawn(rows: np.ndarray) -> None:
+        rows = rows[(ships[rows] > on_screen[rows]) & (on_screen[rows] < SLOTS)]
+        if len(rows) == 0:
+            return
+        # Fill empty slots left to right while ships wait off screen
+        block = health[rows]
+        empty = block == 0
+        room = (ships[rows] - on_screen[rows])[:, None]
+        fill = empty & (np.cumsum(empty, axis=1) <= room)
+        new = (ec[rows, None] * rng.random(block.shape) + 20).astype(np.int32)
+        block[fill] = new[fill]
+        health[rows] = block
+        on_screen[rows] += fill.sum(axis=1)
+
+    def leave_screen(rows: np.ndarray) -> None:
+        rows = rows[ships[rows] <= SLOTS]
+        if len(rows) == 0:
+            return
+        for slot in range(SLOTS - 1, -1, -1):
+            rows_out = rows[(on_screen[rows] > ships[rows]) & (health[rows, slot] > 0)]
+            health[rows_out, slot] = 0
+            on_screen[rows_out] -= 1
+
+    for round_no in range(MAX_ROUNDS):
+        if k == 0:
+            break
+        all_rows = np.arange(k)
+
+        # Ship lost?
+        result[damage >= capacity] = BATTLE_LOST
+        live = all_rows[result == BATTLE_NOT_FINISHED]
+        spawn(live)
+
+        # Fight
+        fighters = live[(orders[live] == ORDERS_FIGHT) & (guns[live] > 0)]
+        if len(fighters):
+            ok[fighters] = 3
+            ik[fighters] = 1
+            for shot in range(int(guns[fighters].max())):
+                shooters = fighters[(guns[fighters] > shot) & (ships[fighters] > 0)]
+                if len(shooters) == 0:
+                    break
+                spawn(shooters[on_screen[shooters] == 0])
+
+                # Uniform pick among the ships on screen
+                alive = (health[shooters] > 0).cumsum(axis=1, dtype=np.int8)
+                pick = (rng.random(len(shooters)) * alive[:, -1]).astype(np.int8)
+                targets = (alive > pick[:, None]).argmax(axis=1)
+                health[shooters, targets] -= rng.integers(10, 41, len(shooters))
+
+                sunk = health[shooters, targets] <= 0
+                hit = shooters[sunk]
+                health[hit, targets[sunk]] = 0
+                on_screen[hit] -= 1
+                ships[hit] -= 1
+
+            # Some of the survivors may run away
+            runaway = _randint(rng, s0[fighters]) > (
+                ships[fighters] * 0.6 / bt[fighters]
+            ).astype(np.int64)
+            runaway &= ships[fighters] > 2
+            fled = fighters[runaway]
+            ran = np.maximum(_randint(rng, ships[fled] // 3 // bt[fled]), 1)
+            ships[fled] -= ran
+            interrupted = fled[
+                (bt[fled] == GENERIC) & (rng.integers(0, 20, len(fled)) == 0)
+            ]
+            result[interrupted] = BATTLE_INTERRUPTED
+            leave_screen(fled[result[fled] == BATTLE_NOT_FINISHED])
+
+        # Throw cargo on the first round, then run like everyone else
+        if round_no == 0:
+            throwers = live[orders[live] == ORDERS_THROW]
+            ok[throwers] += cargo[throwers] // 10
+
+        runners = live[
+            (orders[live] != ORDERS_FIGHT) & (result[live] == BATTLE_NOT_FINISHED)
+        ]
+        if len(runners):
+            ok[runners] += ik[runners]
+            ik[runners] += 1
+            escaped = _randint(rng, ok[runners]) > _randint(rng, ships[runners])
+            ships[runners[escaped]] = 0
+
+            chasing = runners[~escaped]
+            lose = chasing[
+                (ships[chasing] > 2) & (rng.integers(0, 5, len(chasing)) == 0)
+            ]
+            ships[lose] -= _randint(rng, ships[lose]) // 2 + 1
+            leave_screen(lose)
+
+        # Enemy fire
+        firing = live[(ships[live] > 0) & (result[live] == BATTLE_NOT_FINISHED)]
+        if len(firing):
+            hits = np.minimum(ships[firing], 15)
+            percent = (damage[firing] / capacity[firing] * 100).astype(np.int64)
+            gun_hit = (guns[firing] > 0) & (
+                (rng.integers(0, 100, len(firing)) < percent) | (percent > 80)
+            )
+            hits[gun_hit] = 1
+            guns[firing[gun_hit]] -= 1
+            damage[firing] += (
+                ed[firing] * hits * bt[firing] * rng.random(len(firing)) + hits / 2
+            ).astype(np.int64)
+            interrupted = firing[
+                (bt[firing] == GENERIC) & (rng.integers(0, 20, len(firing)) == 0)
+            ]
+            result[interrupted] = BATTLE_INTERRUPTED
+
+        # Battles with no ships left are over
+        done = live[(ships[live] == 0) & (result[live] == BATTLE_NOT_FINISHED)]
+        result[done] = np.where(orders[done] == ORDERS_FIGHT, BATTLE_WON, BATTLE_FLED)
+
+        # Record finished battles and drop them from the working set
+        finished = result != BATTLE_NOT_FINISHED
+        rows = idx[finished]
+        out.result[rows] = result[finished]
+        out.damage[rows] = damage[finished]
+        out.guns[rows] = guns[finished]
+        out.rounds[rows] = round_no + (result[finished] != BATTLE_LOST)
+
+        keep = ~finished
+        idx, ships, s0, guns, damage, capacity = (
+            a[keep] for a in (idx, ships, s0, guns, damage, capacity)
+        )
+        ec, ed, bt, orders, cargo = (a[keep] for a in (ec, ed, bt, orders, cargo))
+        health, on_screen, ok, ik, result = (
+            a[keep] for a in (health, on_screen, ok, ik, result)
+        )
+        k = len(idx)
+
+    # Anything left ran out of rounds
+    out.damage[idx] = damage
+    out.guns[idx] = guns
+    out.rounds[idx] = MAX_ROUNDS
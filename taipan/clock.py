@@ -0,0 +1,69 @@
+"""
+Game clock and pacing profiles.
+
+Every pause in the game goes through a clock: sleep() for animation frames
+and timeout() for the timed "press a key or wait" pauses. A pacing profile
+picks the clock, so the same game can run at the classic speed, faster,
+with no delays at all, or on virtual time that advances without sleeping.
+"""
+
+import time
+
+from constants import DEBUG
+
+
+class RealClock:
+    """Clock that really waits, with every delay multiplied by scale."""
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds * self.scale > 0:
+            time.sleep(seconds * self.scale)
+
+    def timeout(self, ms: int) -> int:
+        """Key timeout to use for a pause of ms milliseconds; -1 blocks"""
+        return ms if ms < 0 else int(ms * self.scale)
+
+    def advance(self, seconds: float) -> None:
+        """Account for a timed pause that ran out; real time already has"""
+
+
+class VirtualClock:
+    """Clock that never waits; delays advance its time instead."""
+
+    def __init__(self, start: float = 0.0):
+        self.time = start
+
+    def now(self) -> float:
+        return self.time
+
+    def sleep(self, seconds: float) -> None:
+        self.time += seconds
+
+    def timeout(self, ms: int) -> int:
+        return ms if ms < 0 else 0
+
+    def advance(self, seconds: float) -> None:
+        self.time += seconds
+
+
+PROFILES = {
+    "classic": lambda: RealClock(1.0),
+    "fast": lambda: RealClock(0.2),
+    "instant": lambda: RealClock(0.0),
+    "virtual": VirtualClock,
+}
+DEFAULT_PROFILE = "fast" if DEBUG else "classic"
+
+
+def make_clock(profile: str = DEFAULT_PROFILE):
+    """Create the clock for a named pacing profile"""
+    try:
+        return PROFILES[profile]()
+    except KeyError:
+        raise ValueError(f"unknown pacing profile: {profile}") from None
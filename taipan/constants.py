@@ -11,6 +11,12 @@ BATTLE_INTERRUPTED = 2
 BATTLE_FLED = 3
 BATTLE_LOST = 4
 
+# Battle orders
+ORDERS_NONE = 0
+ORDERS_FIGHT = 1
+ORDERS_RUN = 2
+ORDERS_THROW = 3
+
 # Input constants
 BACKSPACE = 8
 DELETE = 127
@@ -19,14 +25,11 @@ NEWLINE = 10
 
 # Animation and timing constants
 ANIMATION_PAUSE = 0.1
+VOLLEY_THRESHOLD = 20  # Above this many guns, shots are animated in volleys
+MAX_VOLLEYS = 10  # Most frames a single broadside may take
 M_PAUSE = 3000  # Medium pause (3 seconds)
 L_PAUSE = 5000  # Long pause (5 seconds)
 
-if DEBUG:
-    M_PAUSE = 500
-    L_PAUSE = 1000
-    ANIMATION_PAUSE = 0.1
-
 # Game state constants
 STARTING_YEAR = 1860
 STARTING_MONTH = 1
@@ -57,6 +60,8 @@ SILK = 1
 ARMS = 2
 GENERAL = 3
 
+ITEMS = ("Opium", "Silk", "Arms", "General Cargo")
+
 # Port indices
 AT_SEA = 0
 HONG_KONG = 1
@@ -67,6 +72,25 @@ MANILA = 5
 SINGAPORE = 6
 BATAVIA = 7
 
+LOCATIONS = (
+    "At sea",
+    "Hong Kong",
+    "Shanghai",
+    "Nagasaki",
+    "Saigon",
+    "Manila",
+    "Singapore",
+    "Batavia",
+)
+
+# Price scale of each item (first column) and its multiplier in each port
+BASE_PRICE = (
+    (1000, 11, 16, 15, 14, 12, 10, 13),
+    (100, 11, 14, 15, 16, 10, 13, 12),
+    (10, 12, 16, 10, 11, 13, 14, 15),
+    (1, 10, 11, 12, 13, 14, 15, 16),
+)
+
 # Status text indices
 CRITICAL = 0
 POOR = 1
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Headless engine for Taipan.
+
+Runs the TaipanGame rules against a recording presentation layer and a
+programmatic keyboard, so games can be simulated without a terminal.
+"""
+
+import sys
+import time
+from backends import VirtualBackend
+from clock import VirtualClock
+from constants import *
+from inputs import RecordedInput
+from messages import Messages
+from sb_screen import BattleScreen
+from rng import GameRandom
+from taipan import GameOver, TaipanGame
+
+
+class RecordingScreen:
+    """Stand-in for Messages that draws nothing and remembers what was shown.
+
+    Every public method call is accepted and ignored. The name of the most
+    recent call is kept in ``last`` so a keyboard policy can tell which
+    prompt it is answering; with ``record=True`` every call and its
+    arguments are also appended to ``log``.
+    """
+
+    def __init__(self, keyboard=None, firm: str = "headless", record: bool = False):
+        self.keyboard = keyboard
+        self.firm = firm
+        self.last = ""
+        self.log = [] if record else None
+        self.clock = VirtualClock()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        log = self.log
+
+        def call(*args, **kwargs):
+            self.last = name
+            if log is not None:
+                log.append((name, args))
+
+        # Cache the recorder so later calls skip __getattr__
+        setattr(self, name, call)
+        return call
+
+    def name_firm(self) -> str:
+        return self.firm
+
+    def pause(self, seconds: float) -> None:
+        self.clock.sleep(seconds)
+
+    def wait(self, timeout: int) -> int:
+        if timeout > 0:
+            self.clock.advance(timeout / 1000)
+        return -1
+
+    def cleanup_curses(self) -> None:
+        pass
+
+    def battle_screen(self, game) -> "NullBattleScreen":
+        return NullBattleScreen(game)
+
+
+class NullBattleScreen:
+    """
+    Stand-in for BattleScreen that records its calls on the recording screen.
+
+    Every BattleScreen method is a no-op defined on the class, below, that
+    only updates the screen's ``last`` and ``log``, so a new battle builds
+    nothing. Animation pauses and timed waits are skipped outright: the
+    clock is virtual and nothing reads the time a battle took.
+    """
+
+    skip_requested = False
+    interpret_char = BattleScreen.interpret_char
+
+    def __init__(self, game):
+        self.game = game
+
+    def pause(self, seconds: float) -> None:
+        pass
+
+    def pause_input(self, timeout: int = M_PAUSE) -> int:
+        return -1
+
+    def message_get_order_wait(self) -> int:
+        char = 0
+        while char not in [ord("F"), ord("f"), ord("R"), ord("r"), ord("T"), ord("t")]:
+            char = self.game.screen.keyboard.get_one()
+        return self.interpret_char(char)
+
+
+def _recorder(name: str):
+    def call(self, *args, **kwargs):
+        screen = self.game.screen
+        screen.last = name
+        if screen.log is not None:
+            screen.log.append((name, args))
+
+    call.__name__ = name
+    return call
+
+
+for _name in dir(BattleScreen):
+    if not _name.startswith("_") and not hasattr(NullBattleScreen, _name):
+        setattr(NullBattleScreen, _name, _recorder(_name))
+
+
+class ScriptedKeyboard:
+    """Keyboard that plays back a fixed sequence of answers.
+
+    Each entry is a single character for get_one, a number (or "A") for
+    get_num and a character or bool for choice_yes_no. When the script runs
+    out, the fallback keyboard answers; without one EOFError is raised.
+    """
+
+    def __init__(self, script, fallback=None):
+        self.script = iter(script)
+        self.fallback = fallback
+
+    def _next(self):
+        try:
+            return next(self.script)
+        except StopIteration:
+            if self.fallback is None:
+                raise EOFError("keyboard script exhausted")
+            return None
+
+    def get_one(self) -> int:
+        entry = self._next()
+        if entry is None:
+            return self.fallback.get_one()
+        return entry if isinstance(entry, int) else ord(entry)
+
+    def get_num(self, maxlen: int) -> int:
+        entry = self._next()
+        if entry is None:
+            return self.fallback.get_num(maxlen)
+        if isinstance(entry, str) and entry.upper() == "A":
+            return -1
+        return int(entry)
+
+    def choice_yes_no(self) -> bool:
+        entry = self._next()
+        if entry is None:
+            return self.fallback.choice_yes_no()
+        if isinstance(entry, str):
+            return entry in ["Y", "y"]
+        return bool(entry)
+
+
+class Autopilot:
+    """Keyboard policy that declines every offer and sails from port to port."""
+
+    def __init__(self, game: TaipanGame):
+        self.game = game
+
+    def get_one(self) -> int:
+        prompt = self.game.screen.last
+        if prompt == "message_port_menu":
+            return ord("Q")
+        elif prompt == "message_battle_orders":
+            return ord("f") if self.game.guns > 0 else ord("r")
+        elif prompt == "message_cash_or_guns":
+            return ord("1")
+        return ord("n")
+
+    def get_num(self, maxlen: int) -> int:
+        if maxlen == 1:  # Destination prompt
+            return self.game.port % 7 + 1
+        return 0
+
+    def choice_yes_no(self) -> bool:
+        return False
+
+
+def new_game(
+    keyboard=None, seed=None, record: bool = False, buffered: bool = False
+) -> TaipanGame:
+    """Create a started headless game; keyboard defaults to the Autopilot."""
+    game = TaipanGame(RecordingScreen(record=record), GameRandom(seed, buffered))
+    game.screen.keyboard = keyboard if keyboard is not None else Autopilot(game)
+    game.start()
+    return game
+
+
+def run_voyages(game: TaipanGame, count: int) -> int:
+    """Play up to count voyages; returns how many were sailed before game over."""
+    for voyage in range(count):
+        try:
+            game.arrive()
+            game.trade()
+        except GameOver:
+            return voyage + 1
+    return count
+
+
+def replay_session(path: str) -> TaipanGame:
+    """Play a recorded session at full speed on a virtual screen."""
+    source = RecordedInput(path)
+    screen = Messages(VirtualBackend(), source, VirtualClock())
+    game = TaipanGame(screen, GameRandom(source.seed))
+    try:
+        game.main()
+    except (EOFError, GameOver):
+        pass
+    return game
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["replay"]:
+    # Replay recorded sessions, printing a digest of each final screen
+    for path in sys.argv[2:]:
+        game = replay_session(path)
+        print(path, game.screen.backend.screen.digest())
+elif __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    done = 0
+    games = 0
+    start = time.perf_counter()
+    while done < total:
+        done += run_voyages(new_game(seed=games), total - done)
+        games += 1
+    elapsed = time.perf_counter() - start
+    print(f"{done} voyages in {games} games: {done / elapsed:.0f} voyages/sec")
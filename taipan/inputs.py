@@ -0,0 +1,115 @@
+"""
+Input sources for the Taipan keyboard.
+
+An input source has one method, read(timeout), which returns the next key
+code. timeout is in milliseconds; -1 blocks until a key arrives, otherwise
+-1 is returned if no key arrives in time, just like a curses window with
+timeout() set.
+
+- WindowInput: live keys from the screen's window.
+- ScriptedInput: keys from any iterable or generator.
+- RecordedInput: a session saved by InputRecorder, played back at full
+  speed or with its original timing.
+"""
+
+import time
+from typing import Optional
+
+RECORD_HEADER = "# taipan keys v1"
+
+
+class WindowInput:
+    """Live keys read from a curses-style window."""
+
+    def __init__(self, window):
+        self.window = window
+
+    def read(self, timeout: int = -1) -> int:
+        self.window.timeout(timeout)
+        key = self.window.getch()
+        self.window.timeout(-1)
+        return key
+
+
+class ScriptedInput:
+    """
+    Keys taken from an iterable of characters or key codes.
+
+    Timed reads return -1 at once without consuming a key, so scripts only
+    need the keys that answer prompts. EOFError is raised when a blocking
+    read finds the script exhausted.
+    """
+
+    def __init__(self, script):
+        self.script = iter(script)
+
+    def read(self, timeout: int = -1) -> int:
+        if timeout >= 0:
+            return -1
+        key = next(self.script, None)
+        if key is None:
+            raise EOFError("input script exhausted")
+        return key if isinstance(key, int) else ord(key)
+
+
+class RecordedInput:
+    """
+    Keys played back from a file written by InputRecorder.
+
+    Every read returns the next recorded result, including the -1 of a
+    timed wait that expired, so the game takes exactly the path it took
+    when recorded. With realtime=False reads return immediately; with
+    realtime=True each key is held back until its recorded time. Once the
+    recording runs out, reads go to fallback, or raise EOFError without one.
+    """
+
+    def __init__(self, path: str, realtime: bool = False, fallback=None):
+        self.seed = None
+        self.entries = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("#"):
+                    for field in line.split():
+                        if field.startswith("seed="):
+                            self.seed = int(field[5:])
+                elif line:
+                    elapsed, key = line.split()
+                    self.entries.append((int(elapsed), int(key)))
+        self.realtime = realtime
+        self.fallback = fallback
+        self.position = 0
+        self.start = time.monotonic()
+
+    def read(self, timeout: int = -1) -> int:
+        if self.position == len(self.entries):
+            if self.fallback is None:
+                raise EOFError("recorded input exhausted")
+            return self.fallback.read(timeout)
+        elapsed, key = self.entries[self.position]
+        self.position += 1
+        if self.realtime:
+            delay = self.start + elapsed / 1000 - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return key
+
+
+class InputRecorder:
+    """Input source that passes reads through and writes them to a file."""
+
+    def __init__(self, source, path: str, seed: Optional[int] = None):
+        self.source = source
+        self.file = open(path, "w")
+        header = RECORD_HEADER if seed is None else f"{RECORD_HEADER} seed={seed}"
+        self.file.write(header + "\n")
+        self.start = time.monotonic()
+
+    def read(self, timeout: int = -1) -> int:
+        key = self.source.read(timeout)
+        elapsed = int((time.monotonic() - self.start) * 1000)
+        self.file.write(f"{elapsed} {key}\n")
+        return key
+
+    def close(self) -> None:
+        self.file.close()
@@ -0,0 +1,130 @@
+"""
+Write-ahead journal of player decisions.
+
+A full save is written every SNAPSHOT_INTERVAL voyages; in between, every
+answer the game takes from the keyboard is appended to a journal. After a
+crash the last save is loaded and the journal replayed on top of it; the
+random streams are restored from the save, so the same answers lead the
+game down exactly the same path.
+
+Each entry is written straight to the OS, which is enough to survive the
+game crashing; fsync, which also survives the machine going down, is done
+at most once every SYNC_INTERVAL seconds and whenever a new save starts.
+"""
+
+import os
+import time
+from collections import deque
+
+JOURNAL_HEADER = "# taipan journal v1 snapshot="
+SYNC_INTERVAL = 1.0  # Most seconds of decisions a power cut can lose
+SNAPSHOT_INTERVAL = 10  # Voyages between full saves
+ENTRY_KINDS = ("o", "n", "y", "w")  # get_one, get_num, choice_yes_no, wait
+
+
+class Journal:
+    """Append-only log of decisions made since a given save file."""
+
+    def __init__(self, path: str, sync_interval: float = SYNC_INTERVAL):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.file = None
+        self.snapshot = None
+        self.last_sync = time.monotonic()
+
+    def recover(self, snapshot: int) -> list:
+        """Entries recorded since the given save, then keep appending to them"""
+        entries = []
+        try:
+            with open(self.path) as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            lines = []
+        if lines and lines[0] == f"{JOURNAL_HEADER}{snapshot}":
+            # The last line may be cut short by the crash; stop at anything odd
+            for line in lines[1:-1]:
+                kind, _, value = line.partition(" ")
+                if kind not in ENTRY_KINDS or not value.lstrip("-").isdigit():
+                    break
+                entries.append((kind, int(value)))
+        self.rewrite(snapshot, entries)
+        return entries
+
+    def reset(self, snapshot: int) -> None:
+        """Start an empty journal following a new save"""
+        self.rewrite(snapshot, [])
+
+    def rewrite(self, snapshot: int, entries: list) -> None:
+        """Replace the journal with the given entries and sync it"""
+        if self.file is not None:
+            self.file.close()
+        self.snapshot = snapshot
+        self.file = open(self.path, "w")
+        self.file.write(f"{JOURNAL_HEADER}{snapshot}\n")
+        self.file.writelines(f"{kind} {value}\n" for kind, value in entries)
+        self.sync()
+
+    def append(self, kind: str, value: int) -> None:
+        self.file.write(f"{kind} {value}\n")
+        self.file.flush()
+        if time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+    def remove(self) -> None:
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class JournalingKeyboard:
+    """
+    Keyboard wrapper that journals every answer it hands to the game.
+
+    Answers in replay are given back first, without touching the real
+    keyboard. If the game asks for a different kind of answer than the
+    journal holds, the rest of the journal is dropped and play goes live.
+    """
+
+    def __init__(self, keyboard, journal: Journal, replay=()):
+        self.keyboard = keyboard
+        self.journal = journal
+        self.replay = deque(replay)
+        self.replayed = []
+
+    def __getattr__(self, name: str):
+        return getattr(self.keyboard, name)
+
+    def answer(self, kind: str, read) -> int:
+        if self.replay:
+            entry_kind, value = self.replay.popleft()
+            if entry_kind == kind:
+                self.replayed.append((entry_kind, value))
+                return value
+            self.replay.clear()
+            self.journal.rewrite(self.journal.snapshot, self.replayed)
+        value = read()
+        self.journal.append(kind, value)
+        return value
+
+    def get_one(self) -> int:
+        return self.answer("o", self.keyboard.get_one)
+
+    def get_num(self, maxlen: int) -> int:
+        return self.answer("n", lambda: self.keyboard.get_num(maxlen))
+
+    def choice_yes_no(self) -> bool:
+        return bool(self.answer("y", lambda: int(self.keyboard.choice_yes_no())))
+
+    def wait(self, timeout: int = -1) -> int:
+        return self.answer("w", lambda: self.keyboard.wait(timeout))
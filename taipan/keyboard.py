@@ -1,9 +1,23 @@
 import curses
 
+from inputs import WindowInput
+
 
 class Keyboard:
-    def __init__(self, stdscr: curses.window):
+    def __init__(self, stdscr: curses.window, backend, source=None):
         self.stdscr = stdscr
+        self.backend = backend
+        self.source = source if source is not None else WindowInput(stdscr)
+
+    def wait(self, timeout: int = -1) -> int:
+        """Show any staged output, then read a key within timeout ms"""
+        self.backend.doupdate()
+        return self.source.read(timeout)
+
+    def close(self) -> None:
+        """Close the input source if it holds a file"""
+        if hasattr(self.source, "close"):
+            self.source.close()
 
     def choice_yes_no(self) -> bool:
         choice = 0
@@ -24,7 +38,7 @@ class Keyboard:
         choice = 0
 
         while True:
-            input_char = self.stdscr.getch()
+            input_char = self.wait()
 
             if input_char == ord("\n"):  # NEWLINE
                 break
@@ -41,7 +55,7 @@ class Keyboard:
             elif character >= 1:
                 self.stdscr.refresh()
             elif input_char == 27:  # ESCAPE
-                curses.flushinp()
+                self.backend.flushinp()
                 self.stdscr.refresh()
             else:
                 self.stdscr.addch(input_char)
@@ -61,7 +75,7 @@ class Keyboard:
         character = 0
 
         while True:
-            input_char = self.stdscr.getch()
+            input_char = self.wait()
 
             if input_char == ord("\n"):  # NEWLINE
                 break
@@ -79,7 +93,7 @@ class Keyboard:
             elif character >= maxlen:
                 self.stdscr.refresh()
             elif input_char == 27:  # ESCAPE
-                curses.flushinp()
+                self.backend.flushinp()
                 self.stdscr.refresh()
             elif (
                 (input_char == ord("A") or input_char == ord("a"))
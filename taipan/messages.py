@@ -1,34 +1,28 @@
 import curses
 
+from backends import CursesBackend
+from clock import make_clock
 from constants import *
 from keyboard import Keyboard  # type: ignore
+from sb_screen import BattleScreen
 
 
 class Messages:
-    def __init__(self):
-        self.init_curses()
-        self.keyboard = Keyboard(self.stdscr)  # Initialize keyboard here
-
-    def init_curses(self):
-        """Initialize curses and set up the screen"""
-        self.stdscr = curses.initscr()
-        curses.noecho()
-        curses.cbreak()
-        self.stdscr.keypad(True)
-        curses.start_color()
-        curses.init_pair(1, curses.COLOR_RED, curses.COLOR_BLACK)
-        curses.init_pair(2, curses.COLOR_GREEN, curses.COLOR_BLACK)
-        curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-        curses.init_pair(4, curses.COLOR_BLUE, curses.COLOR_BLACK)
-        curses.curs_set(0)  # Hide cursor
+    def __init__(self, backend=None, source=None, clock=None):
+        self.port_view = None  # Fields last drawn by port_stats
+        self.clock = clock if clock is not None else make_clock()
+        self.backend = backend if backend is not None else CursesBackend()
+        self.stdscr = self.backend.window
+        self.keyboard = Keyboard(self.stdscr, self.backend, source)
 
     def cleanup_curses(self):
-        """Clean up curses before exiting"""
-        if self.stdscr:
-            curses.nocbreak()
-            self.stdscr.keypad(False)
-            curses.echo()
-            curses.endwin()
+        """Restore the terminal before exiting"""
+        self.keyboard.close()
+        self.backend.close()
+
+    def battle_screen(self, game) -> BattleScreen:
+        """Create the battle screen that matches this presentation layer"""
+        return BattleScreen(game)
 
     def fancy_numbers(self, num: float) -> str:
         """
@@ -55,6 +49,32 @@ class Messages:
         else:
             return str(int(num))
 
+    def commit(self) -> None:
+        """Send all staged drawing to the terminal in one update"""
+        self.backend.doupdate()
+
+    def wait(self, timeout: int) -> int:
+        """Show pending output, then wait up to timeout ms for a key"""
+        key = self.keyboard.wait(self.clock.timeout(timeout))
+        if key == -1 and timeout > 0:
+            self.clock.advance(timeout / 1000)
+        return key
+
+    def pause(self, seconds: float) -> None:
+        """Show pending output and hold it for the given number of seconds"""
+        self.commit()
+        self.clock.sleep(seconds)
+
+    def clear_screen(self) -> None:
+        """Clear the whole screen; the port display is redrawn in full next time."""
+        self.stdscr.clear()
+        self.port_view = None
+
+    def invalidate_port_field(self, name: str) -> None:
+        """Make port_stats redraw a field that was overwritten elsewhere"""
+        if self.port_view is not None:
+            self.port_view.pop(name, None)
+
     def port_stats(
         self,
         status: int,
@@ -70,15 +90,128 @@ class Messages:
         year: int,
         port: str,
     ) -> None:
-        """Display port statistics screen."""
-        # Clear screen and prepare display
-        self.stdscr.clear()
+        """
+        Display port statistics screen.
 
-        # Center firm name
-        spacer = 12 - (len(firm) // 2)
-        self.stdscr.addstr(0, spacer, f"Firm: {firm}, Hong Kong")
+        The box is drawn once; later calls rewrite only the fields whose
+        values changed since the last call.
+        """
+        view = {
+            "firm": firm,
+            "hkw": tuple(hkw_),
+            "in_use": sum(hkw_),
+            "hold": hold,
+            "hold_": tuple(hold_),
+            "cash": self.fancy_numbers(cash),
+            "bank": self.fancy_numbers(bank),
+            "guns": guns,
+            "date": (month, year),
+            "port": port,
+            "debt": self.fancy_numbers(debt),
+            "status": int(status),
+        }
+        last = self.port_view
+        if last is None:
+            self.clear_screen()
+            self.draw_port_frame()
+            last = {}
+        else:
+            self.stdscr.move(16, 0)
+            self.stdscr.clrtobot()
+        self.port_view = view
+
+        if view["firm"] != last.get("firm"):
+            self.stdscr.move(0, 0)
+            self.stdscr.clrtoeol()
+            spacer = 12 - (len(firm) // 2)
+            self.stdscr.addstr(0, spacer, f"Firm: {firm}, Hong Kong")
+
+        # Warehouse contents
+        if view["hkw"] != last.get("hkw"):
+            for i, amount in enumerate(hkw_):
+                self.stdscr.addstr(3 + i, 12, f"{amount:<8}")
+        if view["in_use"] != last.get("in_use"):
+            in_use = view["in_use"]
+            self.stdscr.addstr(4, 21, f"{in_use:<17}")
+            self.stdscr.addstr(6, 21, f"{10000 - in_use:<17}")
+
+        # Hold status
+        if view["hold"] != last.get("hold"):
+            self.stdscr.addstr(8, 6, " " * 13)
+            self.stdscr.move(8, 6)
+            if hold >= 0:
+                self.stdscr.addstr(str(hold))
+            else:
+                self.stdscr.attron(curses.A_REVERSE)
+                self.stdscr.addstr("Overload")
+                self.stdscr.attroff(curses.A_REVERSE)
+        if view["guns"] != last.get("guns"):
+            self.stdscr.addstr(8, 25, f"{guns:<13}")
+
+        # Current cargo
+        if view["hold_"] != last.get("hold_"):
+            for i, amount in enumerate(hold_):
+                self.stdscr.addstr(9 + i, 12, f"{amount:<26}")
+
+        # Cash and bank balance
+        if view["cash"] != last.get("cash"):
+            self.stdscr.addstr(14, 5, f"{view['cash']:<15}")
+        if view["bank"] != last.get("bank"):
+            self.stdscr.move(14, 25)
+            self.stdscr.clrtoeol()
+            self.stdscr.addstr(view["bank"])
+
+        # Date
+        if view["date"] != last.get("date"):
+            self.stdscr.move(3, 42)
+            self.stdscr.clrtoeol()
+            self.stdscr.addstr("15 ")
+            self.stdscr.attron(curses.A_REVERSE)
+            self.stdscr.addstr(months[month - 1])
+            self.stdscr.attroff(curses.A_REVERSE)
+            self.stdscr.addstr(f" {year}")
+
+        # Location
+        if view["port"] != last.get("port"):
+            self.stdscr.move(6, 43)
+            self.stdscr.clrtoeol()
+            spacer = (9 - len(port)) // 2
+            self.stdscr.addstr(" " * spacer)
+            self.stdscr.attron(curses.A_REVERSE)
+            self.stdscr.addstr(port)
+            self.stdscr.attroff(curses.A_REVERSE)
 
-        # Draw the main display boxes
+        # Debt
+        if view["debt"] != last.get("debt"):
+            self.stdscr.move(9, 41)
+            self.stdscr.clrtoeol()
+            debt_str = view["debt"]
+            spacer = (12 - len(debt_str)) // 2
+            self.stdscr.addstr(" " * spacer)
+            self.stdscr.attron(curses.A_REVERSE)
+            self.stdscr.addstr(debt_str)
+            self.stdscr.attroff(curses.A_REVERSE)
+
+        # Ship status
+        status_index = int(status / 20)
+        status_str = f"{status_texts[status_index]}:{int(status)}"
+        if view["status"] != last.get("status"):
+            self.stdscr.move(12, 42)
+            self.stdscr.clrtoeol()
+            if status_index < 2:
+                self.stdscr.attron(curses.A_REVERSE)
+                self.stdscr.move(12, 51)
+                self.stdscr.addstr("  ")
+            self.stdscr.move(12, 42)
+            self.stdscr.addstr(status_str)
+            self.stdscr.attroff(curses.A_REVERSE)
+
+        # Leave the cursor where a full redraw would
+        self.stdscr.move(12, 42 + len(status_str))
+        self.stdscr.noutrefresh()
+
+    def draw_port_frame(self) -> None:
+        """Draw the static boxes and labels of the port display"""
         self.stdscr.addstr(1, 0, " ______________________________________")
         self.stdscr.addstr(2, 0, "|Hong Kong Warehouse                   |     Date")
         self.stdscr.addstr(3, 0, "|   Opium           In Use:            |")
@@ -97,80 +230,6 @@ class Messages:
         self.stdscr.addstr(14, 0, "Cash:               Bank:")
         self.stdscr.addstr(15, 0, "________________________________________")
 
-        # Display warehouse contents
-        self.stdscr.addstr(3, 12, str(hkw_[0]))
-        self.stdscr.addstr(4, 12, str(hkw_[1]))
-        self.stdscr.addstr(5, 12, str(hkw_[2]))
-        self.stdscr.addstr(6, 12, str(hkw_[3]))
-
-        # Display hold status
-        self.stdscr.move(8, 6)
-        if hold >= 0:
-            self.stdscr.addstr(str(hold))
-        else:
-            self.stdscr.attron(curses.A_REVERSE)
-            self.stdscr.addstr("Overload")
-            self.stdscr.attroff(curses.A_REVERSE)
-
-        # Display current cargo
-        self.stdscr.addstr(9, 12, str(hold_[0]))
-        self.stdscr.addstr(10, 12, str(hold_[1]))
-        self.stdscr.addstr(11, 12, str(hold_[2]))
-        self.stdscr.addstr(12, 12, str(hold_[3]))
-
-        # Display cash
-        self.stdscr.move(14, 5)
-        self.stdscr.addstr(self.fancy_numbers(cash))
-
-        # Calculate and display warehouse usage
-        in_use = sum(hkw_)
-        self.stdscr.addstr(4, 21, str(in_use))
-        self.stdscr.addstr(6, 21, str(10000 - in_use))
-
-        # Display guns
-        self.stdscr.addstr(8, 25, str(guns))
-
-        # Display bank balance
-        self.stdscr.move(14, 25)
-        self.stdscr.addstr(self.fancy_numbers(bank))
-
-        # Display date
-        self.stdscr.move(3, 42)
-        self.stdscr.addstr("15 ")
-        self.stdscr.attron(curses.A_REVERSE)
-        self.stdscr.addstr(months[month - 1])
-        self.stdscr.attroff(curses.A_REVERSE)
-        self.stdscr.addstr(f" {year}")
-
-        # Display location
-        self.stdscr.move(6, 43)
-        spacer = (9 - len(port)) // 2
-        self.stdscr.addstr(" " * spacer)
-        self.stdscr.attron(curses.A_REVERSE)
-        self.stdscr.addstr(port)
-        self.stdscr.attroff(curses.A_REVERSE)
-
-        # Display debt
-        self.stdscr.move(9, 41)
-        debt_str = self.fancy_numbers(debt)
-        spacer = (12 - len(debt_str)) // 2
-        self.stdscr.addstr(" " * spacer)
-        self.stdscr.attron(curses.A_REVERSE)
-        self.stdscr.addstr(debt_str)
-        self.stdscr.attroff(curses.A_REVERSE)
-
-        # Display ship status
-        status_index = int(status / 20)
-        if status_index < 2:
-            self.stdscr.attron(curses.A_REVERSE)
-            self.stdscr.move(12, 51)
-            self.stdscr.addstr("  ")
-        self.stdscr.move(12, 42)
-        self.stdscr.addstr(f"{status_texts[status_index]}:{int(status)}")
-        self.stdscr.attroff(curses.A_REVERSE)
-
-        self.stdscr.refresh()
-
     def name_firm(self) -> str:
         """Set the firm name. In debug mode, sets to 'debug'."""
         if DEBUG:
@@ -182,36 +241,34 @@ class Messages:
             firm = ""
 
             while character < 22:
-                input_char = self.stdscr.getch()
+                input_char = self.keyboard.wait()
                 if input_char == ord("\n"):
                     return firm
                 elif (input_char == 8 or input_char == 127) and character == 0:
-                    self.stdscr.refresh()
+                    self.stdscr.noutrefresh()
                 elif input_char == 8 or input_char == 127:
                     self.stdscr.addch(8)
                     self.stdscr.addch(" ")
                     self.stdscr.addch(8)
                     firm = firm[:-1]
                     character -= 1
-                    self.stdscr.refresh()
+                    self.stdscr.noutrefresh()
                 elif input_char == 27:  # Escape key
-                    curses.flushinp()
-                    self.stdscr.refresh()
+                    self.backend.flushinp()
+                    self.stdscr.noutrefresh()
                 else:
                     self.stdscr.addch(input_char)
                     firm += chr(input_char)
                     character += 1
-                    self.stdscr.refresh()
+                    self.stdscr.noutrefresh()
 
     def message_wu_li_deny(self) -> None:
         self.stdscr.addstr("Very well. Elder Brother Wu will not pay\n")
         self.stdscr.addstr("Li Yuen the difference.  I would be very\n")
         self.stdscr.addstr("wary of pirates if I were you, Taipan.\n")
 
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_wu_li_accept(self) -> None:
         self.stdscr.move(18, 0)
@@ -221,10 +278,8 @@ class Messages:
         self.stdscr.addstr("your cash on hand and added the same\n")
         self.stdscr.addstr("amount to your debt.\n")
 
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_mugged(self, num: int) -> None:
         self.stdscr.move(16, 0)
@@ -235,10 +290,8 @@ class Messages:
         self.stdscr.addstr("by cutthroats and you have been robbed\n")
         self.stdscr.addstr("of all of your cash, Taipan!!\n")
 
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_wu_business(self) -> None:
         self.stdscr.move(16, 0)
@@ -248,7 +301,7 @@ class Messages:
         self.stdscr.addstr("Wu, the moneylender? ")
         self.stdscr.move(19, 21)
         self.stdscr.clrtoeol()
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_warning(self, braves: int) -> None:
         self.stdscr.move(16, 0)
@@ -256,20 +309,16 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr(f"Elder Brother Wu has sent {braves} braves\n")
         self.stdscr.addstr("to escort you to the Wu mansion, Taipan.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Elder Brother Wu reminds you of the\n")
         self.stdscr.addstr("Confucian ideal of personal worthiness,\n")
         self.stdscr.addstr("and the importance of paying one's debts.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
@@ -279,14 +328,12 @@ class Messages:
         self.stdscr.addstr("He hopes no such fate awaits you, his\n")
         self.stdscr.addstr("friend, Taipan.\n")
 
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_splash(self) -> None:
-        curses.flushinp()
-        self.stdscr.clear()
+        self.backend.flushinp()
+        self.clear_screen()
         self.stdscr.addstr("\n")
         self.stdscr.addstr(
             "         _____  _    ___ ____   _    _   _               ===============\n"
@@ -339,14 +386,14 @@ class Messages:
             "~ ~^~=~^_~^~ =~ \\~~~~~~~'~~~~'~~~~/~~`` ~=~^~ ~^=           to start.\n"
         )
         self.stdscr.addstr(" ~^=~^~_~-=~^~ ^ `--------------'~^~=~^~_~^=~^~=~\n")
-        curses.curs_set(0)
-        self.stdscr.refresh()
+        self.backend.curs_set(0)
+        self.stdscr.noutrefresh()
 
-        self.stdscr.getch()
-        curses.curs_set(1)
+        self.keyboard.wait()
+        self.backend.curs_set(1)
 
     def message_name_firm(self) -> None:
-        self.stdscr.clear()
+        self.clear_screen()
         self.stdscr.move(7, 0)
         self.stdscr.addstr(" _______________________________________\n")
         self.stdscr.addstr("|     Taipan,                           |\n")
@@ -357,10 +404,10 @@ class Messages:
         self.stdscr.addstr("|           ----------------------      |\n")
         self.stdscr.addstr("|_______________________________________|\n")
         self.stdscr.move(12, 12)
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_cash_or_guns(self) -> None:
-        self.stdscr.clear()
+        self.clear_screen()
         self.stdscr.move(5, 0)
         self.stdscr.addstr("Do you want to start . . .\n\n")
         self.stdscr.addstr("  1) With cash (and a debt)\n\n")
@@ -370,7 +417,7 @@ class Messages:
         self.stdscr.move(15, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("          ?")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_new_ship(self, damage: int, amount: int) -> None:
         self.stdscr.move(16, 0)
@@ -387,7 +434,7 @@ class Messages:
         self.stdscr.addstr(
             f"paying an additional {self.fancy_numbers(amount)}, Taipan? "
         )
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_new_gun(self, amount: int) -> None:
         self.stdscr.move(16, 0)
@@ -395,7 +442,7 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("Do you wish to buy a ship's gun\n")
         self.stdscr.addstr(f"for {self.fancy_numbers(amount)}, Taipan? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_retire(self) -> None:
         self.stdscr.move(16, 0)
@@ -408,10 +455,8 @@ class Messages:
         self.stdscr.addstr(" M I L L I O N A I R E ! \n")
         self.stdscr.addstr("                         \n")
         self.stdscr.attroff(curses.A_REVERSE)
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_li_yuen(self) -> None:
         self.stdscr.move(16, 0)
@@ -420,10 +465,8 @@ class Messages:
         self.stdscr.addstr("Li Yuen has sent a Lieutenant,\n")
         self.stdscr.addstr("Taipan.  He says his admiral wishes\n")
         self.stdscr.addstr("to see you in Hong Kong, posthaste!\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_robbed(self, robbed: int) -> None:
         self.stdscr.move(16, 0)
@@ -434,10 +477,8 @@ class Messages:
         self.stdscr.addstr(
             f"robbed of {self.fancy_numbers(robbed)} in cash, Taipan!!\n"
         )
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_warehouse_robbery(self) -> None:
         self.stdscr.move(16, 0)
@@ -445,10 +486,8 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("Messenger reports large theft\n")
         self.stdscr.addstr("from warehouse, Taipan.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_opium_seized(self, fine: int) -> None:
         self.stdscr.move(16, 0)
@@ -461,20 +500,16 @@ class Messages:
         else:
             self.stdscr.addstr("Opium cargo and have also fined you\n")
             self.stdscr.addstr(f"{self.fancy_numbers(fine)}, Taipan!\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_no_cargo(self) -> None:
         """Display message when player has no cargo"""
         self.stdscr.move(22, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("You have no cargo, Taipan.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_destinations(self) -> None:
         """Display available destinations"""
@@ -485,41 +520,46 @@ class Messages:
         self.stdscr.addstr("1) Hong Kong, 2) Shanghai, 3) Nagasaki,\n")
         self.stdscr.addstr("4) Saigon, 5) Manila, 6) Singapore, or\n")
         self.stdscr.addstr("7) Batavia ? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
+
+    def message_destination_risk(self, risks: list) -> None:
+        """Display the risk of sailing to each port beside the destinations"""
+        self.stdscr.move(16, 42)
+        self.stdscr.addstr(f"{'':9} {'Sink':>5} {'Dmg':>4} {'Booty':>7} {'Loss':>7}")
+        for row, risk in enumerate(risks, 17):
+            self.stdscr.move(row, 42)
+            self.stdscr.addstr(
+                f"{LOCATIONS[risk.port]:9.9} {risk.lost:>5.1%} {risk.damage:>4.0f}"
+                f" {risk.booty:>7.0f} {risk.loss:>7.0f}"
+            )
+        self.stdscr.move(21, 13)  # Back to the destination input
+        self.stdscr.noutrefresh()
 
     def message_storm_sighted(self) -> None:
         """Display storm sighted message"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Storm, Taipan!!\n\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_going_down(self) -> None:
         """Display going down message"""
         self.stdscr.addstr("   I think we're going down!!\n\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_sinking(self) -> None:
         """Display sinking message"""
         self.stdscr.addstr("We're going down, Taipan!!\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_made_it(self) -> None:
         """Display made it through storm message"""
         self.stdscr.addstr("    We made it!!\n\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_li_donation(self, amount: int) -> None:
         """Display Li Yuen's donation request"""
@@ -531,7 +571,7 @@ class Messages:
         self.stdscr.move(20, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Goddess.  Will you pay? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_off_course(self, location: str) -> None:
         """Display off course message"""
@@ -539,26 +579,22 @@ class Messages:
         self.stdscr.clrtobot()
         self.stdscr.addstr("We've been blown off course\n")
         self.stdscr.addstr(f"to {location}")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_arriving(self, location: str) -> None:
         """Display arriving message"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr(f"Arriving at {location}...")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_final_stats(
         self, cash: int, capacity: int, guns: int, years: int, month: int, time: int
     ) -> None:
         """Display final game statistics and rating"""
-        self.stdscr.clear()
+        self.clear_screen()
         self.stdscr.addstr("Your final status:\n\n")
         self.stdscr.addstr(f"Net cash:  {self.fancy_numbers(cash)}\n\n")
         self.stdscr.addstr(f"Ship size: {capacity} units with {guns} guns\n\n")
@@ -617,21 +653,21 @@ class Messages:
         self.stdscr.move(22, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Play again? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_warehouse_full(self) -> None:
         """Display message when warehouse is full"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Taipan, the warehouse is full!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_not_enough(self) -> None:
         """Display message when player doesn't have enough of something"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Taipan, you don't have that much!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_to_hold(self, item: str) -> None:
         """Display comprador's report for transferring cargo"""
@@ -640,51 +676,47 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr(f"How much {item} shall I move\n")
         self.stdscr.addstr("to the hold, Taipan? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_hold_full(self) -> None:
         """Display message when ship's hold is full"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Taipan, the hold is full!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_captains_report(self) -> None:
         """Display captain's report header"""
         self.stdscr.move(16, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("  Captain's Report\n\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_hostile_ships(self, num_ships: int) -> None:
         """Display message about approaching hostile ships"""
         self.stdscr.addstr(f"{num_ships} hostile ships approaching, Taipan!\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_li_yuen_pirates(self) -> None:
         """Display message about Li Yuen's pirates"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Li Yuen's pirates, Taipan!!\n\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.wait(M_PAUSE)
 
     def message_good_joss(self) -> None:
         """Display message when pirates let you be"""
         self.stdscr.addstr("Good joss!! They let us be!!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_li_yuen_fleet(self, num_ships: int) -> None:
         """Display message about Li Yuen's pirate fleet"""
         self.stdscr.addstr(f"{num_ships} ships of Li Yuen's pirate\n")
         self.stdscr.addstr("fleet, Taipan!!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_battle_results(self, result: int, booty: int) -> None:
         """Display battle results"""
@@ -696,9 +728,10 @@ class Messages:
         else:  # Ship lost!
             self.stdscr.addstr("The buggers got us, Taipan!!!\n")
             self.stdscr.addstr("It's all over, now!!!")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_pirates_help(self, location: str):
+        self.invalidate_port_field("port")
         self.stdscr.move(6, 43)
         self.stdscr.addstr(" ")
         self.stdscr.attron(curses.A_REVERSE)
@@ -710,11 +743,9 @@ class Messages:
         self.stdscr.clrtobot()
         self.stdscr.addstr("  Captain's Report\n\n")
         self.stdscr.addstr("Li Yuen's fleet drove them off!")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.wait(M_PAUSE)
 
     def message_wu_pity(self, i: int, j: int) -> None:
         self.stdscr.move(16, 0)
@@ -724,21 +755,21 @@ class Messages:
         self.stdscr.addstr("Taipan.  He is willing to loan you an\n")
         self.stdscr.addstr(f"additional {i} if you will pay back\n")
         self.stdscr.addstr(f"{j}. Are you willing, Taipan? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_game_over(self) -> None:
         self.stdscr.move(16, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("Very well, Taipan, the game is over!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_good_joss(self) -> None:
         self.stdscr.move(16, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("Very well, Taipan.  Good joss!!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_repay(self) -> None:
         self.stdscr.move(16, 0)
@@ -746,7 +777,7 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("How much do you wish to repay\n")
         self.stdscr.addstr("him? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_borrow(self) -> None:
         self.stdscr.move(16, 0)
@@ -754,14 +785,12 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("How much do you wish to\n")
         self.stdscr.addstr("borrow? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_too_much(self) -> None:
         self.stdscr.addstr("\n\nHe won't loan you so much, Taipan!")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_price_change(self, item: str, price: int, is_drop: bool) -> None:
         self.stdscr.move(16, 0)
@@ -772,36 +801,34 @@ class Messages:
             self.stdscr.addstr(f"has dropped to {price}!!\n")
         else:
             self.stdscr.addstr(f"has risen to {price}!!\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_buy_prompt(self) -> None:
         self.stdscr.move(22, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("What do you wish me to buy, Taipan? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_sell_prompt(self) -> None:
         self.stdscr.move(22, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("What do you wish me to sell, Taipan? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_bank_deposit(self) -> None:
         self.stdscr.move(16, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("How much will you deposit? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_bank_withdraw(self) -> None:
         self.stdscr.move(16, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("How much will you withdraw? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_to_warehouse(self, item: str) -> None:
         self.stdscr.move(16, 0)
@@ -809,7 +836,7 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr(f"How much {item} shall I move\n")
         self.stdscr.addstr("to the warehouse, Taipan? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_insufficient_cash(self, cash: int) -> None:
         """Display message when player has insufficient cash"""
@@ -817,27 +844,21 @@ class Messages:
         self.stdscr.clrtobot()
         self.stdscr.addstr(f"Taipan, you only have {self.fancy_numbers(cash)}\n")
         self.stdscr.addstr("in cash.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_insufficient_bank(self, bank: int) -> None:
         """Display message when player has insufficient bank balance"""
         self.stdscr.addstr(f"Taipan, you only have {self.fancy_numbers(bank)}\n")
         self.stdscr.addstr("in the bank.")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_already_here(self) -> None:
         """Display message when player tries to travel to current location"""
         self.stdscr.addstr("\n\nYou're already here, Taipan.")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_afford_amount(self, amount: int) -> None:
         """Display how much the player can afford"""
@@ -856,7 +877,7 @@ class Messages:
         self.stdscr.move(23, 42)
         self.stdscr.move(23, 0)
         self.stdscr.addstr("I buy, Taipan: ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
         # Add appropriate spacing based on number size
         if amount < 100:
@@ -872,7 +893,7 @@ class Messages:
 
         self.stdscr.addstr(f"{space}{amount}")
         self.stdscr.attroff(curses.A_REVERSE)
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_comprador_prices(self, prices: list[int]) -> None:
         """Display current prices in the port"""
@@ -890,7 +911,7 @@ class Messages:
         self.stdscr.addstr(str(prices[2]))
         self.stdscr.move(20, 29)
         self.stdscr.addstr(str(prices[3]))
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_port_menu(self, can_retire: bool) -> None:
         """Display port menu options"""
@@ -902,43 +923,44 @@ class Messages:
         else:
             self.stdscr.addstr("Shall I Buy, Sell, Visit bank, Transfer\n")
             self.stdscr.addstr("cargo, Wheedle Wu, or Quit trading? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_buy_amount(self, item: str) -> None:
         """Display buy amount prompt"""
         self.stdscr.move(23, 0)
         self.stdscr.addstr(f"How much {item} shall I buy, Taipan: ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_sell_amount(self, item: str) -> None:
         """Display sell amount prompt"""
         self.stdscr.move(22, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr(f"How much {item} shall I sell, Taipan: ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_destination_choice(self) -> None:
         """Display destination choice prompt"""
         self.stdscr.move(21, 13)
         self.stdscr.clrtobot()
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_location_update(self, location: str) -> None:
         """Update location display"""
+        self.invalidate_port_field("port")
         self.stdscr.move(6, 43)
         self.stdscr.addstr(" ")
         self.stdscr.attron(curses.A_REVERSE)
         self.stdscr.addstr(location)
         self.stdscr.attroff(curses.A_REVERSE)
         self.stdscr.addstr("  ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_captains_report_header(self) -> None:
         """Display captain's report header"""
         self.stdscr.move(16, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("  Captain's Report\n\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_difference(self) -> None:
         """Display message asking if Elder Brother Wu should make up the difference"""
@@ -946,44 +968,41 @@ class Messages:
         self.stdscr.clrtobot()
         self.stdscr.addstr("Do you want Elder Brother Wu to make up\n")
         self.stdscr.addstr("the difference for you? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_paid_in_full(self) -> None:
         """Display message indicating debt has been paid in full"""
         self.stdscr.addstr(f"Taipan, you owe only {self.fancy_numbers(self.debt)}.\n")
         self.stdscr.addstr("Paid in full.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_booty(self) -> None:
         """Display message about captured booty"""
         self.stdscr.addstr("We captured some booty.\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_escaped(self) -> None:
         """Display message about escaping"""
         self.stdscr.addstr("We made it!")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_pause(self) -> None:
         """Pause for user input"""
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_all_over_now(self) -> None:
         """Display game over message"""
         self.stdscr.addstr("The buggers got us, Taipan!!!\n")
         self.stdscr.addstr("It's all over, now!!!")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.wait(L_PAUSE)
 
     def message_after_battle_header(self, location: str) -> None:
         """Display header after battle"""
+        self.invalidate_port_field("port")
         self.stdscr.move(6, 43)
         self.stdscr.addstr(" ")
         self.stdscr.attron(curses.A_REVERSE)
@@ -994,20 +1013,19 @@ class Messages:
         self.stdscr.move(16, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("  Captain's Report\n\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_quit_input(self) -> None:
         """Clear the quit input area"""
         self.stdscr.move(21, 13)
         self.stdscr.clrtobot()
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_clear_refresh(self) -> None:
         """Clear the screen and refresh"""
-        self.stdscr.clear()
+        self.clear_screen()
         self.stdscr.refresh()
-        curses.nocbreak()
-        curses.endwin()
+        self.backend.close()
 
     def message_mchenry_repairs(self) -> None:
         """Display McHenry's repair offer message"""
@@ -1018,7 +1036,7 @@ class Messages:
         self.stdscr.addstr('Shipyards has arrived!!  He says, "I see\n')
         self.stdscr.addstr("ye've a wee bit of damage to yer ship.\n")
         self.stdscr.addstr("Will ye be wanting repairs? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_mchenry_cost(self, amount: int) -> None:
         """Display McHenry's repair cost message"""
@@ -1028,7 +1046,7 @@ class Messages:
         self.stdscr.addstr("Taipan, Mc Henry says it will cost\n")
         self.stdscr.addstr(f"{self.fancy_numbers(amount)} to repair your ship.\n")
         self.stdscr.addstr("Will you pay? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_repairs_complete(self) -> None:
         """Display repair completion message"""
@@ -1037,38 +1055,34 @@ class Messages:
         self.stdscr.addstr("Comprador's Report\n\n")
         self.stdscr.addstr("Taipan, Mc Henry has repaired your\n")
         self.stdscr.addstr("ship.  It is now in perfect condition.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_mchenry_visit(self) -> None:
         """Display McHenry's visit message"""
-        self.stdscr.clear()
+        self.clear_screen()
         self.stdscr.move(0, 0)
         self.stdscr.addstr("McHenry is here, Taipan.")
         self.stdscr.move(1, 0)
         self.stdscr.addstr("He offers to sell you a new ship.")
         self.stdscr.move(2, 0)
         self.stdscr.addstr("Do you wish to buy? (Y/N)")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_mchenry_spend(self) -> None:
         """Display McHenry's spend prompt"""
         self.stdscr.move(3, 0)
         self.stdscr.addstr("How much do you wish to spend?")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_mchenry_new_capacity(self, capacity: int) -> None:
         """Display new ship capacity message"""
         self.stdscr.move(4, 0)
         self.stdscr.addstr(f"Your new capacity is {capacity}.")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
-        self.stdscr.clear()
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
+        self.clear_screen()
+        self.stdscr.noutrefresh()
 
     def message_mchenry_damage(self, percent: int, repair_price: int) -> None:
         """Display ship damage and repair cost message"""
@@ -1078,30 +1092,28 @@ class Messages:
         self.stdscr.addstr(f"We can fix yer whole ship for {repair_price},\n")
         self.stdscr.addstr("or make partial repairs if you wish.\n")
         self.stdscr.addstr("How much will ye spend? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_mchenry_no_free_work(self) -> None:
         """Display message when player can't afford repairs"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("McHenry does not work for free, Taipan!\n")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_insufficient_funds(self) -> None:
         """Display message when player has insufficient funds"""
         self.stdscr.move(18, 0)
         self.stdscr.clrtobot()
         self.stdscr.addstr("Taipan, you do not have enough cash!!\n\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(M_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(M_PAUSE)
 
     def message_wu_difference_offer(self) -> None:
         """Display Elder Brother Wu's offer to make up the difference"""
         self.stdscr.addstr("Do you want Elder Brother Wu to make up\n")
         self.stdscr.addstr("the difference for you? ")
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
 
     def message_wu_loan_terms(self) -> None:
         """Display Elder Brother Wu's loan terms"""
@@ -1111,17 +1123,13 @@ class Messages:
         self.stdscr.addstr("difference between what he wanted and\n")
         self.stdscr.addstr("your cash on hand and added the same\n")
         self.stdscr.addstr("amount to your debt.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
 
     def message_wu_deny_help(self) -> None:
         """Display message when Elder Brother Wu denies help"""
         self.stdscr.addstr("Very well. Elder Brother Wu will not pay\n")
         self.stdscr.addstr("McHenry the difference.  I would be very\n")
         self.stdscr.addstr("wary of pirates if I were you, Taipan.\n")
-        self.stdscr.refresh()
-        self.stdscr.timeout(L_PAUSE)
-        self.stdscr.getch()
-        self.stdscr.timeout(-1)
+        self.stdscr.noutrefresh()
+        self.wait(L_PAUSE)
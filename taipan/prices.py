@@ -0,0 +1,106 @@
+"""
+Precomputed price distributions for every good in every port.
+
+On arrival TaipanGame.set_prices sets each good to
+(base_price[item][port] / 2) * randint(1, 3) * base_price[item][0], and one
+time in nine good_prices then shocks a single good: down to a fifth, or up
+five to nine times. PRICE_LEVELS holds the three set_prices outcomes for
+each (item, port); price_distribution folds in the shocks to give the full
+discrete distribution of the price found on arrival.
+
+MarketSampler draws prices for all seven ports and four goods in one
+vectorized call, for simulations and planners that want whole-world
+markets. It requires the optional numpy dependency.
+"""
+
+from constants import *
+
+FACTORS = (1, 2, 3)  # Outcomes of randint(1, 3) in set_prices
+SHOCK_CHANCE = 1 / 9  # good_prices runs on one arrival in nine...
+SHOCKED_ITEM = 1 / 4  # ...and changes one of the four goods
+BOOMS = (5, 6, 7, 8, 9)  # Multipliers of a price boom
+
+# PRICE_LEVELS[item][port][factor - 1], computed exactly as set_prices does
+PRICE_LEVELS = tuple(
+    tuple(
+        tuple((base[port] / 2) * factor * base[0] for factor in FACTORS)
+        for port in range(len(LOCATIONS))
+    )
+    for base in BASE_PRICE
+)
+
+
+def price_distribution(item: int, port: int, shocks: bool = True) -> tuple:
+    """Distribution of item's price on arrival at port, as (price, probability)"""
+    shock = SHOCK_CHANCE * SHOCKED_ITEM if shocks else 0.0
+    outcomes = {}
+    for level in PRICE_LEVELS[item][port]:
+        p = 1 / len(FACTORS)
+        outcomes[level] = outcomes.get(level, 0.0) + p * (1 - shock)
+        if shock:
+            crash = level // 5
+            outcomes[crash] = outcomes.get(crash, 0.0) + p * shock / 2
+            for boom in BOOMS:
+                price = level * boom
+                outcomes[price] = outcomes.get(price, 0.0) + p * shock / 2 / len(BOOMS)
+    return tuple(sorted(outcomes.items()))
+
+
+# PRICE_DISTRIBUTIONS[item][port] for every port, including port 0 (at sea)
+PRICE_DISTRIBUTIONS = tuple(
+    tuple(price_distribution(item, port) for port in range(len(LOCATIONS)))
+    for item in range(len(BASE_PRICE))
+)
+
+
+def expected_price(item: int, port: int) -> float:
+    """Mean price of item on arrival at port"""
+    return sum(price * p for price, p in PRICE_DISTRIBUTIONS[item][port])
+
+
+class MarketSampler:
+    """
+    Draws prices of every good in every port for many arrivals at once.
+
+    The price tables are turned into arrays once, on construction. Samples
+    are (n, 7, 4) arrays indexed by [draw, port - 1, item]. Without shocks
+    a draw is distributed exactly as set_prices's; with them each price
+    comes from its own arrival distribution, so unlike the game more than
+    one good in a port may be shocked at once. Requires the optional numpy
+    dependency.
+    """
+
+    def __init__(self, seed=None):
+        import numpy as np
+
+        self.rng = np.random.default_rng(seed)
+        ports = range(1, len(LOCATIONS))
+        items = range(len(BASE_PRICE))
+        self.levels = np.array([[PRICE_LEVELS[i][p] for i in items] for p in ports])
+        # Broadcasting indices that pick every (port, item) pair
+        self.ports = np.arange(len(ports))[:, None]
+        self.items = np.arange(len(items))
+
+        # Inverse CDF tables of every arrival distribution, placed end to end:
+        # the (port, item) pair k owns the interval [k, k + 1)
+        cdf, values = [], []
+        for p in ports:
+            for i in items:
+                dist = PRICE_DISTRIBUTIONS[i][p]
+                offset = len(cdf) and int(cdf[-1])
+                # The last bin takes the rest, whatever the rounding
+                cdf.extend(offset + np.cumsum([q for _, q in dist[:-1]]))
+                cdf.append(offset + 1)
+                values.extend(price for price, _ in dist)
+        self.cdf = np.array(cdf)
+        self.values = np.array(values)
+        self.offsets = np.arange(len(ports) * len(items)).reshape(self.levels.shape[:2])
+
+    def sample(self, n: int = 1, shocks: bool = True):
+        """Prices in all ports for n independent arrivals"""
+        shape = (n,) + self.levels.shape[:2]
+        if not shocks:
+            factor = self.rng.integers(0, len(FACTORS), shape)
+            return self.levels[self.ports, self.items, factor]
+        u = self.rng.random(shape) + self.offsets
+        return self.values[self.cdf.searchsorted(u, side="right")]
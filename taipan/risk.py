@@ -0,0 +1,203 @@
+"""
+Voyage risk model for the destination prompt.
+
+The dangers of a voyage in TaipanGame.quit do not depend on where the ship
+is going: pirates (one chance in bp, 1..capacity // 10 + guns ships), Li
+Yuen's fleet (one chance in 4 + 8 * li, unless he protects the ship) and
+storms (one in 10, going down one in 30 of those, sinking if
+damage / capacity * 3 * random() >= 1). Those are estimated by simulating
+the voyage many times at once, with battles resolved by battle_sim under
+the orders the Autopilot would give: fight with guns, run without. The
+estimates are memoized on (capacity, guns, damage, li, bp, ec, ed). The
+enemies' health and damage ec and ed grow once a year, so one simulation
+serves every voyage of a year in the same state. Booty is the one thing
+that grows with the month as well; it is linear in time // 4, so the
+simulation keeps the expected enemy ships in battles won and booty is
+scaled from them on lookup.
+
+What differs between ports is what happens on arrival: opium seizures away
+from Hong Kong and Elder Brother Wu's braves in it. Those expected losses
+follow directly from the current cash, cargo and debt, with seized opium
+valued at its mean arrival price in the port. One voyage in thirty a storm
+blows the ship off course to any other port, so that much of each port's
+expected loss is spread over the rest.
+
+Requires the optional numpy dependency.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from battle_sim import simulate_battles
+from constants import *
+from prices import expected_price
+
+SAMPLES = 10000  # Simulated voyages per memoized estimate
+OFF_COURSE = 1 / 10 * 1 / 3  # Chance a storm blows the ship to another port
+BOOTY_BASE = 749.5  # Mean of the randint(250, 1249) added to every booty
+
+
+class VoyageRisk(NamedTuple):
+    """Expected outcome of one voyage, whatever the destination"""
+
+    lost: float  # Chance of losing the ship in battle or a storm
+    damage: float  # Expected damage taken
+    guns: float  # Expected guns lost
+    booty: float  # Expected booty from battles won
+
+
+class PortRisk(NamedTuple):
+    """Risk of sailing to one port"""
+
+    port: int
+    lost: float
+    damage: float
+    booty: float
+    loss: float  # Expected cash and cargo value lost on arrival
+
+
+class RiskModel:
+    """Memoized voyage risk estimates, one simulation per game state key."""
+
+    def __init__(self, samples: int = SAMPLES, seed=None):
+        self.samples = samples
+        self.rng = np.random.default_rng(seed)
+        self.memory = {}
+
+    def voyage(
+        self,
+        capacity: int,
+        guns: int,
+        damage: int,
+        li: int,
+        bp: int,
+        time: int,
+        ec: float = BASE_ENEMY_HEALTH,
+        ed: float = BASE_ENEMY_DAMAGE,
+    ) -> VoyageRisk:
+        """Risk of a voyage from the given state, simulated at most once per key"""
+        key = (capacity, guns, damage, li, bp, ec, ed)
+        outcome = self.memory.get(key)
+        if outcome is None:
+            outcome = self._simulate(capacity, guns, damage, li, bp, ec, ed)
+            self.memory[key] = outcome
+        lost, taken, guns_lost, beaten, won = outcome
+        return VoyageRisk(
+            lost, taken, guns_lost, time // 4 * 1000 * beaten + BOOTY_BASE * won
+        )
+
+    def _simulate(self, capacity, guns, damage, li, bp, ec, ed) -> tuple:
+        """
+        Chance of losing the ship, expected damage and guns lost, and the
+        expected enemy ships in and number of battles won on one voyage
+        """
+        rng = self.rng
+        n = self.samples
+        result = np.zeros(n, dtype=np.int8)
+        dmg = np.full(n, damage, dtype=np.int64)
+        gun = np.full(n, guns, dtype=np.int64)
+        beaten = np.zeros(n, dtype=np.int64)  # Enemy ships in battles won
+        won = np.zeros(n, dtype=np.int64)  # Battles won
+
+        def battle(rows: np.ndarray, battle_type: int, ships: np.ndarray) -> None:
+            orders = np.where(gun[rows] > 0, ORDERS_FIGHT, ORDERS_RUN)
+            out = simulate_battles(
+                len(rows),
+                ships,
+                gun[rows],
+                dmg[rows],
+                capacity,
+                ec,
+                ed,
+                battle_type,
+                orders,
+                seed=rng,
+            )
+            result[rows] = out.result
+            dmg[rows] = out.damage
+            gun[rows] = out.guns
+            victory = out.result == BATTLE_WON
+            beaten[rows[victory]] += ships[victory]
+            won[rows[victory]] += 1
+
+        # Pirates
+        attacked = np.flatnonzero(rng.integers(0, max(bp, 1), n) == 0)
+        most = min(capacity // 10 + guns, 9999)
+        if len(attacked):
+            battle(attacked, GENERIC, rng.integers(1, max(most, 1) + 1, len(attacked)))
+
+        # Li Yuen's fleet; his protection ends the voyage
+        li_yuen = (
+            (result == BATTLE_NOT_FINISHED) & (rng.integers(0, 4 + 8 * li, n) == 0)
+        ) | (result == BATTLE_INTERRUPTED)
+        sailing = result != BATTLE_LOST
+        if li > 0:
+            sailing &= ~li_yuen
+        else:
+            fleet = np.flatnonzero(li_yuen)
+            if len(fleet):
+                ships = rng.integers(0, capacity // 5 + guns + 1, len(fleet)) + 5
+                battle(fleet, LI_YUEN, ships)
+                sailing = result != BATTLE_LOST
+
+        # Storms
+        going_down = sailing & (rng.random(n) < 0.1) & (rng.random(n) < 1 / 30)
+        foundered = going_down & (dmg / capacity * 3 * rng.random(n) >= 1)
+        lost = (result == BATTLE_LOST) | foundered
+
+        return (
+            float(lost.mean()),
+            float((dmg - damage).mean()),
+            float((guns - gun).mean()),
+            float(beaten.mean()),
+            float(won.mean()),
+        )
+
+    def arrival_loss(self, game, port: int) -> float:
+        """Expected cash and cargo value lost on arrival when sailing for port"""
+        others = [p for p in range(1, len(LOCATIONS)) if p != port]
+        return (1 - OFF_COURSE) * self._port_loss(game, port) + OFF_COURSE * sum(
+            self._port_loss(game, p) for p in others
+        ) / len(others)
+
+    def _port_loss(self, game, port: int) -> float:
+        """Expected cash and cargo value lost to arrival events at port"""
+        cash = max(game.cash, 0)
+        loss = 0.0
+        if port == HONG_KONG:
+            # Elder Brother Wu's braves take all the cash of a big debtor
+            if game.debt * 1.1 > 20000 and cash > 0:
+                loss += cash / 5
+        elif game.hold_[0] > 0:
+            # Seized opium, valued at the prices there, and the fine
+            fine = cash / 1.8 / 2 + 1 if cash > 0 else 0
+            loss += (game.hold_[0] * expected_price(0, port) + fine) / 18
+        if cash > 25000:
+            loss += cash / 1.4 / 2 / 20  # Robbery
+        return loss
+
+    def table(self, game) -> list[PortRisk]:
+        """Risk of sailing to each of the other ports from the game's state"""
+        time = (game.year - 1860) * 12 + game.month
+        voyage = self.voyage(
+            game.capacity,
+            game.guns,
+            game.damage,
+            game.li,
+            game.bp,
+            time,
+            game.ec,
+            game.ed,
+        )
+        return [
+            PortRisk(
+                port,
+                voyage.lost,
+                voyage.damage,
+                voyage.booty,
+                self.arrival_loss(game, port),
+            )
+            for port in range(1, len(LOCATIONS))
+            if port != game.port
+        ]
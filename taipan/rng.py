@@ -0,0 +1,167 @@
+"""
+Random number service for Taipan.
+
+Each game owns a GameRandom with independent named streams, so prices,
+events, battles and animation never disturb each other's sequences and a
+whole run can be replayed from its seed or saved state.
+"""
+
+import os
+import random
+from typing import NamedTuple, Optional
+
+STREAMS = ("prices", "events", "battle", "animation")
+BLOCK_SIZE = 1024  # Uniforms drawn per NumPy batch in buffered streams
+
+
+class BufferedRandom:
+    """
+    Stream that pre-draws uniforms from NumPy in blocks.
+
+    Provides the random() and randint() subset of random.Random used by the
+    game. Requires the optional numpy dependency.
+    """
+
+    def __init__(self, seed: int, stream: int, block_size: int = BLOCK_SIZE):
+        import numpy as np
+
+        seed_seq = np.random.SeedSequence(seed, spawn_key=(stream,))
+        self.generator = np.random.Generator(np.random.PCG64(seed_seq))
+        self.block_size = block_size
+        self._refill()
+
+    def _refill(self) -> None:
+        self._block_state = self.generator.bit_generator.state
+        self._buffer = self.generator.random(self.block_size).tolist()
+        self._pos = 0
+
+    def random(self) -> float:
+        if self._pos == self.block_size:
+            self._refill()
+        u = self._buffer[self._pos]
+        self._pos += 1
+        return u
+
+    def randint(self, a: int, b: int) -> int:
+        if b < a:
+            raise ValueError(f"empty range in randint({a}, {b})")
+        # Inlined random() to keep the hot path to a single call
+        if self._pos == self.block_size:
+            self._refill()
+        u = self._buffer[self._pos]
+        self._pos += 1
+        return a + int(u * (b - a + 1))
+
+    def getstate(self) -> dict:
+        return {"block_state": self._block_state, "pos": self._pos}
+
+    def setstate(self, state: dict) -> None:
+        # Still on the same block, as when a fork rewinds: just move back
+        if state["block_state"] is not self._block_state:
+            self.generator.bit_generator.state = state["block_state"]
+            self._refill()
+            self._block_state = state["block_state"]
+        self._pos = state["pos"]
+
+
+class RandomSnapshot(NamedTuple):
+    """Immutable states of a game's streams, shared freely between forks"""
+
+    seed: int
+    buffered: bool
+    streams: tuple  # Raw stream states, in STREAMS order
+
+
+class GameRandom:
+    """
+    Named random streams for one game: prices, events, battle and animation.
+
+    Streams are random.Random instances seeded from the game seed and the
+    stream name. With buffered=True they are BufferedRandom instances
+    instead, which avoid per-call interpreter overhead in simulations.
+
+    A GameRandom restored from a snapshot is copy-on-write: each stream
+    keeps the snapshot's shared state until the game first draws from it.
+    """
+
+    def __init__(self, seed: Optional[int] = None, buffered: bool = False):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed
+        self.buffered = buffered
+        self._pending = {}  # Streams still at a snapshot state, by name
+        self._spares = {}  # Stream objects to reuse when they are needed again
+        for number, name in enumerate(STREAMS):
+            if buffered:
+                stream = BufferedRandom(seed, number)
+            else:
+                stream = random.Random(f"{seed}:{name}")
+            setattr(self, name, stream)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: RandomSnapshot) -> "GameRandom":
+        """New streams continuing from a snapshot, created when first used"""
+        rng = cls.__new__(cls)
+        rng.seed = snapshot.seed
+        rng.buffered = snapshot.buffered
+        rng._pending = dict(zip(STREAMS, snapshot.streams))
+        rng._spares = {}
+        return rng
+
+    def __getattr__(self, name: str):
+        # Only reached for a stream not materialized since the last restore
+        pending = self.__dict__.get("_pending")
+        if not pending or name not in pending:
+            raise AttributeError(name)
+        stream = self._spares.pop(name, None)
+        if stream is None:
+            if self.buffered:
+                stream = BufferedRandom(self.seed, STREAMS.index(name))
+            else:
+                stream = random.Random(0)
+        stream.setstate(pending.pop(name))
+        setattr(self, name, stream)
+        return stream
+
+    def snapshot(self) -> RandomSnapshot:
+        """Capture every stream; untouched streams share their old state"""
+        pending = self._pending
+        streams = tuple(
+            pending[name] if name in pending else self.__dict__[name].getstate()
+            for name in STREAMS
+        )
+        return RandomSnapshot(self.seed, self.buffered, streams)
+
+    def restore(self, snapshot: RandomSnapshot) -> None:
+        """Return every stream to a snapshot, lazily"""
+        if snapshot.buffered != self.buffered:
+            raise ValueError("random state was saved with a different backend")
+        self.seed = snapshot.seed
+        for name, state in zip(STREAMS, snapshot.streams):
+            stream = self.__dict__.pop(name, None)
+            if stream is not None:
+                self._spares[name] = stream
+            self._pending[name] = state
+
+    def getstate(self) -> dict:
+        """Return the state of every stream as plain, JSON-serializable data"""
+        streams = {}
+        for name in STREAMS:
+            state = getattr(self, name).getstate()
+            if not self.buffered:
+                version, internal, gauss_next = state
+                state = [version, list(internal), gauss_next]
+            streams[name] = state
+        return {"seed": self.seed, "buffered": self.buffered, "streams": streams}
+
+    def setstate(self, state: dict) -> None:
+        """Restore stream states produced by getstate"""
+        if state["buffered"] != self.buffered:
+            raise ValueError("random state was saved with a different backend")
+        self.seed = state["seed"]
+        for name in STREAMS:
+            stream_state = state["streams"][name]
+            if not self.buffered:
+                version, internal, gauss_next = stream_state
+                stream_state = (version, tuple(internal), gauss_next)
+            getattr(self, name).setstate(stream_state)
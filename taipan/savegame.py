@@ -0,0 +1,194 @@
+"""
+Compact binary save files for Taipan.
+
+A save file is a fixed header followed by a struct-packed payload:
+
+    header:  magic b"TPSV", format version, payload length, CRC-32 of payload
+    payload: game fields, firm name, then the seed and state of every
+             random stream
+
+Files are written to a temporary file, synced and renamed over the old
+save, so a crash never leaves a half-written save behind. The payload CRC
+also identifies the save, which is how a journal knows which save it follows.
+"""
+
+import os
+import struct
+import zlib
+
+from rng import STREAMS, GameRandom
+
+MAGIC = b"TPSV"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHII")  # magic, version, payload length, crc32
+
+# Fields that may hold floats; a bit mask records which ones were ints
+NUMBER_FIELDS = ("cash", "bank", "debt", "ec", "ed")
+INT_FIELDS = (
+    "hold",
+    "capacity",
+    "guns",
+    "bp",
+    "damage",
+    "month",
+    "year",
+    "li",
+    "port",
+    "wu_warn",
+    "wu_bailout",
+)
+# Number fields, four prices, int mask, int fields, warehouse, hold, game over
+STATE = struct.Struct(f"<{len(NUMBER_FIELDS) + 4}dI{len(INT_FIELDS) + 8}q?")
+
+MT_STATE = struct.Struct("<B?d625I")  # Mersenne Twister: version, gauss, 625 words
+PCG_STATE = struct.Struct("<16s16sBII")  # PCG64 state, inc, has_uint32, uinteger, pos
+
+
+class SaveError(ValueError):
+    """Raised when a save file is not valid or cannot be read."""
+
+
+def _pack_int(value: int) -> bytes:
+    """Length-prefixed signed integer of any size"""
+    data = value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+    return bytes([len(data)]) + data
+
+
+def _unpack_int(data: bytes, offset: int) -> tuple[int, int]:
+    size = data[offset]
+    end = offset + 1 + size
+    return int.from_bytes(data[offset + 1 : end], "little", signed=True), end
+
+
+def _pack_rng(state: dict) -> bytes:
+    parts = [_pack_int(state["seed"]), bytes([state["buffered"]])]
+    for name in STREAMS:
+        stream = state["streams"][name]
+        if state["buffered"]:
+            block = stream["block_state"]
+            parts.append(
+                PCG_STATE.pack(
+                    block["state"]["state"].to_bytes(16, "little"),
+                    block["state"]["inc"].to_bytes(16, "little"),
+                    block["has_uint32"],
+                    block["uinteger"],
+                    stream["pos"],
+                )
+            )
+        else:
+            version, internal, gauss_next = stream
+            parts.append(
+                MT_STATE.pack(
+                    version,
+                    gauss_next is not None,
+                    gauss_next or 0.0,
+                    *internal,
+                )
+            )
+    return b"".join(parts)
+
+
+def _unpack_rng(data: bytes, offset: int) -> dict:
+    seed, offset = _unpack_int(data, offset)
+    buffered = bool(data[offset])
+    offset += 1
+    streams = {}
+    for name in STREAMS:
+        if buffered:
+            state, inc, has_uint32, uinteger, pos = PCG_STATE.unpack_from(data, offset)
+            offset += PCG_STATE.size
+            streams[name] = {
+                "block_state": {
+                    "bit_generator": "PCG64",
+                    "state": {
+                        "state": int.from_bytes(state, "little"),
+                        "inc": int.from_bytes(inc, "little"),
+                    },
+                    "has_uint32": has_uint32,
+                    "uinteger": uinteger,
+                },
+                "pos": pos,
+            }
+        else:
+            values = MT_STATE.unpack_from(data, offset)
+            offset += MT_STATE.size
+            version, has_gauss, gauss = values[:3]
+            streams[name] = [version, list(values[3:]), gauss if has_gauss else None]
+    return {"seed": seed, "buffered": buffered, "streams": streams}
+
+
+def dumps(game) -> bytes:
+    """Serialize the state of a game and its random streams"""
+    numbers = [getattr(game, name) for name in NUMBER_FIELDS] + list(game.price)
+    int_mask = sum(1 << i for i, value in enumerate(numbers) if isinstance(value, int))
+    ints = [getattr(game, name) for name in INT_FIELDS] + game.hkw_ + game.hold_
+    firm = game.firm.encode("utf-8")[:255]
+    payload = b"".join(
+        [
+            STATE.pack(*numbers, int_mask, *ints, game.game_over),
+            bytes([len(firm)]),
+            firm,
+            _pack_rng(game.rng.getstate()),
+        ]
+    )
+    return HEADER.pack(MAGIC, VERSION, len(payload), zlib.crc32(payload)) + payload
+
+
+def loads(game, data: bytes) -> int:
+    """Restore a game from data produced by dumps(); returns its CRC"""
+    if len(data) < HEADER.size:
+        raise SaveError("save file is truncated")
+    magic, version, length, crc = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveError("not a Taipan save file")
+    if version != VERSION:
+        raise SaveError(f"unsupported save file version {version}")
+    payload = data[HEADER.size : HEADER.size + length]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise SaveError("save file is corrupt")
+
+    values = STATE.unpack_from(payload)
+    count = len(NUMBER_FIELDS) + 4
+    numbers = list(values[:count])
+    int_mask = values[count]
+    for i, value in enumerate(numbers):
+        if int_mask & (1 << i):
+            numbers[i] = int(value)
+    ints = values[count + 1 : -1]
+
+    for name, value in zip(NUMBER_FIELDS, numbers):
+        setattr(game, name, value)
+    game.price = numbers[len(NUMBER_FIELDS) :]
+    for name, value in zip(INT_FIELDS, ints):
+        setattr(game, name, value)
+    game.hkw_ = list(ints[len(INT_FIELDS) : len(INT_FIELDS) + 4])
+    game.hold_ = list(ints[len(INT_FIELDS) + 4 :])
+    game.game_over = values[-1]
+
+    offset = STATE.size
+    size = payload[offset]
+    game.firm = payload[offset + 1 : offset + 1 + size].decode("utf-8")
+    state = _unpack_rng(payload, offset + 1 + size)
+    if state["buffered"] != game.rng.buffered:
+        game.rng = GameRandom(state["seed"], state["buffered"])
+    game.rng.setstate(state)
+    return crc
+
+
+def save_game(game, path: str) -> int:
+    """Write a save file atomically: temp file, fsync, then rename; returns its CRC"""
+    data = dumps(game)
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+    return HEADER.unpack_from(data)[3]
+
+
+def load_game(game, path: str) -> int:
+    """Restore a game from a save file; returns its CRC"""
+    with open(path, "rb") as f:
+        return loads(game, f.read())
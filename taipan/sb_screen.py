@@ -1,12 +1,17 @@
 import curses
-import random
-import time
 from constants import *
 
 
 class BattleScreen:
     def __init__(self, game):
         self.game = game
+        self.flash_window = None
+        self.blank_window = None
+        self.skip_requested = False  # Player asked to skip to the result
+
+    def pause(self, seconds: float) -> None:
+        """Show the staged frame and hold it for the given number of seconds"""
+        self.game.screen.pause(seconds)
 
     def draw_lorcha(self, x: int, y: int) -> None:
         """Draw a lorcha (ship) at given coordinates"""
@@ -18,7 +23,7 @@ class BattleScreen:
         self.game.screen.stdscr.addstr("_|__|__/")
         self.game.screen.stdscr.move(y + 3, x)
         self.game.screen.stdscr.addstr("\\_____/ ")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def clear_lorcha(self, x: int, y: int) -> None:
         """Clear a lorcha from given coordinates"""
@@ -30,7 +35,7 @@ class BattleScreen:
         self.game.screen.stdscr.addstr("        ")
         self.game.screen.stdscr.move(y + 3, x)
         self.game.screen.stdscr.addstr("        ")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def draw_blast(self, x: int, y: int) -> None:
         """Draw a blast effect at given coordinates"""
@@ -42,11 +47,29 @@ class BattleScreen:
         self.game.screen.stdscr.addstr("********")
         self.game.screen.stdscr.move(y + 3, x)
         self.game.screen.stdscr.addstr("********")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
+
+    def draw_volley(self, ships_on_screen: list, targets: list) -> None:
+        """Draw a whole volley of shots as a single frame"""
+        for slot in set(targets):
+            x = ((slot + 1) * 10) if slot < 5 else ((slot - 4) * 10)
+            y = 6 if slot < 5 else 12
+            self.draw_blast(x, y)
+        self.pause(0.1)
+
+        # Show the fleet as it stands after the volley
+        for slot in range(10):
+            x = ((slot + 1) * 10) if slot < 5 else ((slot - 4) * 10)
+            y = 6 if slot < 5 else 12
+            if ships_on_screen[slot] > 0:
+                self.draw_lorcha(x, y)
+            else:
+                self.clear_lorcha(x, y)
+        self.pause(0.1)
 
     def sink_lorcha(self, x: int, y: int) -> None:
         """Animate a lorcha sinking at given coordinates"""
-        delay = random.randint(0, 19)
+        delay = self.game.rng.animation.randint(0, 19)
 
         self.game.screen.stdscr.move(y, x)
         self.game.screen.stdscr.addstr("        ")
@@ -56,10 +79,10 @@ class BattleScreen:
         self.game.screen.stdscr.addstr("-|-_|_  ")
         self.game.screen.stdscr.move(y + 3, x)
         self.game.screen.stdscr.addstr("_|__|__/")
-        self.game.screen.stdscr.refresh()
-        time.sleep(ANIMATION_PAUSE)
+        self.game.screen.stdscr.noutrefresh()
+        self.pause(ANIMATION_PAUSE)
         if delay == 0:
-            time.sleep(ANIMATION_PAUSE)
+            self.pause(ANIMATION_PAUSE)
 
         self.game.screen.stdscr.move(y + 1, x)
         self.game.screen.stdscr.addstr("        ")
@@ -67,53 +90,49 @@ class BattleScreen:
         self.game.screen.stdscr.addstr("-|-_|_  ")
         self.game.screen.stdscr.move(y + 3, x)
         self.game.screen.stdscr.addstr("-|-_|_  ")
-        self.game.screen.stdscr.refresh()
-        time.sleep(ANIMATION_PAUSE)
+        self.game.screen.stdscr.noutrefresh()
+        self.pause(ANIMATION_PAUSE)
         if delay == 0:
-            time.sleep(ANIMATION_PAUSE)
+            self.pause(ANIMATION_PAUSE)
 
         self.game.screen.stdscr.move(y + 2, x)
         self.game.screen.stdscr.addstr("        ")
         self.game.screen.stdscr.move(y + 3, x)
         self.game.screen.stdscr.addstr("-|-_|_  ")
-        self.game.screen.stdscr.refresh()
-        time.sleep(ANIMATION_PAUSE)
+        self.game.screen.stdscr.noutrefresh()
+        self.pause(ANIMATION_PAUSE)
         if delay == 0:
-            time.sleep(ANIMATION_PAUSE)
+            self.pause(ANIMATION_PAUSE)
 
         self.game.screen.stdscr.move(y + 3, x)
         self.game.screen.stdscr.addstr("        ")
-        self.game.screen.stdscr.refresh()
-        time.sleep(ANIMATION_PAUSE)
+        self.game.screen.stdscr.noutrefresh()
+        self.pause(ANIMATION_PAUSE)
         if delay == 0:
-            time.sleep(ANIMATION_PAUSE)
+            self.pause(ANIMATION_PAUSE)
+
+    def draw_enemy_firing(self) -> None:
+        """Flash the screen for enemy fire, then restore the battle layout"""
+        stdscr = self.game.screen.stdscr
+        if self.flash_window is None:
+            # Precompose the effect once: a window of stars and a blank one
+            rows, cols = stdscr.getmaxyx()
+            rows, cols = min(rows, 24), min(cols, 79)
+            self.flash_window = self.game.screen.backend.new_window(rows, cols)
+            self.flash_window.bkgd("*")
+            self.blank_window = self.game.screen.backend.new_window(rows, cols)
 
-    def draw_enemy_firing(self, ships_on_screen: list) -> None:
-        """Draw enemy firing animation and redraw ships"""
-        # Show blast animation
         for i in range(3):
-            for y in range(24):
-                for x in range(79):
-                    self.game.screen.stdscr.move(y, x)
-                    self.game.screen.stdscr.addstr("*")
-            self.game.screen.stdscr.refresh()
-            time.sleep(0.2)
-            self.game.screen.stdscr.clear()
-            self.game.screen.stdscr.refresh()
-            time.sleep(0.2)
-
-        # Redraw ships
-        x = 10
-        y = 6
-        for i in range(10):
-            if i == 5:
-                x = 10
-                y = 12
-
-            if ships_on_screen[i] > 0:
-                self.draw_lorcha(x, y)
+            self.flash_window.touchwin()
+            self.flash_window.noutrefresh()
+            self.pause(0.2)
+            self.blank_window.touchwin()
+            self.blank_window.noutrefresh()
+            self.pause(0.2)
 
-            x += 10
+        # stdscr itself was never touched, so repainting it restores the layout
+        stdscr.touchwin()
+        stdscr.noutrefresh()
 
     def message_battle_status(self, status: int) -> None:
         """Display current battle status"""
@@ -122,7 +141,7 @@ class BattleScreen:
         self.game.screen.stdscr.addstr(
             f"Current seaworthiness: {status_texts[int(status // 20)]} ({status}%)"
         )
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_orders(self) -> None:
         """Display battle orders prompt"""
@@ -130,27 +149,46 @@ class BattleScreen:
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr(
             "Taipan, what shall we do??    (f=fight, r=run, t=throw cargo)"
+            "  S=skip battle"
         )
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
         self.game.screen.stdscr.timeout(-1)
 
+    def message_battle_advice(self, advice: list) -> None:
+        """Display the advisor's odds under the orders prompt; [] clears them"""
+        self.game.screen.stdscr.move(4, 0)
+        self.game.screen.stdscr.clrtoeol()
+        if advice:
+            keys = {ORDERS_FIGHT: "f", ORDERS_RUN: "r", ORDERS_THROW: "t"}
+            text = "Win/flee/sink %:"
+            for choice in advice:
+                key = keys[choice.orders]
+                if choice.orders == ORDERS_THROW:
+                    key += "osag*"[choice.item]
+                text += (
+                    f"  {key} {choice.won * 100:.0f}/{choice.fled * 100:.0f}"
+                    f"/{choice.lost * 100:.0f}"
+                )
+            self.game.screen.stdscr.addstr(text[:79])
+        self.game.screen.stdscr.noutrefresh()
+
     def message_lf(self) -> None:
         self.game.screen.stdscr.move(16, 0)
         self.game.screen.stdscr.addstr("\n")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_fight(self) -> None:
         """Display fighting messages"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("Aye, we'll fight 'em, Taipan.")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_firing(self) -> None:
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("We're firing on 'em, Taipan!")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_shots_remaining(self, shots: int) -> None:
         """Display remaining shots"""
@@ -160,38 +198,38 @@ class BattleScreen:
             self.game.screen.stdscr.addstr("(1 shot remaining.)")
         else:
             self.game.screen.stdscr.addstr(f"({shots} shots remaining.)")
-        self.game.screen.stdscr.refresh()
-        time.sleep(0.1)
+        self.game.screen.stdscr.noutrefresh()
+        self.pause(0.1)
 
     def message_battle_enemy_firing(self) -> None:
         """Display enemy firing message"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("They're firing on us, Taipan!")
-        self.game.screen.stdscr.refresh()
-        curses.flushinp()
+        self.game.screen.stdscr.noutrefresh()
+        self.game.screen.backend.flushinp()
 
     def message_battle_hit(self) -> None:
         """Display hit message"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("We've been hit, Taipan!!")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_victory(self) -> None:
         """Display victory message"""
-        self.game.screen.stdscr.clear()
+        self.game.screen.clear_screen()
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("We got 'em all, Taipan!")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_no_guns(self) -> None:
         """Display no guns message"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("We have no guns, Taipan!!")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_throw_cargo_interface(self, hold_: list[int]) -> None:
         """Display throw cargo interface"""
@@ -210,46 +248,69 @@ class BattleScreen:
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("What shall I throw overboard, Taipan? ")
-        self.game.screen.stdscr.refresh()
-
-    def message_battle_throw_cargo_amount(self) -> None:
-        """Display throw cargo amount prompt"""
+        self.game.screen.stdscr.noutrefresh()
+
+    def message_battle_throw_cargo_amount(self, suggestions: list = ()) -> None:
+        """
+        Display throw cargo amount prompt and (target, amount) throw hints;
+        an amount of None means there is not enough of the good for target
+        """
+        if suggestions:
+            throws = ", ".join(
+                f"{amount} for a {target * 100:.0f}%"
+                for target, amount in suggestions
+                if amount is not None
+            )
+            short = [target for target, amount in suggestions if amount is None]
+            if throws:
+                text = f"Throw {throws} chance to escape."
+                if short:
+                    text += f" Not enough for {short[0] * 100:.0f}%."
+            else:
+                text = f"Not enough to reach a {short[0] * 100:.0f}% chance to escape."
+            self.game.screen.stdscr.move(4, 0)
+            self.game.screen.stdscr.clrtoeol()
+            self.game.screen.stdscr.addstr(text[:79])
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("How much, Taipan? ")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_throw_cargo_success(self) -> None:
         """Display throw cargo success message"""
+        self.game.screen.stdscr.move(4, 0)
+        self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("Let's hope we lose 'em, Taipan!")
         self.game.screen.stdscr.move(18, 0)
         self.game.screen.stdscr.clrtobot()
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_throw_cargo_empty(self) -> None:
         """Display throw cargo empty message"""
+        self.game.screen.stdscr.move(4, 0)
+        self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("There's nothing there, Taipan!")
         self.game.screen.stdscr.move(18, 0)
         self.game.screen.stdscr.clrtobot()
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_ships_escaped(self, lost: int) -> None:
         """Display message about ships that escaped"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr(f"But we escaped from {lost} of 'em!")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_battle_gun_hit(self) -> None:
         """Display message when a gun is hit"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("The buggers hit a gun, Taipan!!")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_player_hits(self, sk: int) -> None:
         if sk > 0:
@@ -299,12 +360,25 @@ class BattleScreen:
         self.game.screen.stdscr.move(2, 50)
         self.game.screen.stdscr.addstr("+---------")
         self.game.screen.stdscr.move(16, 0)
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
+
+    def message_battle_summary(
+        self, sunk: int, escaped: int, damage: int, guns_lost: int
+    ) -> None:
+        """Display the result of a battle that was skipped"""
+        self.game.screen.clear_screen()
+        self.game.screen.stdscr.move(0, 0)
+        self.game.screen.stdscr.addstr("The battle is over, Taipan.\n\n")
+        self.game.screen.stdscr.addstr(f"   Ships sunk:    {sunk}\n")
+        self.game.screen.stdscr.addstr(f"   Ships escaped: {escaped}\n")
+        self.game.screen.stdscr.addstr(f"   Damage taken:  {damage}\n")
+        self.game.screen.stdscr.addstr(f"   Guns lost:     {guns_lost}\n")
+        self.game.screen.stdscr.noutrefresh()
 
     def message_prepare(self) -> None:
         """Prepare screen for battle"""
-        self.game.screen.stdscr.clear()
-        curses.flushinp()
+        self.game.screen.clear_screen()
+        self.game.screen.backend.flushinp()
 
     def message_ship_ind(self, more: bool = False) -> None:
         """Display ship indicator"""
@@ -313,39 +387,39 @@ class BattleScreen:
             self.game.screen.stdscr.addstr("+")
         else:
             self.game.screen.stdscr.addstr(" ")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_well_run(self) -> None:
         """Display run message"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("Aye, we'll run, Taipan.")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_got_away(self) -> None:
         """Display got away message"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("We got away from 'em, Taipan!")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def message_couldnt_lose(self) -> None:
         """Display couldn't lose message"""
         self.game.screen.stdscr.move(3, 0)
         self.game.screen.stdscr.clrtoeol()
         self.game.screen.stdscr.addstr("Couldn't lose 'em.")
-        self.game.screen.stdscr.refresh()
+        self.game.screen.stdscr.noutrefresh()
 
     def pause_input(self, timeout: int = M_PAUSE) -> int:
-        self.game.screen.stdscr.timeout(timeout)
-        i = self.game.screen.stdscr.getch()
-        self.game.screen.stdscr.timeout(-1)
-        return i
+        key = self.game.screen.wait(timeout)
+        if key in [ord("S"), ord("s")]:
+            self.skip_requested = True
+        return key
 
     def message_get_order_wait(self) -> int:
         char = ""
         while char not in [ord("F"), ord("f"), ord("R"), ord("r"), ord("T"), ord("t")]:
-            char = self.game.screen.stdscr.getch()
+            char = self.game.screen.keyboard.wait()
         return self.interpret_char(char)
 
     def interpret_char(self, char: int, orders: int = 0) -> int:
@@ -357,3 +431,34 @@ class BattleScreen:
             return 3
         else:
             return orders
+
+
+class QuietBattleScreen:
+    """Stand-in for BattleScreen that resolves the rest of a battle unseen.
+
+    Drawing and pauses do nothing and timed waits return at once, so the
+    standing orders carry on. The animation stream is still drawn from, so
+    every random stream ends up exactly as after the animated battle.
+    """
+
+    skip_requested = False
+    interpret_char = BattleScreen.interpret_char
+
+    def __init__(self, game):
+        self.game = game
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def ignore(*args, **kwargs):
+            pass
+
+        setattr(self, name, ignore)
+        return ignore
+
+    def sink_lorcha(self, x: int, y: int) -> None:
+        self.game.rng.animation.randint(0, 19)
+
+    def pause_input(self, timeout: int = M_PAUSE) -> int:
+        return -1
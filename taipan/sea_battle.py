@@ -1,7 +1,36 @@
-import random
-import time
+from advisor import BattleState
+from battle_odds import EscapeTable
 from constants import *
-from sb_screen import BattleScreen
+from sb_screen import QuietBattleScreen
+
+
+class AliveIndex:
+    """Screen slots holding a live ship, kept as a swap-remove list.
+
+    Adding, removing and picking a random live slot are all constant time.
+    """
+
+    def __init__(self, slots: int = 10):
+        self.slots = []
+        self.position = [-1] * slots
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, slot: int) -> None:
+        self.position[slot] = len(self.slots)
+        self.slots.append(slot)
+
+    def remove(self, slot: int) -> None:
+        index = self.position[slot]
+        last = self.slots.pop()
+        if last != slot:
+            self.slots[index] = last
+            self.position[last] = index
+        self.position[slot] = -1
+
+    def choice(self, rng) -> int:
+        return self.slots[rng.randint(0, len(self.slots) - 1)]
 
 
 class SeaBattle:
@@ -9,17 +38,73 @@ class SeaBattle:
         self.game = game
         self.ships_on_screen = [0] * 10
         self.num_on_screen = 0
+        self.alive = AliveIndex()
         self.orders = 0
         self.ok = 0
         self.ik = 1
-        self.battle_screen = BattleScreen(game)
+        self.battle_screen = game.screen.battle_screen(game)
+        self.skipped = False
+        self.sunk = 0
+        self.escaped = 0
 
     def battle(self, battle_type: int, num_ships: int) -> int:
-        """Handle sea battle with pirates"""
+        """Handle sea battle with pirates, summarizing it if it was skipped"""
+        screen = self.battle_screen
+        damage = self.game.damage
+        guns = self.game.guns
+        self.skipped = False
+        self.sunk = 0
+        self.escaped = 0
+
+        result = self.resolve(battle_type, num_ships)
+
+        self.battle_screen = screen
+        if self.skipped:
+            self.battle_screen.message_battle_summary(
+                self.sunk,
+                self.escaped,
+                self.game.damage - damage,
+                guns - self.game.guns,
+            )
+            self.battle_screen.pause_input()
+        return result
+
+    def advise(self, battle_type: int, num_ships: int, s0: int) -> list:
+        """Ask the game's advisor for the odds of each order from here"""
+        game = self.game
+        state = BattleState(
+            num_ships,
+            s0,
+            tuple(self.ships_on_screen),
+            game.guns,
+            game.damage,
+            game.capacity,
+            game.ec,
+            game.ed,
+            self.ok,
+            self.ik,
+            battle_type,
+            tuple(game.hold_),
+        )
+        return game.advisor.advise(state)
+
+    def check_skip(self) -> None:
+        """Resolve the rest of the battle unseen once the player asks to"""
+        if self.battle_screen.skip_requested and self.orders in [
+            ORDERS_FIGHT,
+            ORDERS_RUN,
+        ]:
+            self.battle_screen = QuietBattleScreen(self.game)
+            self.skipped = True
+
+    def resolve(self, battle_type: int, num_ships: int) -> int:
+        """Play out the battle rounds and return the BATTLE_* result"""
+        rng = self.game.rng.battle
         # Initialize battle variables
         self.orders = 0
         self.num_on_screen = 0
         self.ships_on_screen = [0] * 10
+        self.alive = AliveIndex()
         s0 = num_ships  # Original number of ships
         self.ok = 0  # Escape chance
         self.ik = 1  # Escape increment
@@ -50,10 +135,9 @@ class SeaBattle:
 
                 if num_ships > self.num_on_screen:
                     if self.ships_on_screen[i] == 0:
-                        time.sleep(0.1)  # Small delay for animation
-                        self.ships_on_screen[i] = int(
-                            self.game.ec * random.random() + 20
-                        )
+                        self.battle_screen.pause(0.1)  # Small delay for animation
+                        self.ships_on_screen[i] = int(self.game.ec * rng.random() + 20)
+                        self.alive.add(i)
                         self.battle_screen.draw_lorcha(x, y)
                         self.num_on_screen += 1
                     x += 10
@@ -68,8 +152,17 @@ class SeaBattle:
                 input = self.battle_screen.pause_input()
                 self.orders = self.battle_screen.interpret_char(input, self.orders)
                 if self.orders == 0:
+                    # Odds first, so the orders prompt is the last thing shown
+                    if self.game.advisor is not None:
+                        self.battle_screen.message_battle_advice(
+                            self.advise(battle_type, num_ships, s0)
+                        )
                     self.battle_screen.message_battle_orders()
                     self.orders = self.battle_screen.message_get_order_wait()
+                    if self.game.advisor is not None:
+                        self.battle_screen.message_battle_advice([])
+
+            self.check_skip()
 
             # Update battle stats
             self.battle_screen.fight_stats(num_ships, self.orders, self.game.guns)
@@ -85,9 +178,15 @@ class SeaBattle:
                 self.battle_screen.message_firing()
                 input = self.battle_screen.pause_input(timeout=1000)
 
+                # Large broadsides resolve in volleys with one frame each
+                volley = 1
+                if self.game.guns > VOLLEY_THRESHOLD:
+                    volley = -(-self.game.guns // MAX_VOLLEYS)
+                volley_targets = []
+
                 for i in range(1, self.game.guns + 1):
                     # Check if all ships are sunk
-                    if all(ship == 0 for ship in self.ships_on_screen):
+                    if len(self.alive) == 0:
                         x = 10
                         y = 6
                         for j in range(10):
@@ -97,47 +196,53 @@ class SeaBattle:
 
                             if num_ships > self.num_on_screen:
                                 if self.ships_on_screen[j] == 0:
-                                    time.sleep(0.1)
+                                    if volley == 1:
+                                        self.battle_screen.pause(0.1)
                                     self.ships_on_screen[j] = int(
-                                        self.game.ec * random.random() + 20
+                                        self.game.ec * rng.random() + 20
                                     )
-                                    self.battle_screen.draw_lorcha(x, y)
+                                    self.alive.add(j)
+                                    if volley == 1:
+                                        self.battle_screen.draw_lorcha(x, y)
                                     self.num_on_screen += 1
                                 x += 10
 
-                    # Update more ships indicator
-                    self.battle_screen.message_ship_ind(num_ships > self.num_on_screen)
-                    self.battle_screen.message_lf()
-
                     # Select target
-                    targeted = random.randint(0, 9)
-                    while self.ships_on_screen[targeted] == 0:
-                        targeted = random.randint(0, 9)
+                    targeted = self.alive.choice(rng)
 
                     # Calculate target position
                     x = ((targeted + 1) * 10) if targeted < 5 else ((targeted - 4) * 10)
                     y = 6 if targeted < 5 else 12
 
-                    # Show blast animation
-                    self.battle_screen.draw_blast(x, y)
-                    time.sleep(0.1)
+                    if volley == 1:
+                        # Update more ships indicator
+                        self.battle_screen.message_ship_ind(
+                            num_ships > self.num_on_screen
+                        )
+                        self.battle_screen.message_lf()
 
-                    self.battle_screen.draw_lorcha(x, y)
-                    time.sleep(0.1)
+                        # Show blast animation
+                        self.battle_screen.draw_blast(x, y)
+                        self.battle_screen.pause(0.1)
 
-                    self.battle_screen.draw_blast(x, y)
-                    time.sleep(0.1)
+                        self.battle_screen.draw_lorcha(x, y)
+                        self.battle_screen.pause(0.1)
 
-                    self.battle_screen.draw_lorcha(x, y)
-                    time.sleep(0.05)
+                        self.battle_screen.draw_blast(x, y)
+                        self.battle_screen.pause(0.1)
 
-                    # Show remaining shots
-                    self.battle_screen.message_battle_shots_remaining(
-                        self.game.guns - i
-                    )
+                        self.battle_screen.draw_lorcha(x, y)
+                        self.battle_screen.pause(0.05)
+
+                        # Show remaining shots
+                        self.battle_screen.message_battle_shots_remaining(
+                            self.game.guns - i
+                        )
+                    else:
+                        volley_targets.append(targeted)
 
                     # Apply damage with more sophisticated calculation
-                    self.ships_on_screen[targeted] -= random.randint(10, 40)
+                    self.ships_on_screen[targeted] -= rng.randint(10, 40)
 
                     # Check if ship sunk
                     if self.ships_on_screen[targeted] <= 0:
@@ -145,50 +250,72 @@ class SeaBattle:
                         num_ships -= 1
                         sk += 1
                         self.ships_on_screen[targeted] = 0
+                        self.alive.remove(targeted)
 
-                        delay = random.randint(0, 19)
-                        time.sleep(0.1)
-                        self.battle_screen.sink_lorcha(x, y)
-                        if delay == 0:
-                            time.sleep(ANIMATION_PAUSE)
+                        if volley == 1:
+                            delay = self.game.rng.animation.randint(0, 19)
+                            self.battle_screen.pause(0.1)
+                            self.battle_screen.sink_lorcha(x, y)
+                            if delay == 0:
+                                self.battle_screen.pause(ANIMATION_PAUSE)
 
+                            self.battle_screen.message_ship_ind(
+                                num_ships > self.num_on_screen
+                            )
+                            self.battle_screen.fight_stats(
+                                num_ships, self.orders, self.game.guns
+                            )
+
+                    # One frame and one stats update per volley
+                    if volley > 1 and (
+                        i % volley == 0 or i == self.game.guns or num_ships == 0
+                    ):
+                        self.battle_screen.draw_volley(
+                            self.ships_on_screen, volley_targets
+                        )
+                        volley_targets = []
                         self.battle_screen.message_ship_ind(
                             num_ships > self.num_on_screen
                         )
                         self.battle_screen.fight_stats(
                             num_ships, self.orders, self.game.guns
                         )
+                        self.battle_screen.message_battle_shots_remaining(
+                            self.game.guns - i
+                        )
 
                     if num_ships == 0:
                         break
-                    else:
-                        time.sleep(ANIMATION_PAUSE)
+                    elif volley == 1:
+                        self.battle_screen.pause(ANIMATION_PAUSE)
 
                 # Show battle results
+                self.sunk += sk
                 self.battle_screen.message_player_hits(sk)
                 input = self.battle_screen.pause_input()
                 self.orders = self.battle_screen.interpret_char(input, self.orders)
 
                 # Check if some ships ran away
                 if (
-                    random.randint(0, s0 - 1) > int(num_ships * 0.6 / battle_type)
+                    rng.randint(0, s0 - 1) > int(num_ships * 0.6 / battle_type)
                     and num_ships > 2
                 ):
                     divisor = num_ships // 3 // battle_type
                     if divisor == 0:
                         divisor = 1
-                    ran = random.randint(0, divisor - 1)
+                    ran = rng.randint(0, divisor - 1)
                     if ran == 0:
                         ran = 1
 
                     num_ships -= ran
+                    self.escaped += ran
                     self.battle_screen.fight_stats(
                         num_ships, self.orders, self.game.guns
                     )
                     self.battle_screen.message_battle_ships_escaped(ran)
 
                     # Check for Li Yuen's intervention when ships run away
-                    if battle_type == GENERIC and random.randint(0, 19) == 0:
+                    if battle_type == GENERIC and rng.randint(0, 19) == 0:
                         return BATTLE_INTERRUPTED
 
                     if num_ships <= 10:
@@ -198,12 +325,13 @@ class SeaBattle:
                                 and self.ships_on_screen[i] > 0
                             ):
                                 self.ships_on_screen[i] = 0
+                                self.alive.remove(i)
                                 self.num_on_screen -= 1
 
                                 x = ((i + 1) * 10) if i < 5 else ((i - 4) * 10)
                                 y = 6 if i < 5 else 12
                                 self.battle_screen.clear_lorcha(x, y)
-                                time.sleep(0.1)
+                                self.battle_screen.pause(0.1)
 
                     self.battle_screen.message_ship_ind(num_ships > self.num_on_screen)
             elif self.orders == 1 and self.game.guns == 0:
@@ -241,7 +369,22 @@ class SeaBattle:
                     choice = 4
 
                 if choice < 4:
-                    self.battle_screen.message_battle_throw_cargo_amount()
+                    table = EscapeTable.shared()
+                    self.battle_screen.message_battle_throw_cargo_amount(
+                        [
+                            (
+                                target,
+                                table.jettison(
+                                    target,
+                                    self.ok,
+                                    self.ik,
+                                    num_ships,
+                                    self.game.hold_[choice],
+                                ),
+                            )
+                            for target in table.targets
+                        ]
+                    )
 
                     amount = self.game.screen.keyboard.get_num(9)
                     if self.game.hold_[choice] > 0 and (
@@ -280,7 +423,7 @@ class SeaBattle:
                 assert self.ok > 0  # Prevent division by zero
                 assert self.ik > 0  # Prevent division by zero
 
-                if random.randint(0, self.ok - 1) > random.randint(0, num_ships - 1):
+                if rng.randint(0, self.ok - 1) > rng.randint(0, num_ships - 1):
                     self.battle_screen.message_got_away()
                     input = self.battle_screen.pause_input()
                     num_ships = 0
@@ -288,10 +431,11 @@ class SeaBattle:
                     self.battle_screen.message_couldnt_lose()
                     input = self.battle_screen.pause_input()
 
-                    if num_ships > 2 and random.randint(0, 4) == 0:
-                        lost = (random.randint(0, num_ships - 1) // 2) + 1
+                    if num_ships > 2 and rng.randint(0, 4) == 0:
+                        lost = (rng.randint(0, num_ships - 1) // 2) + 1
 
                         num_ships -= lost
+                        self.escaped += lost
                         self.battle_screen.fight_stats(
                             num_ships, self.orders, self.game.guns
                         )
@@ -304,23 +448,26 @@ class SeaBattle:
                                     and self.ships_on_screen[i] > 0
                                 ):
                                     self.ships_on_screen[i] = 0
+                                    self.alive.remove(i)
                                     self.num_on_screen -= 1
 
                                     x = ((i + 1) * 10) if i < 5 else ((i - 4) * 10)
                                     y = 6 if i < 5 else 12
                                     self.battle_screen.clear_lorcha(x, y)
-                                    time.sleep(0.1)
+                                    self.battle_screen.pause(0.1)
 
                             self.battle_screen.message_ship_ind(
                                 num_ships > self.num_on_screen
                             )
             input = self.battle_screen.pause_input()
             self.orders = self.battle_screen.interpret_char(input, self.orders)
+            self.check_skip()
+
             # Handle enemy firing
             if num_ships > 0:
                 self.battle_screen.message_battle_enemy_firing()
                 input = self.battle_screen.pause_input()
-                self.battle_screen.draw_enemy_firing(self.ships_on_screen)
+                self.battle_screen.draw_enemy_firing()
                 # Update more ships indicator
                 self.battle_screen.message_ship_ind(num_ships > self.num_on_screen)
                 self.battle_screen.message_battle_hit()
@@ -329,7 +476,7 @@ class SeaBattle:
                 # Calculate damage
                 i = min(num_ships, 15)
                 if self.game.guns > 0 and (
-                    random.randint(0, 99)
+                    rng.randint(0, 99)
                     < int((self.game.damage / self.game.capacity) * 100)
                     or int((self.game.damage / self.game.capacity) * 100) > 80
                 ):
@@ -343,11 +490,11 @@ class SeaBattle:
                     input = self.battle_screen.pause_input()
                 # Apply damage regardless of debug mode
                 self.game.damage += int(
-                    (self.game.ed * i * battle_type) * random.random() + (i / 2)
+                    (self.game.ed * i * battle_type) * rng.random() + (i / 2)
                 )
 
                 # Check for Li Yuen's intervention
-                if battle_type == GENERIC and random.randint(0, 19) == 0:
+                if battle_type == GENERIC and rng.randint(0, 19) == 0:
                     return BATTLE_INTERRUPTED  # Battle interrupted by Li Yuen's pirates
 
         if self.orders == 1:
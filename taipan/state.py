@@ -0,0 +1,88 @@
+"""
+Mutable state of one game of Taipan.
+
+GameState holds only the numbers that change during play; name tables and
+the base price matrix are shared module-level data in constants. With
+__slots__ and no UI handle, a state is small and copy() is cheap, so many
+games can be simulated or forked for lookahead at little cost.
+"""
+
+from constants import *
+
+
+class GameState:
+    """Numbers describing a game in progress."""
+
+    __slots__ = (
+        "firm",
+        "cash",
+        "bank",
+        "debt",
+        "ec",
+        "ed",
+        "price",
+        "hkw_",
+        "hold_",
+        "hold",
+        "capacity",
+        "guns",
+        "bp",
+        "damage",
+        "month",
+        "year",
+        "li",
+        "port",
+        "wu_warn",
+        "wu_bailout",
+        "game_over",
+    )
+
+    def __init__(self):
+        self.firm = ""  # Firm name (was char[23])
+
+        # Financial state
+        self.cash = STARTING_CASH
+        self.bank = STARTING_BANK
+        self.debt = STARTING_DEBT
+
+        # Combat stats
+        self.ec = BASE_ENEMY_HEALTH
+        self.ed = BASE_ENEMY_DAMAGE
+
+        # Prices and inventory
+        self.price = [0] * 4  # Current prices
+        self.hkw_ = [0] * 4  # Hong Kong warehouse
+        self.hold_ = [0] * 4  # Current cargo hold
+
+        # Ship stats
+        self.hold = STARTING_HOLD
+        self.capacity = STARTING_CAPACITY
+        self.guns = STARTING_GUNS
+        self.bp = 0
+        self.damage = STARTING_DAMAGE
+
+        # Time and location
+        self.month = STARTING_MONTH
+        self.year = STARTING_YEAR
+        self.li = 0
+        self.port = STARTING_PORT
+        self.wu_warn = 0
+        self.wu_bailout = 0
+        self.game_over = False
+
+    def copy(self) -> "GameState":
+        """Independent copy; only the three short lists need duplicating"""
+        new = GameState.__new__(GameState)
+        for name in GameState.__slots__:
+            setattr(new, name, getattr(self, name))
+        new.price = self.price[:]
+        new.hkw_ = self.hkw_[:]
+        new.hold_ = self.hold_[:]
+        return new
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in GameState.__slots__
+        )
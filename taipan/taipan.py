@@ -5,67 +5,54 @@ Original C version by Jay Link <jlink@ilbbs.com>
 Based on Apple ][ program by Ronald J. Berg
 """
 
-import random
+import argparse
 import os
+import sys
+from operator import attrgetter
+from typing import NamedTuple
+from backends import BACKENDS
+from battle_odds import EscapeTable
+from clock import DEFAULT_PROFILE, PROFILES, make_clock
+from inputs import InputRecorder, RecordedInput
+from journal import SNAPSHOT_INTERVAL, Journal, JournalingKeyboard
 from sea_battle import SeaBattle
 from constants import *
 from messages import Messages
+from prices import PRICE_LEVELS
+from rng import GameRandom, RandomSnapshot
+from savegame import load_game, save_game
+from state import GameState
+
+
+class GameOver(SystemExit):
+    """Raised when the player declines to play again."""
+
+
+class Snapshot(NamedTuple):
+    """Game state and random streams at one moment; never changed in place"""
+
+    state: GameState
+    rng: RandomSnapshot
 
 
 class TaipanGame:
-    def __init__(self):
-        self.screen = Messages()
-        # Game state
-        self.firm = ""  # Firm name (was char[23])
-
-        # Item and location names
-        self.items = ["Opium", "Silk", "Arms", "General Cargo"]
-
-        # Financial state
-        self.cash = STARTING_CASH
-        self.bank = STARTING_BANK
-        self.debt = STARTING_DEBT
-
-        # Combat stats
-        self.ec = BASE_ENEMY_HEALTH
-        self.ed = BASE_ENEMY_DAMAGE
-
-        self.locations = [
-            "At sea",
-            "Hong Kong",
-            "Shanghai",
-            "Nagasaki",
-            "Saigon",
-            "Manila",
-            "Singapore",
-            "Batavia",
-        ]
-
-        # Prices and inventory
-        self.price = [0] * 4  # Current prices
-        self.base_price = [
-            [1000, 11, 16, 15, 14, 12, 10, 13],
-            [100, 11, 14, 15, 16, 10, 13, 12],
-            [10, 12, 16, 10, 11, 13, 14, 15],
-            [1, 10, 11, 12, 13, 14, 15, 16],
-        ]
-        self.hkw_ = [0] * 4  # Hong Kong warehouse
-        self.hold_ = [0] * 4  # Current cargo hold
-
-        # Ship stats
-        self.hold = STARTING_HOLD
-        self.capacity = STARTING_CAPACITY
-        self.guns = STARTING_GUNS
-        self.bp = 0
-        self.damage = STARTING_DAMAGE
-
-        # Time and location
-        self.month = STARTING_MONTH
-        self.year = STARTING_YEAR
-        self.li = 0
-        self.port = STARTING_PORT
-        self.wu_warn = 0
-        self.wu_bailout = 0
+    # Shared, immutable tables
+    items = ITEMS
+    locations = LOCATIONS
+    base_price = BASE_PRICE
+    price_levels = PRICE_LEVELS
+
+    def __init__(self, screen=None, rng=None):
+        # Presentation layer; headless runs pass their own in place of curses
+        self.screen = screen if screen is not None else Messages()
+        # Random streams; pass a seeded GameRandom to replay a game exactly
+        self.rng = rng if rng is not None else GameRandom()
+        # Game state; its fields are reachable directly on the game
+        self.state = GameState()
+        # Battle order advisor; None leaves the orders prompt as it was
+        self.advisor = None
+        # Voyage risk model; None leaves the destination prompt as it was
+        self.risk = None
 
     def splash_intro(self) -> None:
         """Display the game's splash screen and wait for user input."""
@@ -103,13 +90,12 @@ class TaipanGame:
 
     def set_prices(self) -> None:
         """Set prices for merchandise in current port based on base prices and random factors."""
-        # Original C logic: price = (base_price[port] / 2) * (random 1-3) * base_price[0]
-        for i in range(4):
-            self.price[i] = (
-                (self.base_price[i][self.port] / 2)
-                * (random.randint(1, 3))
-                * self.base_price[i][0]
-            )
+        # Original C logic: price = (base_price[port] / 2) * (random 1-3) * base_price[0],
+        # looked up in the precomputed levels; the same draws in the same order
+        randint = self.rng.prices.randint
+        price = self.price
+        for i, levels in enumerate(self.price_levels):
+            price[i] = levels[self.port][randint(1, 3) - 1]
 
     def port_stats(self) -> None:
         """Display port statistics screen."""
@@ -194,7 +180,8 @@ class TaipanGame:
         choice = 0
         time = ((self.year - 1860) * 12) + self.month
         amount = (
-            random.randint(0, 1000 * (time + 5) // 6) * (self.capacity // 50) + 1000
+            self.rng.events.randint(0, 1000 * (time + 5) // 6) * (self.capacity // 50)
+            + 1000
         )
 
         if self.cash < amount:
@@ -211,7 +198,7 @@ class TaipanGame:
             self.capacity += 50
             self.damage = 0
 
-        if random.randint(0, 1) == 0 and self.guns < 1000:
+        if self.rng.events.randint(0, 1) == 0 and self.guns < 1000:
             self.port_stats()
             self.new_gun()
 
@@ -221,7 +208,7 @@ class TaipanGame:
         """Handle buying new guns"""
         choice = 0
         time = ((self.year - 1860) * 12) + self.month
-        amount = random.randint(0, 1000 * (time + 5) // 6) + 500
+        amount = self.rng.events.randint(0, 1000 * (time + 5) // 6) + 500
         if self.cash < amount or self.hold < 10:
             return
         self.screen.message_new_gun(amount)
@@ -254,8 +241,8 @@ class TaipanGame:
                 and self.hkw_[3] == 0
             ):
 
-                i = random.randint(500, 1999)
-                j = random.randint(0, 1999) * self.wu_bailout + 1500
+                i = self.rng.events.randint(500, 1999)
+                j = self.rng.events.randint(0, 1999) * self.wu_bailout + 1500
                 self.wu_bailout += 1
 
                 while True:
@@ -304,8 +291,8 @@ class TaipanGame:
 
                 self.port_stats()
 
-        if self.debt > 20000 and self.cash > 0 and random.randint(0, 4) == 0:
-            num = random.randint(1, 3)
+        if self.debt > 20000 and self.cash > 0 and self.rng.events.randint(0, 4) == 0:
+            num = self.rng.events.randint(1, 3)
             self.cash = 0
             self.port_stats()
             self.screen.message_mugged(num)
@@ -317,9 +304,9 @@ class TaipanGame:
         j = 0
         amount = 0
         if time > 12:
-            j = random.randint(0, 1000 * time) + (1000 * time)
+            j = self.rng.events.randint(0, 1000 * time) + (1000 * time)
             i = 1
-        amount = ((self.cash / i) * random.random()) + j
+        amount = ((self.cash / i) * self.rng.events.random()) + j
         self.screen.message_li_donation(amount)
 
         if self.screen.keyboard.choice_yes_no():
@@ -342,14 +329,14 @@ class TaipanGame:
 
     def good_prices(self) -> None:
         """Handle random price changes for items"""
-        i = random.randint(0, 3)
-        j = random.randint(0, 1)
+        i = self.rng.prices.randint(0, 3)
+        j = self.rng.prices.randint(0, 1)
 
         item = self.items[i]
         if j == 0:
             self.price[i] = self.price[i] // 5
         else:
-            self.price[i] = self.price[i] * (random.randint(0, 4) + 5)
+            self.price[i] = self.price[i] * (self.rng.prices.randint(0, 4) + 5)
         self.screen.message_price_change(item, self.price[i], j == 0)
 
     def buy(self) -> None:
@@ -529,7 +516,7 @@ class TaipanGame:
 
         br = int(
             (
-                ((60 * (time + 3) / 4) * random.random() + 25 * (time + 3) / 4)
+                ((60 * (time + 3) / 4) * self.rng.events.random() + 25 * (time + 3) / 4)
                 * self.capacity
                 / 50
             )
@@ -584,7 +571,7 @@ class TaipanGame:
 
     def repair_ship(self) -> None:
         """Handle ship repairs"""
-        amount = random.randint(0, 1000 * self.capacity) + 1000
+        amount = self.rng.events.randint(0, 1000 * self.capacity) + 1000
         if amount > self.cash:
             self.screen.message_insufficient_cash(self.cash)
             return
@@ -604,9 +591,12 @@ class TaipanGame:
         result = BATTLE_NOT_FINISHED
 
         self.screen.message_destinations()
+        risks = self.risk.table(self) if self.risk is not None else None
 
         while True:
             self.screen.message_quit_input()
+            if risks:
+                self.screen.message_destination_risk(risks)
 
             choice = self.screen.keyboard.get_num(1)
 
@@ -619,8 +609,8 @@ class TaipanGame:
         self.screen.message_location_update(self.locations[0])
         self.screen.message_captains_report_header()
 
-        if random.randint(0, self.bp - 1) == 0:
-            num_ships = random.randint(1, (self.capacity // 10) + self.guns)
+        if self.rng.events.randint(0, self.bp - 1) == 0:
+            num_ships = self.rng.events.randint(1, (self.capacity // 10) + self.guns)
             if num_ships > 9999:
                 num_ships = 9999
             self.screen.message_hostile_ships(num_ships)
@@ -632,14 +622,17 @@ class TaipanGame:
 
         # Handle Li Yuen's pirates encounter
         if (
-            result == BATTLE_NOT_FINISHED and random.randint(0, 3 + (8 * self.li)) == 0
+            result == BATTLE_NOT_FINISHED
+            and self.rng.events.randint(0, 3 + (8 * self.li)) == 0
         ) or result == BATTLE_INTERRUPTED:
             self.screen.message_li_yuen_pirates()
             if self.li > 0:
                 self.screen.message_good_joss()
                 return
             else:
-                num_ships = random.randint(0, (self.capacity // 5) + self.guns) + 5
+                num_ships = (
+                    self.rng.events.randint(0, (self.capacity // 5) + self.guns) + 5
+                )
                 self.screen.message_li_yuen_fleet(num_ships)
                 result = self.sea_battle(LI_YUEN, num_ships)
 
@@ -661,22 +654,22 @@ class TaipanGame:
 
             self.screen.message_pause()
 
-        if random.randint(0, 9) == 0:
+        if self.rng.events.randint(0, 9) == 0:
             self.screen.message_storm_sighted()
 
-            if random.randint(0, 29) == 0:
+            if self.rng.events.randint(0, 29) == 0:
                 self.screen.message_going_down()
 
-                if ((self.damage / self.capacity * 3) * random.random()) >= 1:
+                if ((self.damage / self.capacity * 3) * self.rng.events.random()) >= 1:
                     self.screen.message_sinking()
                     self.final_stats()
 
             self.screen.message_made_it()
 
-            if random.randint(0, 2) == 0:
+            if self.rng.events.randint(0, 2) == 0:
                 orig = self.port
                 while self.port == orig:
-                    self.port = random.randint(1, 7)
+                    self.port = self.rng.events.randint(1, 7)
                 self.screen.message_off_course(self.locations[self.port])
 
         self.month += 1
@@ -715,6 +708,7 @@ class TaipanGame:
             self.month = 1
             self.year = 1860
             self.port = 1
+            self.game_over = False
 
             self.splash_intro()
             self.firm = self.screen.name_firm()
@@ -723,110 +717,172 @@ class TaipanGame:
             return
         else:
             self.screen.message_clear_refresh()
-        exit(0)
+        self.game_over = True
+        raise GameOver(0)
+
+    def snapshot(self) -> Snapshot:
+        """Capture the full game, random streams included, for restore or fork"""
+        return Snapshot(self.state.copy(), self.rng.snapshot())
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Put the game back to a snapshot; the snapshot stays reusable"""
+        self.state = snapshot.state.copy()
+        if snapshot.rng.buffered == self.rng.buffered:
+            self.rng.restore(snapshot.rng)
+        else:
+            self.rng = GameRandom.from_snapshot(snapshot.rng)
+
+    def fork(self, screen, snapshot: Snapshot = None) -> "TaipanGame":
+        """
+        Independent game continuing from here (or from snapshot) on another
+        screen, typically a headless one with a policy keyboard. Neither
+        game's play affects the other.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        game = TaipanGame(screen, GameRandom.from_snapshot(snapshot.rng))
+        game.state = snapshot.state.copy()
+        return game
+
+    def start(self) -> None:
+        """Set up a new game: splash screen, firm name, starting stake and prices"""
+        self.splash_intro()
+        self.firm = self.screen.name_firm()
+        self.cash_or_guns()
+        self.set_prices()
+        EscapeTable.shared()  # Build the escape odds tables before any battle
 
-    def main(self) -> None:
-        """Main game loop"""
-        try:
-            random.seed(os.getpid())
-            self.splash_intro()
-            self.firm = self.screen.name_firm()
-            self.cash_or_guns()
-            self.set_prices()
+    def arrive(self) -> None:
+        """Run the events that happen on arrival in port"""
+        self.port_stats()
 
-            while True:
-                choice = 0
-                self.port_stats()
+        # Li Yuen extortion check
+        if self.port == 1 and self.li == 0 and self.cash > 0:
+            self.li_yuen_extortion()
 
-                # Li Yuen extortion check
-                if self.port == 1 and self.li == 0 and self.cash > 0:
-                    self.li_yuen_extortion()
+        # McHenry check
+        if self.port == 1 and self.damage > 0:
+            self.offer_repairs()
 
-                # McHenry check
-                if self.port == 1 and self.damage > 0:
-                    self.offer_repairs()
+        # Elder Brother Wu warning
+        if self.port == 1 and self.debt >= 10000 and self.wu_warn == 0:
+            self.show_wu_warning()
+            self.wu_warn = 1
 
-                # Elder Brother Wu warning
-                if self.port == 1 and self.debt >= 10000 and self.wu_warn == 0:
-                    self.show_wu_warning()
-                    self.wu_warn = 1
+        # Elder Brother Wu encounter
+        if self.port == 1:
+            self.elder_brother_wu()
 
-                # Elder Brother Wu encounter
-                if self.port == 1:
-                    self.elder_brother_wu()
+        # Random events
+        if self.rng.events.randint(0, 3) == 0:
+            if self.rng.events.randint(0, 1) == 0:
+                self.new_ship()
+            elif self.guns < 1000:
+                self.new_gun()
 
-                # Random events
-                if random.randint(0, 3) == 0:
-                    if random.randint(0, 1) == 0:
-                        self.new_ship()
-                    elif self.guns < 1000:
-                        self.new_gun()
-
-                # Opium seizure
-                if self.port != 1 and random.randint(0, 17) == 0 and self.hold_[0] > 0:
-                    self.handle_opium_seizure()
-
-                # Warehouse theft
-                if random.randint(0, 49) == 0 and sum(self.hkw_) > 0:
-                    self.handle_warehouse_theft()
-
-                # Li Yuen counter
-                if random.randint(0, 19) == 0:
-                    if self.li > 0:
-                        self.li += 1
-                    if self.li == 4:
-                        self.li = 0
-
-                # Li Yuen message
-                if self.port != 1 and self.li == 0 and random.randint(0, 3) != 0:
-                    self.screen.message_li_yuen()
-
-                # Good prices
-                if random.randint(0, 8) == 0:
-                    self.good_prices()
-
-                # Robbery
-                if self.cash > 25000 and random.randint(0, 19) == 0:
-                    self.handle_robbery()
-
-                # Main game loop
-                while True:
-                    while choice not in [ord("Q"), ord("q")]:
-                        choice = self.port_choices()
-
-                        if choice in [ord("B"), ord("b")]:
-                            self.buy()
-                        elif choice in [ord("S"), ord("s")]:
-                            self.sell()
-                        elif choice in [ord("V"), ord("v")]:
-                            self.visit_bank()
-                        elif choice in [ord("T"), ord("t")]:
-                            self.transfer()
-                        elif choice in [ord("W"), ord("w")]:
-                            self.elder_brother_wu()
-                        elif choice in [ord("R"), ord("r")]:
-                            self.retire()
+        # Opium seizure
+        if self.port != 1 and self.rng.events.randint(0, 17) == 0 and self.hold_[0] > 0:
+            self.handle_opium_seizure()
 
-                        self.port_stats()
+        # Warehouse theft
+        if self.rng.events.randint(0, 49) == 0 and sum(self.hkw_) > 0:
+            self.handle_warehouse_theft()
 
-                    choice = 0
-                    if self.hold >= 0:
-                        self.quit()
-                        break
-                    else:
-                        self.overload()
+        # Li Yuen counter
+        if self.rng.events.randint(0, 19) == 0:
+            if self.li > 0:
+                self.li += 1
+            if self.li == 4:
+                self.li = 0
+
+        # Li Yuen message
+        if self.port != 1 and self.li == 0 and self.rng.events.randint(0, 3) != 0:
+            self.screen.message_li_yuen()
+
+        # Good prices
+        if self.rng.events.randint(0, 8) == 0:
+            self.good_prices()
+
+        # Robbery
+        if self.cash > 25000 and self.rng.events.randint(0, 19) == 0:
+            self.handle_robbery()
+
+    def trade(self) -> None:
+        """Run the port menu until the player sets sail"""
+        choice = 0
+        while True:
+            while choice not in [ord("Q"), ord("q")]:
+                choice = self.port_choices()
+
+                if choice in [ord("B"), ord("b")]:
+                    self.buy()
+                elif choice in [ord("S"), ord("s")]:
+                    self.sell()
+                elif choice in [ord("V"), ord("v")]:
+                    self.visit_bank()
+                elif choice in [ord("T"), ord("t")]:
+                    self.transfer()
+                elif choice in [ord("W"), ord("w")]:
+                    self.elder_brother_wu()
+                elif choice in [ord("R"), ord("r")]:
+                    self.retire()
+
+                self.port_stats()
+
+            choice = 0
+            if self.hold >= 0:
+                self.quit()
+                break
+            else:
+                self.overload()
+
+    def main(self, save_path: str = None) -> None:
+        """
+        Main game loop. With save_path, resume from it; the game is saved
+        every SNAPSHOT_INTERVAL voyages and every decision in between goes
+        to a journal, which is replayed on top of the save after a crash.
+        """
+        journal = Journal(f"{save_path}.journal") if save_path else None
+        try:
+            if save_path and os.path.exists(save_path):
+                replay = journal.recover(load_game(self, save_path))
+            else:
+                self.start()
+                replay = []
+                if save_path:
+                    journal.reset(save_game(self, save_path))
+            if journal:
+                self.screen.keyboard = JournalingKeyboard(
+                    self.screen.keyboard, journal, replay
+                )
+
+            voyages = 0
+            while True:
+                self.arrive()
+                self.trade()
+                voyages += 1
+                if save_path and voyages % SNAPSHOT_INTERVAL == 0:
+                    journal.reset(save_game(self, save_path))
+        except GameOver:
+            # A finished game is not resumed
+            if save_path and os.path.exists(save_path):
+                os.remove(save_path)
+                journal.remove()
+            raise
         finally:
+            if journal:
+                journal.close()
             self.screen.cleanup_curses()
 
     def show_wu_warning(self) -> None:
         """Show Elder Brother Wu's warning message"""
-        braves = random.randint(1, 10)
+        braves = self.rng.events.randint(1, 10)
         self.screen.message_wu_warning(braves)
         self.wu_warn = 1
 
     def handle_opium_seizure(self) -> None:
         """Handle opium seizure by authorities"""
-        fine = (self.cash / 1.8) * random.random() + 1
+        fine = (self.cash / 1.8) * self.rng.events.random() + 1
         if self.cash == 0:
             fine = 0
         self.hold += self.hold_[0]
@@ -838,13 +894,13 @@ class TaipanGame:
     def handle_warehouse_theft(self) -> None:
         """Handle warehouse theft event"""
         for i in range(4):
-            self.hkw_[i] = int((self.hkw_[i] / 1.8) * random.random())
+            self.hkw_[i] = int((self.hkw_[i] / 1.8) * self.rng.events.random())
         self.port_stats()
         self.screen.message_warehouse_robbery()
 
     def handle_robbery(self) -> None:
         """Handle robbery event"""
-        robbed = int((self.cash / 1.4) * random.random())
+        robbed = int((self.cash / 1.4) * self.rng.events.random())
         self.cash -= robbed
         self.port_stats()
         self.screen.message_robbed(robbed)
@@ -854,7 +910,7 @@ class TaipanGame:
         battle = SeaBattle(self)
         # Calculate booty
         time = ((self.year - 1860) * 12) + self.month
-        booty = (time // 4 * 1000 * num_ships) + random.randint(0, 999) + 250
+        booty = (time // 4 * 1000 * num_ships) + self.rng.battle.randint(0, 999) + 250
         result = battle.battle(battle_type, num_ships)
         if result == BATTLE_WON:  # Victory!
             self.cash += booty
@@ -914,6 +970,78 @@ class TaipanGame:
         self.hkw_[self.items.index(item)] += amount
 
 
+def _delegate(name: str) -> property:
+    def set(game, value):
+        setattr(game.state, name, value)
+
+    return property(attrgetter(f"state.{name}"), set)
+
+
+# Game state fields read and write through to TaipanGame.state
+for _name in GameState.__slots__:
+    setattr(TaipanGame, _name, _delegate(_name))
+
+
 if __name__ == "__main__":
-    game = TaipanGame()
-    game.main()
+    if sys.argv[1:2] == ["batch"]:
+        from batch import main
+
+        main(sys.argv[2:])
+    else:
+        parser = argparse.ArgumentParser(prog="taipan")
+        parser.add_argument(
+            "--backend",
+            choices=["curses", "ansi"],
+            default="curses",
+            help="how to draw the screen (default: curses)",
+        )
+        parser.add_argument(
+            "--pace",
+            choices=list(PROFILES),
+            default=DEFAULT_PROFILE,
+            help=f"game speed (default: {DEFAULT_PROFILE})",
+        )
+        parser.add_argument(
+            "--save",
+            metavar="FILE",
+            help="resume from FILE if it exists; save to it and journal to FILE.journal",
+        )
+        parser.add_argument(
+            "--advisor",
+            action="store_true",
+            help="show the odds of each battle order at the orders prompt",
+        )
+        parser.add_argument(
+            "--risk",
+            action="store_true",
+            help="show the risks of sailing to each port (requires numpy)",
+        )
+        parser.add_argument(
+            "--record", metavar="FILE", help="save every keystroke to FILE"
+        )
+        parser.add_argument(
+            "--replay", metavar="FILE", help="play back keys saved with --record"
+        )
+        args = parser.parse_args()
+
+        screen = Messages(BACKENDS[args.backend](), clock=make_clock(args.pace))
+        rng = GameRandom()
+        if args.replay:
+            # Same seed and keys give the same game; carry on live afterwards
+            source = RecordedInput(args.replay, True, screen.keyboard.source)
+            screen.keyboard.source = source
+            rng = GameRandom(source.seed)
+        if args.record:
+            screen.keyboard.source = InputRecorder(
+                screen.keyboard.source, args.record, rng.seed
+            )
+        game = TaipanGame(screen, rng)
+        if args.advisor:
+            from advisor import BattleAdvisor
+
+            game.advisor = BattleAdvisor()
+        if args.risk:
+            from risk import RiskModel
+
+            game.risk = RiskModel()
+        game.main(args.save)
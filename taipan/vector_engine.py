@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Struct-of-arrays engine that plays many games of Taipan in lockstep.
+
+Every field of the game is a NumPy array with one entry per game, and each
+step sails every game still afloat one voyage: the arrival events, the
+policy's trading and choice of destination, then the voyage itself with
+its battles, storms, interest and new prices. Events are applied as masked
+updates over all games at once and battles are resolved by the batched
+kernel in battle_sim.
+
+The rules follow TaipanGame with every offer declined, as the headless
+Autopilot does: Li Yuen's donation, McHenry's repairs, ship and gun
+upgrades and Elder Brother Wu's loans. Games are statistically alike but
+do not draw the same random numbers as TaipanGame. Requires the optional
+numpy dependency.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from battle_sim import simulate_battles
+from constants import *
+from prices import PRICE_LEVELS
+
+# LEVELS[port, item, factor - 1]: every price set_prices can choose
+LEVELS = np.array(PRICE_LEVELS, dtype=np.float64).transpose(1, 0, 2)
+ITEM_INDEX = np.arange(4)
+
+
+class Autopilot:
+    """Vectorized counterpart of headless.Autopilot: no trading, sail on."""
+
+    def trade(self, games: "VectorGames", rows: np.ndarray) -> np.ndarray:
+        """Trade in port for the given games and return their destinations"""
+        return games.port[rows] % 7 + 1
+
+    def orders(self, games: "VectorGames", rows: np.ndarray) -> np.ndarray:
+        """Standing battle orders for the given games"""
+        return np.where(games.guns[rows] > 0, ORDERS_FIGHT, ORDERS_RUN)
+
+
+class VectorGames:
+    """
+    k games of Taipan held as columns.
+
+    Money is kept in float64 so interest cannot overflow; the game's int()
+    truncations are applied with floor. policy supplies trade() and
+    orders(); it may change the arrays of the games it is given, and the
+    buy(), sell(), deposit() and withdraw() helpers do so with the same
+    limits as the port menu.
+    """
+
+    def __init__(self, k: int, seed=None, policy=None):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.policy = policy if policy is not None else Autopilot()
+
+        def ints(value=0):
+            return np.full(k, value, dtype=np.int64)
+
+        def floats(value=0.0):
+            return np.full(k, value, dtype=np.float64)
+
+        self.cash = floats(STARTING_CASH)
+        self.bank = floats(STARTING_BANK)
+        self.debt = floats(STARTING_DEBT)
+        self.ec = floats(BASE_ENEMY_HEALTH)
+        self.ed = floats(BASE_ENEMY_DAMAGE)
+        self.price = np.zeros((k, 4), dtype=np.float64)
+        self.hkw_ = np.zeros((k, 4), dtype=np.int64)
+        self.hold_ = np.zeros((k, 4), dtype=np.int64)
+        self.hold = ints(STARTING_HOLD)
+        self.capacity = ints(STARTING_CAPACITY)
+        self.guns = ints(STARTING_GUNS)
+        self.bp = ints()
+        self.damage = ints(STARTING_DAMAGE)
+        self.month = ints(STARTING_MONTH)
+        self.year = ints(STARTING_YEAR)
+        self.li = ints()
+        self.port = ints(STARTING_PORT)
+        self.wu_warn = ints()
+        self.game_over = np.zeros(k, dtype=bool)
+        self.voyages = ints()
+
+        self.cash_or_guns()
+        self.set_prices(np.arange(k))
+
+    def cash_or_guns(self) -> None:
+        """Starting stake; outside debug mode every game takes the cash"""
+        if DEBUG:
+            self.cash[:], self.debt[:], self.guns[:] = 1000000, 1000, 5
+            self.bp[:], self.hold[:] = 1, 50
+        else:
+            self.cash[:], self.debt[:], self.hold[:] = 400, 5000, 60
+            self.guns[:], self.li[:], self.bp[:] = 0, 0, 10
+
+    @property
+    def net_worth(self) -> np.ndarray:
+        return self.cash + self.bank - self.debt
+
+    def _randint(self, low: int, high) -> np.ndarray:
+        """random.randint(low, high) for every game, high may be an array"""
+        high = np.broadcast_to(high, (self.k,))
+        return self.rng.integers(low, np.maximum(high, low) + 1)
+
+    def _time(self, rows: np.ndarray) -> np.ndarray:
+        return (self.year[rows] - 1860) * 12 + self.month[rows]
+
+    def set_prices(self, rows: np.ndarray) -> None:
+        factor = self.rng.integers(0, 3, (len(rows), 4))
+        self.price[rows] = LEVELS[self.port[rows, None], ITEM_INDEX, factor]
+
+    # Port menu actions, each for the given rows
+
+    def buy(self, rows: np.ndarray, item: int, amount) -> None:
+        """Buy up to amount of item, limited to what the cash affords"""
+        afford = self.cash[rows] // self.price[rows, item]
+        amount = np.minimum(np.broadcast_to(amount, rows.shape), afford).astype(
+            np.int64
+        )
+        self.cash[rows] -= amount * self.price[rows, item]
+        self.hold_[rows, item] += amount
+        self.hold[rows] -= amount
+
+    def sell(self, rows: np.ndarray, item: int, amount) -> None:
+        """Sell up to amount of item from the hold"""
+        amount = np.minimum(np.broadcast_to(amount, rows.shape), self.hold_[rows, item])
+        self.hold_[rows, item] -= amount
+        self.cash[rows] += amount * self.price[rows, item]
+        self.hold[rows] += amount
+
+    def deposit(self, rows: np.ndarray, amount) -> None:
+        amount = np.minimum(np.broadcast_to(amount, rows.shape), self.cash[rows])
+        self.cash[rows] -= amount
+        self.bank[rows] += amount
+
+    def withdraw(self, rows: np.ndarray, amount) -> None:
+        amount = np.minimum(np.broadcast_to(amount, rows.shape), self.bank[rows])
+        self.bank[rows] -= amount
+        self.cash[rows] += amount
+
+    # One voyage
+
+    def step(self) -> int:
+        """Sail every game still afloat one voyage; returns how many sailed"""
+        live = ~self.game_over
+        rows = np.flatnonzero(live)
+        if len(rows) == 0:
+            return 0
+        self.arrive(live)
+
+        ports = self.policy.trade(self, rows)
+        if np.any((ports == self.port[rows]) | (ports < 1) | (ports > 7)):
+            raise ValueError("policy chose an invalid destination")
+        if np.any(self.hold[rows] < 0):
+            raise ValueError("policy overloaded a ship")
+        self.port[rows] = ports
+
+        self.sail(live)
+        self.voyages[rows] += 1
+        return len(rows)
+
+    def run(self, voyages: int) -> int:
+        """Step until every game is over or has sailed voyages times"""
+        total = 0
+        for _ in range(voyages):
+            sailed = self.step()
+            if sailed == 0:
+                break
+            total += sailed
+        return total
+
+    def arrive(self, live: np.ndarray) -> None:
+        """Events on arrival in port, as in TaipanGame.arrive"""
+        rng = self.rng
+        k = self.k
+        home = live & (self.port == HONG_KONG)
+
+        # Elder Brother Wu: warning, then the mugging of a debtor with cash
+        self.wu_warn[home & (self.debt >= 10000)] = 1
+        mugged = home & (self.debt > 20000) & (self.cash > 0)
+        self.cash[mugged & (rng.integers(0, 5, k) == 0)] = 0
+
+        # Opium seizure
+        seized = (
+            live
+            & (self.port != HONG_KONG)
+            & (rng.integers(0, 18, k) == 0)
+            & (self.hold_[:, OPIUM] > 0)
+        )
+        fine = np.where(self.cash > 0, self.cash / 1.8 * rng.random(k) + 1, 0)
+        self.hold[seized] += self.hold_[seized, OPIUM]
+        self.hold_[seized, OPIUM] = 0
+        self.cash[seized] -= fine[seized]
+
+        # Warehouse theft
+        theft = live & (rng.integers(0, 50, k) == 0) & (self.hkw_.sum(axis=1) > 0)
+        self.hkw_[theft] = (self.hkw_[theft] / 1.8 * rng.random((k, 4))[theft]).astype(
+            np.int64
+        )
+
+        # Li Yuen counter
+        counter = live & (rng.integers(0, 20, k) == 0) & (self.li > 0)
+        self.li[counter] += 1
+        self.li[self.li == 4] = 0
+
+        # Good prices
+        change = np.flatnonzero(live & (rng.integers(0, 9, k) == 0))
+        item = rng.integers(0, 4, len(change))
+        crash = rng.integers(0, 2, len(change)) == 0
+        boom = rng.integers(0, 5, len(change)) + 5
+        old = self.price[change, item]
+        self.price[change, item] = np.where(crash, old // 5, old * boom)
+
+        # Robbery
+        robbed = live & (self.cash > 25000) & (rng.integers(0, 20, k) == 0)
+        self.cash[robbed] -= np.floor(self.cash[robbed] / 1.4 * rng.random(k)[robbed])
+
+    def battle(self, rows: np.ndarray, battle_type: int, num_ships) -> np.ndarray:
+        """Fight the battles of the given games and apply their outcome"""
+        orders = self.policy.orders(self, rows)
+        cargo = np.where(orders == ORDERS_THROW, self.hold_[rows].sum(axis=1), 0)
+        booty = (
+            self._time(rows) // 4 * 1000 * num_ships
+            + self._randint(250, 1249)[: len(rows)]
+        )
+        out = simulate_battles(
+            len(rows),
+            num_ships,
+            self.guns[rows],
+            self.damage[rows],
+            self.capacity[rows],
+            self.ec[rows],
+            self.ed[rows],
+            battle_type,
+            orders,
+            cargo,
+            seed=self.rng,
+        )
+        thrown = rows[orders == ORDERS_THROW]
+        self.hold[thrown] += self.hold_[thrown].sum(axis=1)
+        self.hold_[thrown] = 0
+        self.hold[rows] += (self.guns[rows] - out.guns) * 10
+        self.guns[rows] = out.guns
+        self.damage[rows] = out.damage
+        won = out.result == BATTLE_WON
+        self.cash[rows[won]] += booty[won]
+        self.game_over[rows[out.result == BATTLE_LOST]] = True
+        return out.result
+
+    def sail(self, live: np.ndarray) -> None:
+        """The voyage, as in TaipanGame.quit after a destination is chosen"""
+        rng = self.rng
+        k = self.k
+        result = np.zeros(k, dtype=np.int8)
+
+        # Pirates
+        attacked = np.flatnonzero(live & (rng.integers(0, np.maximum(self.bp, 1)) == 0))
+        ships = np.minimum(
+            self._randint(1, self.capacity // 10 + self.guns)[attacked], 9999
+        )
+        if len(attacked):
+            result[attacked] = self.battle(attacked, GENERIC, ships)
+
+        # Li Yuen's fleet; his protection ends the voyage with no news
+        li_yuen = live & (
+            ((result == BATTLE_NOT_FINISHED) & (self._randint(0, 3 + 8 * self.li) == 0))
+            | (result == BATTLE_INTERRUPTED)
+        )
+        protected = li_yuen & (self.li > 0)
+        fleet = np.flatnonzero(li_yuen & (self.li == 0))
+        ships = (self._randint(0, self.capacity // 5 + self.guns) + 5)[fleet]
+        if len(fleet):
+            result[fleet] = self.battle(fleet, LI_YUEN, ships)
+        sailing = live & ~protected & (result != BATTLE_LOST)
+
+        # Storms: sinking, or being blown off course
+        storm = sailing & (rng.integers(0, 10, k) == 0)
+        going_down = storm & (rng.integers(0, 30, k) == 0)
+        sinking = going_down & (self.damage / self.capacity * 3 * rng.random(k) >= 1)
+        self.game_over[sinking] = True
+        sailing &= ~sinking
+        blown = np.flatnonzero(storm & ~sinking & (rng.integers(0, 3, k) == 0))
+        # A uniform pick among the six other ports
+        offset = rng.integers(1, 7, len(blown))
+        self.port[blown] = (self.port[blown] - 1 + offset) % 7 + 1
+
+        # A month passes
+        rows = np.flatnonzero(sailing)
+        self.month[rows] += 1
+        new_year = rows[self.month[rows] == 13]
+        self.month[new_year] = 1
+        self.year[new_year] += 1
+        self.ec[new_year] += 10
+        self.ed[new_year] += 0.5
+
+        self.debt[rows] = np.floor(self.debt[rows] * 1.1)
+        self.bank[rows] = np.floor(self.bank[rows] * 1.005)
+        self.set_prices(rows)
+
+
+if __name__ == "__main__":
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    voyages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    games = VectorGames(k, seed=0)
+    start = time.perf_counter()
+    done = games.run(voyages)
+    elapsed = time.perf_counter() - start
+    print(f"{done} voyages in {k} games: {done / elapsed:.0f} voyages/sec")
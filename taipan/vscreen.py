@@ -0,0 +1,272 @@
+"""
+In-memory screen model for Taipan.
+
+VirtualScreen is a fixed-size grid of characters and attributes that
+implements the subset of the curses window API used by Messages and
+BattleScreen. Any frame can be rendered without a terminal, hashed and
+compared cell by cell with another frame.
+"""
+
+import curses
+import hashlib
+from array import array
+
+BLANK = ord(" ")
+
+
+class VirtualScreen:
+    """
+    Character/attribute grid with curses-style drawing calls.
+
+    Characters are stored one byte per cell in a bytearray and attributes
+    in a parallel array of unsigned ints, both in row-major order. When
+    attached to a backend, noutrefresh() stages the touched rows with it
+    and getch() reads keys through it.
+    """
+
+    def __init__(self, rows: int = 24, cols: int = 80, y: int = 0, x: int = 0):
+        self.rows = rows
+        self.cols = cols
+        self.begin_y = y
+        self.begin_x = x
+        self.backend = None
+        self.chars = bytearray(b" ") * (rows * cols)
+        self.attrs = array("I", [0]) * (rows * cols)
+        self.background = BLANK
+        self.touched = set(range(rows))  # Rows changed since the last noutrefresh
+        self.cleared = False
+        self.y = 0
+        self.x = 0
+        self.attr = 0
+        self.delay = -1
+
+    # Drawing
+
+    def move(self, y: int, x: int) -> None:
+        if not (0 <= y < self.rows and 0 <= x < self.cols):
+            raise curses.error("move() returned ERR")
+        self.y = y
+        self.x = x
+
+    def addstr(self, *args) -> None:
+        if len(args) == 3:
+            self.move(args[0], args[1])
+        text = args[-1]
+        if "\n" not in text and self.x + len(text) < self.cols and text.isascii():
+            # Fast path: the whole string lands on the current row
+            start = self.y * self.cols + self.x
+            end = start + len(text)
+            self.chars[start:end] = text.encode("ascii")
+            self.attrs[start:end] = array("I", [self.attr]) * len(text)
+            self.touched.add(self.y)
+            self.x += len(text)
+        else:
+            for char in text:
+                self.put(char)
+
+    def addch(self, *args) -> None:
+        if len(args) == 3:
+            self.move(args[0], args[1])
+        char = args[-1]
+        if char in (8, curses.KEY_BACKSPACE):
+            self.x = max(self.x - 1, 0)
+        else:
+            self.put(chr(char) if isinstance(char, int) else char)
+
+    def put(self, char: str) -> None:
+        """Write one character at the cursor, wrapping like curses"""
+        if char == "\n":
+            self.clrtoeol()
+            self.y += 1
+            self.x = 0
+        else:
+            code = ord(char)
+            pos = self.y * self.cols + self.x
+            self.chars[pos] = code if code < 128 else ord("?")
+            self.attrs[pos] = self.attr
+            self.touched.add(self.y)
+            self.x += 1
+            if self.x == self.cols:
+                self.y += 1
+                self.x = 0
+        if self.y >= self.rows:  # Cursor stays on the last cell like curses
+            self.y = self.rows - 1
+            self.x = self.cols - 1
+
+    def attron(self, attr: int) -> None:
+        self.attr |= attr
+
+    def attroff(self, attr: int) -> None:
+        self.attr &= ~attr
+
+    def fill(self, start: int, end: int) -> None:
+        """Blank cells start to end with the background character"""
+        self.chars[start:end] = bytes([self.background]) * (end - start)
+        self.attrs[start:end] = array("I", [0]) * (end - start)
+
+    def clrtoeol(self) -> None:
+        self.fill(self.y * self.cols + self.x, (self.y + 1) * self.cols)
+        self.touched.add(self.y)
+
+    def clrtobot(self) -> None:
+        self.fill(self.y * self.cols + self.x, self.rows * self.cols)
+        self.touched.update(range(self.y, self.rows))
+
+    def erase(self) -> None:
+        self.move(0, 0)
+        self.clrtobot()
+
+    def clear(self) -> None:
+        """Erase the window and repaint the whole screen on the next update"""
+        self.erase()
+        self.cleared = True
+
+    def bkgd(self, char: str) -> None:
+        self.chars = self.chars.replace(bytes([self.background]), char.encode())
+        self.background = ord(char)
+        self.touchwin()
+
+    def touchwin(self) -> None:
+        self.touched = set(range(self.rows))
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.rows, self.cols
+
+    def getyx(self) -> tuple[int, int]:
+        return self.y, self.x
+
+    def keypad(self, flag: bool) -> None:
+        pass
+
+    def timeout(self, delay: int) -> None:
+        self.delay = delay
+
+    # Output and input through the backend
+
+    def noutrefresh(self) -> None:
+        if self.backend is not None:
+            self.backend.stage(self)
+        self.touched = set()
+        self.cleared = False
+
+    def refresh(self) -> None:
+        self.noutrefresh()
+        if self.backend is not None:
+            self.backend.doupdate()
+
+    def getch(self) -> int:
+        if self.backend is None:
+            return -1
+        if self.touched:
+            self.refresh()
+        return self.backend.read_key(self.delay)
+
+    # Inspection
+
+    def instr(self, y: int, x: int, n: int = None) -> bytes:
+        start = y * self.cols + x
+        end = (y + 1) * self.cols if n is None else min(start + n, (y + 1) * self.cols)
+        return bytes(self.chars[start:end])
+
+    def text(self) -> str:
+        """The whole screen as lines of text, without attributes"""
+        return "\n".join(
+            self.instr(y, 0).decode("ascii").rstrip() for y in range(self.rows)
+        )
+
+    def digest(self) -> str:
+        """Hash of every character and attribute on the screen"""
+        h = hashlib.blake2b(self.chars, digest_size=16)
+        h.update(self.attrs.tobytes())
+        return h.hexdigest()
+
+    def copy(self) -> "VirtualScreen":
+        screen = VirtualScreen(self.rows, self.cols, self.begin_y, self.begin_x)
+        screen.chars[:] = self.chars
+        screen.attrs[:] = self.attrs
+        screen.background = self.background
+        return screen
+
+    def cell(self, y: int, x: int) -> tuple[str, int]:
+        pos = y * self.cols + x
+        return chr(self.chars[pos]), self.attrs[pos]
+
+    def diff(self, other: "VirtualScreen", rows=None, gap: int = 0) -> list:
+        """
+        Runs of cells that differ from other, as (y, start, end) tuples.
+
+        Only the given rows are compared if rows is set. Runs separated by
+        gap unchanged cells or fewer are merged into one.
+        """
+        cols = self.cols
+        runs = []
+        for y in sorted(range(self.rows) if rows is None else rows):
+            lo = y * cols
+            hi = lo + cols
+            if (
+                self.chars[lo:hi] == other.chars[lo:hi]
+                and self.attrs[lo:hi] == other.attrs[lo:hi]
+            ):
+                continue
+            start = None
+            last = None
+            for x in range(cols):
+                pos = lo + x
+                if (
+                    self.chars[pos] != other.chars[pos]
+                    or self.attrs[pos] != other.attrs[pos]
+                ):
+                    if start is None:
+                        start = x
+                    elif x - last - 1 > gap:
+                        runs.append((y, start, last + 1))
+                        start = x
+                    last = x
+            runs.append((y, start, last + 1))
+        return runs
+
+    def as_arrays(self):
+        """NumPy views of the character and attribute grids (needs numpy)"""
+        import numpy as np
+
+        shape = (self.rows, self.cols)
+        chars = np.frombuffer(self.chars, dtype=np.uint8).reshape(shape)
+        attrs = np.frombuffer(self.attrs, dtype=np.uint32).reshape(shape)
+        return chars, attrs
+
+
+if __name__ == "__main__":
+    # Render cost of the port display without a terminal
+    import random
+    import sys
+    import time
+
+    from backends import VirtualBackend
+    from messages import Messages
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    backend = VirtualBackend()
+    screen = Messages(backend)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for i in range(count):
+        screen.port_stats(
+            rng.randint(0, 100),
+            "bench",
+            [rng.randint(0, 9999) for _ in range(4)],
+            rng.randint(0, 100),
+            [rng.randint(0, 9999) for _ in range(4)],
+            rng.randint(0, 10**7),
+            rng.randint(0, 10**7),
+            rng.randint(0, 20),
+            rng.randint(0, 10**5),
+            i % 12 + 1,
+            1860 + i // 12,
+            "Hong Kong",
+        )
+        screen.commit()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{count} frames in {elapsed:.2f}s: {count / elapsed:.0f} frames/sec, "
+        f"{backend.cells_written / count:.1f} cells changed per frame"
+    )